@@ -27,6 +27,10 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        # Vectorized fairness scoring (engine.backend: "numpy")
+        "numpy": ["numpy>=1.22"],
+    },
     entry_points={
         "console_scripts": [
             "task-scheduler=task_scheduler.cli:cli",
@@ -4,20 +4,24 @@ from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional, Dict, Mapping
 from datetime import date, datetime, timedelta
 from pydantic import BaseModel, Field
 import json
+from collections import Counter
 
 from .database import (
     db,
+    MigrationError,
     TeamMemberDB,
     UnavailablePeriod,
     AssignmentDB,
     FairnessCount,
     DynamicFairnessCount,
+    FairnessSummary,
     ScheduleDB,
     TaskTypeDef,
     ShiftDef,
@@ -25,9 +29,17 @@ from .database import (
     User,
 )
 from .task_type_model import DynamicTaskType, TaskTypeShift
-from .models import TaskType, TeamMember, Assignment, Schedule, FairnessLedger
+from .models import TASKS, TeamMember, Assignment, Schedule, FairnessLedger, assignment_slot_key
 from .config import SchedulingConfig
 from .scheduler import Scheduler
+from .task_plan import compile_atm_plan
+from .fairness import DEFAULT_STATUSES, ensure_fairness_summary, fairness_table
+from .persistence import (
+    apply_fairness_deltas, apply_summary_deltas, fairness_deltas, fairness_key, insert_assignments,
+    summary_deltas, summary_key,
+)
+from .cache import CachedSchedule, ScheduleCache, schedule_digest
+from .stats import SchedulerStats
 from .export import export_to_csv, export_to_ics, export_audit_log, export_to_xlsx, export_to_excel, export_to_pdf, export_fairness_to_pdf
 from .loader import load_team
 from jose import jwt, JWTError
@@ -38,6 +50,8 @@ from email.message import EmailMessage
 import secrets
 
 app = FastAPI(title="Task Scheduler API", version="1.0.0")
+# Generated schedules by input digest, shared by generate and preview
+schedule_cache = ScheduleCache()
 # Auth helpers
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-change-me")
 ALGORITHM = "HS256"
@@ -114,12 +128,14 @@ class TeamMemberCreate(BaseModel):
     id: str
     office_days: List[int] = Field(default=[0, 1, 2, 3, 4])
     email: Optional[str] = None
+    skills: List[str] = []
     
 class TeamMemberResponse(BaseModel):
     id: str
     name: str
     office_days: List[int]
     email: Optional[str] = None
+    skills: List[str] = []
     unavailable_periods: List[dict] = []
     
     class Config:
@@ -142,6 +158,13 @@ class ScheduleGenerateRequest(BaseModel):
     task_members: Optional[Dict[str, List[str]]] = None  # Mapping of task type name to list of member IDs
     seed: Optional[int] = None
     fairness_aggressiveness: Optional[int] = Field(default=1, ge=1, le=5)
+    include_stats: bool = False  # instrument the run and return Scheduler stats (bypasses the cache)
+
+class ScheduleRegenerateRequest(BaseModel):
+    start_date: date
+    end_date: date
+    pinned_assignment_ids: List[int] = []  # Assignments in the window to keep as they are
+    task_members: Optional[Dict[str, List[str]]] = None  # Defaults to the members the schedule was generated with
 
 class AssignmentResponse(BaseModel):
     id: int
@@ -246,24 +269,398 @@ def db_member_to_model(db_member: TeamMemberDB, session: Session) -> TeamMember:
         office_days=db_member.office_days or {0, 1, 2, 3, 4},
         unavailable_dates=unavailable_dates,
         unavailable_ranges=unavailable_ranges,
-        email=db_member.email
+        email=db_member.email,
+        skills=set(db_member.skills or ())
     )
 
 
+def _load_members(session: Session) -> List[TeamMember]:
+    """All team members as models, ordered by id (roster order, the default tie-break).
+
+    Unavailable periods are loaded for every member in one extra query.
+    """
+    db_members = session.query(TeamMemberDB).options(
+        selectinload(TeamMemberDB.unavailable_periods)
+    ).order_by(TeamMemberDB.id).all()
+    return [db_member_to_model(m, session) for m in db_members]
+
+
 def _task_identifier(task_type_val) -> str:
     """Normalize a task_type value to a string identifier for DB storage/queries.
 
     Accepts either a TaskType enum or a plain string (for dynamic tasks).
     """
-    from .models import TaskType as _TaskType
-    if isinstance(task_type_val, _TaskType):
-        return task_type_val.value
-    return str(task_type_val)
+    return TASKS.key(task_type_val)
 
 
 def _is_enum_task_identifier(task_identifier: str) -> bool:
-    from .models import TaskType as _TaskType
-    return task_identifier in {t.value for t in _TaskType}
+    return TASKS.is_builtin(task_identifier)
+
+
+# Task type whose rules_json "shift_plan" replaces the configured ATM shift plan
+ATM_PLAN_TASK_NAME = "ATM"
+
+
+def _validate_atm_shift_plan(plan) -> None:
+    try:
+        compile_atm_plan(plan)
+    except (AttributeError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid ATM shift plan: {e}")
+
+
+def _load_atm_shift_plan(session: Session) -> Optional[dict]:
+    """The ATM shift plan stored in the database, if any."""
+    db_tt = session.query(TaskTypeDef).filter(TaskTypeDef.name == ATM_PLAN_TASK_NAME).first()
+    rules = json.loads(db_tt.rules_json) if db_tt is not None and db_tt.rules_json else {}
+    plan = rules.get("shift_plan")
+    if plan:
+        _validate_atm_shift_plan(plan)
+    return plan or None
+
+
+def _load_config(config_override: Optional[dict] = None, session: Optional[Session] = None) -> SchedulingConfig:
+    """Load the scheduling config from data/config.yaml, the database ATM plan and request overrides."""
+    try:
+        config = SchedulingConfig.from_yaml("data/config.yaml")
+    except:
+        config = SchedulingConfig()
+    
+    if session is not None:
+        config.atm_shift_plan = _load_atm_shift_plan(session) or config.atm_shift_plan
+    
+    # Override config if provided
+    if config_override:
+        for key, value in config_override.items():
+            if hasattr(config, key):
+                setattr(config, key, value)
+    return config
+
+
+def _load_request_config(request: ScheduleGenerateRequest, session: Session) -> SchedulingConfig:
+    """Config for a generate request, including its seed and fairness aggressiveness."""
+    config = _load_config(request.config_override, session)
+    if request.seed is not None:
+        config.seed = request.seed
+    if request.fairness_aggressiveness is not None:
+        config.fairness_aggressiveness = request.fairness_aggressiveness
+    return config
+
+
+def _generation_settings(request: ScheduleGenerateRequest) -> dict:
+    """ScheduleDB columns recording how a schedule was generated (see `_load_schedule_config`)."""
+    override = dict(request.config_override or {})
+    if request.fairness_aggressiveness is not None:
+        override["fairness_aggressiveness"] = request.fairness_aggressiveness
+    return {
+        "seed": request.seed,
+        "config_override_json": json.dumps(override) if override else None,
+        "task_members_json": json.dumps(request.task_members) if request.task_members else None
+    }
+
+
+def _load_schedule_config(session: Session, db_schedule: ScheduleDB) -> SchedulingConfig:
+    """Config a stored schedule was generated with, including its seed and overrides."""
+    override = json.loads(db_schedule.config_override_json) if db_schedule.config_override_json else None
+    config = _load_config(override, session)
+    if db_schedule.seed is not None:
+        config.seed = db_schedule.seed
+    return config
+
+
+def _load_task_types(session: Session, names: List[str]) -> Optional[List[DynamicTaskType]]:
+    """Load the named task types from the database (None if none of them exist)."""
+    # Load ONLY the specific task types requested (not all)
+    db_task_types = session.query(TaskTypeDef).filter(TaskTypeDef.name.in_(names)).all()
+    if not db_task_types:
+        return None
+    
+    # Convert database TaskTypeDef to DynamicTaskType
+    task_types = []
+    for db_tt in db_task_types:
+        shifts = session.query(ShiftDef).filter(ShiftDef.task_type_id == db_tt.id).all()
+        # Get rules for this task type
+        rules = json.loads(db_tt.rules_json) if db_tt.rules_json else {}
+        
+        task_type_shifts = []
+        for s in shifts:
+            # Check if this specific shift requires rest (can be in shift-specific rules or task-level rules)
+            shift_requires_rest = False
+            if rules.get("shifts"):
+                # Check if this shift has specific rest rule
+                shift_rule = next((sr for sr in rules.get("shifts", []) if sr.get("label") == s.label), None)
+                if shift_rule:
+                    shift_requires_rest = shift_rule.get("requires_rest", False)
+                else:
+                    shift_requires_rest = rules.get("requires_rest", False)
+            else:
+                shift_requires_rest = rules.get("requires_rest", False)
+            
+            task_type_shifts.append(TaskTypeShift(
+                label=s.label,
+                start_time=s.start_time,
+                end_time=s.end_time,
+                required_count=s.required_count,
+                requires_rest=shift_requires_rest
+            ))
+        task_types.append(DynamicTaskType(
+            id=db_tt.id,
+            name=db_tt.name,
+            recurrence=db_tt.recurrence,
+            required_count=db_tt.required_count,
+            role_labels=db_tt.role_labels or [],
+            rules_json=json.loads(db_tt.rules_json) if db_tt.rules_json else None,
+            shifts=task_type_shifts,
+            required_skills=list(db_tt.required_skills or [])
+        ))
+    return task_types
+
+
+def _generate_cached(session: Session, request: ScheduleGenerateRequest) -> tuple[CachedSchedule, bool, Optional[SchedulerStats]]:
+    """Run the scheduler for a generate request, or reuse a cached result for identical inputs.
+    
+    Returns (result, cached, stats); stats are only collected (and the cache
+    lookup skipped) when the request asks for them.
+    """
+    # Load team members from database (ordered by id so roster order, the default tie-break, is stable)
+    members = _load_members(session)
+    
+    if not members:
+        raise HTTPException(status_code=400, detail="No team members available")
+    
+    config = _load_request_config(request, session)
+    
+    # Load task types from database ONLY if specific tasks are requested
+    task_types = None
+    if request.tasks and len(request.tasks) > 0:
+        task_types = _load_task_types(session, request.tasks)
+    
+    # Load dynamic fairness counts for configurable task types
+    dynamic_fairness_counts = _load_dynamic_fairness_counts(session)
+    
+    schedule_cache.resize(config.cache_max_entries, config.cache_max_assignments)
+    key = schedule_digest(
+        members, config, request.start_date, request.end_date,
+        task_types, request.task_members, dynamic_fairness_counts
+    )
+    cached = schedule_cache.get(key) if not request.include_stats else None
+    if cached is not None:
+        return cached, True, None
+    
+    # Generate schedule
+    # If task_types is provided, schedule only those tasks
+    # If task_types is None, use default ATM/SysAid logic
+    scheduler = Scheduler(config, dynamic_counts=dynamic_fairness_counts)
+    if request.include_stats:
+        scheduler.stats = SchedulerStats()
+    try:
+        schedule = scheduler.generate_schedule(
+            members, 
+            request.start_date, 
+            request.end_date, 
+            task_types=task_types,
+            task_members=request.task_members
+        )
+        result = CachedSchedule(schedule, scheduler.audit.get_log())
+    finally:
+        scheduler.audit.close()
+    schedule_cache.put(key, result)
+    return result, False, scheduler.stats
+
+
+def _stats_response(stats: Optional[SchedulerStats]) -> dict:
+    """Response fields for requested scheduler stats (summary plus flamegraph stacks)."""
+    if stats is None:
+        return {}
+    return {"stats": {**stats.to_dict(), "folded": stats.to_folded()}}
+
+
+def _load_dynamic_fairness_counts(session: Session) -> Dict[str, Dict[str, int]]:
+    """Dynamic fairness counts as { task_name -> { member_id -> count } }."""
+    dynamic_fairness_counts = {}
+    dynamic_rows = session.query(DynamicFairnessCount).all()
+    for row in dynamic_rows:
+        task_counts = dynamic_fairness_counts.setdefault(row.task_name, {})
+        task_counts[row.member_id] = row.count
+    return dynamic_fairness_counts
+
+
+def _is_dynamic_assignment(task_id: Optional[str], custom_task_name: Optional[str]) -> bool:
+    return bool(custom_task_name) or (task_id is not None and not TASKS.is_builtin(task_id))
+
+
+def _assignment_keys(rows: List[AssignmentDB]) -> List[dict]:
+    """The columns of stored assignments that `fairness_deltas` and `summary_deltas` read."""
+    return [{
+        "member_id": r.member_id,
+        "task_type": r.task_type,
+        "custom_task_name": r.custom_task_name,
+        "assignment_date": r.assignment_date,
+    } for r in rows]
+
+
+def _reassign(session: Session, assignment: AssignmentDB, member_id: str):
+    """Give an assignment to another member, moving its fairness count and summary entry."""
+    if assignment.member_id == member_id:
+        return
+    apply_fairness_deltas(session, {
+        fairness_key(assignment.member_id, assignment.task_type, assignment.custom_task_name): -1,
+        fairness_key(member_id, assignment.task_type, assignment.custom_task_name): 1,
+    })
+    if assignment.schedule is not None:
+        status = assignment.schedule.status
+        apply_summary_deltas(session, {
+            summary_key(assignment.member_id, assignment.task_type, status, assignment.assignment_date): -1,
+            summary_key(member_id, assignment.task_type, status, assignment.assignment_date): 1,
+        })
+    assignment.member_id = member_id
+
+
+def _assignment_response(row: Mapping, member_name: str) -> dict:
+    """API representation of a stored assignment row (see `insert_assignments`)."""
+    return {
+        "id": row["id"],
+        "task_type": row["task_type"],
+        "member_id": row["member_id"],
+        "member_name": member_name,
+        "assignment_date": row["assignment_date"].isoformat(),
+        "week_start": row["week_start"].isoformat() if row["week_start"] else None,
+        "shift_label": row["shift_label"],
+        "custom_task_name": row["custom_task_name"],
+        "custom_task_shift": row["custom_task_shift"],
+        "recurrence": row["recurrence"]
+    }
+
+
+def _assignment_from_row(row: AssignmentDB, member: Optional[TeamMember]) -> Assignment:
+    task_type = TASKS.task_type(row.task_type)
+    return Assignment(
+        task_type=task_type,
+        assignee=member,
+        date=row.assignment_date,
+        week_start=row.week_start,
+        shift_label=row.shift_label,
+        custom_task_name=row.custom_task_name,
+        custom_task_shift=row.custom_task_shift,
+        recurrence=row.recurrence
+    )
+
+
+def _regenerate_schedule(
+    session: Session,
+    db_schedule: ScheduleDB,
+    window_start: date,
+    window_end: date,
+    pinned_ids: List[int] = (),
+    task_members: Optional[Dict[str, List[str]]] = None
+) -> dict:
+    """Regenerate the slots of a stored schedule in [window_start, window_end].
+    
+    Only rows whose member changed are written: reassigned rows are updated
+    in place, and rows are added or removed when a slot gained or lost its
+    assignee. Rows of members that no longer exist count as vacated: their
+    slot is refilled inside the window and the row removed outside it.
+    Fairness counters are adjusted by the same diff. The caller commits.
+    """
+    members = _load_members(session)
+    by_id = {m.id: m for m in members}
+    rows = session.query(AssignmentDB).filter(AssignmentDB.schedule_id == db_schedule.id).all()
+    
+    existing = Schedule(start_date=db_schedule.start_date, end_date=db_schedule.end_date)
+    pinned = []
+    rows_by_slot: Dict[tuple, List[AssignmentDB]] = {}
+    pinned_ids = set(pinned_ids)
+    for row in rows:
+        member = by_id.get(row.member_id)
+        assignment = _assignment_from_row(row, member)
+        rows_by_slot.setdefault((row.assignment_date, assignment_slot_key(assignment)), []).append(row)
+        if member is None:
+            continue
+        existing.add(assignment)
+        if row.id in pinned_ids:
+            pinned.append(assignment)
+    
+    # Dynamic schedules are regenerated with the task types they already use and,
+    # unless given, the members they were generated with (the full roster if not recorded)
+    task_names = sorted({r.custom_task_name for r in rows if r.custom_task_name})
+    task_types = _load_task_types(session, task_names) if task_names else None
+    if task_members is None and db_schedule.task_members_json:
+        task_members = json.loads(db_schedule.task_members_json)
+    
+    # Counters without this schedule's own assignments, which are replayed as history
+    dynamic_fairness_counts = _load_dynamic_fairness_counts(session)
+    for row in rows:
+        if _is_dynamic_assignment(row.task_type, row.custom_task_name):
+            counts = dynamic_fairness_counts.get(row.custom_task_name or row.task_type, {})
+            if counts.get(row.member_id):
+                counts[row.member_id] -= 1
+    
+    scheduler = Scheduler(_load_schedule_config(session, db_schedule), dynamic_counts=dynamic_fairness_counts)
+    try:
+        schedule = scheduler.regenerate_schedule(
+            existing, members, window_start, window_end,
+            pinned=pinned, task_types=task_types, task_members=task_members
+        )
+        audit_log = scheduler.audit.get_log()
+    finally:
+        scheduler.audit.close()
+    
+    new_by_slot: Dict[tuple, List[Assignment]] = {}
+    for assignment in schedule.assignments:
+        new_by_slot.setdefault((assignment.date, assignment_slot_key(assignment)), []).append(assignment)
+    
+    updated = added = removed = 0
+    removed_ids = []
+    added_assignments = []
+    deltas = Counter()
+    summary = Counter()
+    for slot in set(rows_by_slot) | set(new_by_slot):
+        old_rows = list(rows_by_slot.get(slot, ()))
+        new_assignments = list(new_by_slot.get(slot, ()))
+        # Rows whose member is unchanged stay as they are
+        for assignment in list(new_assignments):
+            row = next((r for r in old_rows if r.member_id == assignment.assignee.id), None)
+            if row is not None:
+                old_rows.remove(row)
+                new_assignments.remove(assignment)
+        for row, assignment in zip(old_rows, new_assignments):
+            deltas[fairness_key(row.member_id, row.task_type, row.custom_task_name)] -= 1
+            deltas[fairness_key(assignment.assignee.id, row.task_type, row.custom_task_name)] += 1
+            summary[summary_key(row.member_id, row.task_type, db_schedule.status, row.assignment_date)] -= 1
+            summary[summary_key(assignment.assignee.id, row.task_type, db_schedule.status, row.assignment_date)] += 1
+            row.member_id = assignment.assignee.id
+            updated += 1
+        for row in old_rows[len(new_assignments):]:
+            deltas[fairness_key(row.member_id, row.task_type, row.custom_task_name)] -= 1
+            summary[summary_key(row.member_id, row.task_type, db_schedule.status, row.assignment_date)] -= 1
+            removed_ids.append(row.id)
+        added_assignments.extend(new_assignments[len(old_rows):])
+    
+    added = len(added_assignments)
+    added_rows = insert_assignments(session, db_schedule.id, added_assignments)
+    deltas.update(fairness_deltas(added_rows))
+    summary.update(summary_deltas(added_rows, db_schedule.status))
+    apply_fairness_deltas(session, deltas)
+    apply_summary_deltas(session, summary)
+    
+    if removed_ids:
+        # Delete swap requests that reference these assignments first (to avoid foreign key violation)
+        session.query(SwapRequest).filter(
+            SwapRequest.assignment_id.in_(removed_ids)
+        ).delete(synchronize_session=False)
+        session.query(AssignmentDB).filter(
+            AssignmentDB.id.in_(removed_ids)
+        ).delete(synchronize_session=False)
+        removed = len(removed_ids)
+    
+    return {
+        "schedule_id": db_schedule.id,
+        "window_start": window_start.isoformat(),
+        "window_end": window_end.isoformat(),
+        "updated": updated,
+        "added": added,
+        "removed": removed,
+        "audit_log": audit_log
+    }
 
 # API Endpoints
 
@@ -360,7 +757,7 @@ async def change_password(payload: ChangePasswordPayload, current: User = Depend
 @app.get("/api/team-members", response_model=List[TeamMemberResponse])
 async def get_team_members(session: Session = Depends(get_db), user: User = Depends(get_current_user)):
     """Get all team members."""
-    members = session.query(TeamMemberDB).all()
+    members = session.query(TeamMemberDB).options(selectinload(TeamMemberDB.unavailable_periods)).all()
     result = []
     for member in members:
         periods = [
@@ -377,6 +774,7 @@ async def get_team_members(session: Session = Depends(get_db), user: User = Depe
             "name": member.name,
             "email": member.email,
             "office_days": list(member.office_days or []),
+            "skills": sorted(member.skills or []),
             "unavailable_periods": periods
         })
     return result
@@ -392,7 +790,8 @@ async def create_team_member(member: TeamMemberCreate, session: Session = Depend
         id=member.id,
         name=member.name,
         office_days=set(member.office_days),
-        email=member.email
+        email=member.email,
+        skills=set(member.skills)
     )
     session.add(db_member)
     session.commit()
@@ -427,6 +826,7 @@ async def create_team_member(member: TeamMemberCreate, session: Session = Depend
         "name": db_member.name,
         "email": db_member.email,
         "office_days": list(db_member.office_days),
+        "skills": sorted(db_member.skills or []),
         "unavailable_periods": []
     }
 
@@ -439,7 +839,7 @@ def _serialize_swap(swap: SwapRequest) -> dict:
         "id": swap.id,
         "assignment_id": swap.assignment_id,
         "assignment_date": assignment.assignment_date.isoformat() if assignment else None,
-        "task_type": assignment.task_type.value if assignment else None,
+        "task_type": _task_identifier(assignment.task_type) if assignment else None,
         "requested_by": swap.requested_by,
         "requested_by_name": requested_member.name if requested_member else None,
         "proposed_member_id": swap.proposed_member_id,
@@ -493,6 +893,7 @@ async def update_team_member(member_id: str, member: TeamMemberCreate, session:
     db_member.name = member.name
     db_member.office_days = set(member.office_days)
     db_member.email = member.email if member.email else None
+    db_member.skills = set(member.skills)
     db_member.updated_at = date.today()
     session.commit()
     session.refresh(db_member)
@@ -512,6 +913,7 @@ async def update_team_member(member_id: str, member: TeamMemberCreate, session:
         "name": db_member.name,
         "email": db_member.email,
         "office_days": list(db_member.office_days),
+        "skills": sorted(db_member.skills or []),
         "unavailable_periods": periods
     }
 
@@ -537,6 +939,7 @@ async def change_member_id(member_id: str, payload: MemberIdUpdate, session: Ses
         name=existing.name,
         office_days=existing.office_days.copy() if existing.office_days else set(),
         email=existing.email,
+        skills=set(existing.skills or ()),
         created_at=existing.created_at,
         updated_at=date.today()
     )
@@ -547,6 +950,8 @@ async def change_member_id(member_id: str, payload: MemberIdUpdate, session: Ses
     session.query(UnavailablePeriod).filter(UnavailablePeriod.member_id == member_id).update({UnavailablePeriod.member_id: payload.new_id}, synchronize_session=False)
     session.query(AssignmentDB).filter(AssignmentDB.member_id == member_id).update({AssignmentDB.member_id: payload.new_id}, synchronize_session=False)
     session.query(FairnessCount).filter(FairnessCount.member_id == member_id).update({FairnessCount.member_id: payload.new_id}, synchronize_session=False)
+    session.query(DynamicFairnessCount).filter(DynamicFairnessCount.member_id == member_id).update({DynamicFairnessCount.member_id: payload.new_id}, synchronize_session=False)
+    session.query(FairnessSummary).filter(FairnessSummary.member_id == member_id).update({FairnessSummary.member_id: payload.new_id}, synchronize_session=False)
     session.query(SwapRequest).filter(SwapRequest.requested_by == member_id).update({SwapRequest.requested_by: payload.new_id}, synchronize_session=False)
     session.query(SwapRequest).filter(SwapRequest.proposed_member_id == member_id).update({SwapRequest.proposed_member_id: payload.new_id}, synchronize_session=False)
     
@@ -582,6 +987,8 @@ async def delete_team_member(member_id: str, session: Session = Depends(get_db),
     
     # Delete fairness counts
     session.query(FairnessCount).filter(FairnessCount.member_id == member_id).delete(synchronize_session=False)
+    session.query(DynamicFairnessCount).filter(DynamicFairnessCount.member_id == member_id).delete(synchronize_session=False)
+    session.query(FairnessSummary).filter(FairnessSummary.member_id == member_id).delete(synchronize_session=False)
     
     # Delete user account if exists (by member_id OR username, since username is often the same as member_id)
     session.query(User).filter(
@@ -615,12 +1022,49 @@ async def create_unavailable_period(period: UnavailablePeriodCreate, session: Se
     session.commit()
     session.refresh(db_period)
     
+    # Reassign the member's slots in any schedule that covers the new period
+    regenerated = []
+    failed = []
+    affected = session.query(AssignmentDB).filter(
+        AssignmentDB.member_id == period.member_id,
+        AssignmentDB.schedule_id != None,
+        AssignmentDB.assignment_date >= period.start_date,
+        AssignmentDB.assignment_date <= period.end_date
+    ).all()
+    for schedule_id in sorted({a.schedule_id for a in affected}):
+        try:
+            schedule = session.query(ScheduleDB).filter(ScheduleDB.id == schedule_id).first()
+            if not schedule:
+                continue
+            window_start = max(period.start_date, schedule.start_date)
+            window_end = min(period.end_date, schedule.end_date)
+            # Everyone else keeps their slots in the window
+            pinned_ids = [
+                a.id for a in session.query(AssignmentDB).filter(
+                    AssignmentDB.schedule_id == schedule_id,
+                    AssignmentDB.member_id != period.member_id,
+                    AssignmentDB.assignment_date >= window_start,
+                    AssignmentDB.assignment_date <= window_end
+                ).all()
+            ]
+            result = _regenerate_schedule(session, schedule, window_start, window_end, pinned_ids)
+            session.commit()
+            regenerated.append({key: result[key] for key in ("schedule_id", "updated", "added", "removed")})
+        except Exception as e:
+            import traceback
+            print(f"Failed to regenerate schedule {schedule_id} after unavailability change: {e}")
+            traceback.print_exc()
+            session.rollback()
+            failed.append({"schedule_id": schedule_id, "error": str(e)})
+    
     return {
         "id": db_period.id,
         "member_id": db_period.member_id,
         "start_date": db_period.start_date.isoformat(),
         "end_date": db_period.end_date.isoformat(),
-        "reason": db_period.reason
+        "reason": db_period.reason,
+        "regenerated": regenerated,
+        "failed": failed
     }
 
 @app.delete("/api/unavailable-periods/{period_id}")
@@ -641,184 +1085,173 @@ async def delete_unavailable_period(period_id: int, session: Session = Depends(g
 @app.post("/api/schedules/generate")
 async def generate_schedule(request: ScheduleGenerateRequest, session: Session = Depends(get_db), admin: User = Depends(require_admin)):
     """Generate a new schedule."""
-    # Load team members from database
-    db_members = session.query(TeamMemberDB).all()
-    members = [db_member_to_model(m, session) for m in db_members]
-    
-    if not members:
-        raise HTTPException(status_code=400, detail="No team members available")
-    
-    # Load or create config
-    try:
-        config = SchedulingConfig.from_yaml("data/config.yaml")
-    except:
-        config = SchedulingConfig()
-    
-    # Override config if provided
-    if request.config_override:
-        for key, value in request.config_override.items():
-            if hasattr(config, key):
-                setattr(config, key, value)
-    
-    # Load task types from database ONLY if specific tasks are requested
-    task_types = None
-    if request.tasks and len(request.tasks) > 0:
-        # Load ONLY the specific task types requested (not all)
-        db_task_types = session.query(TaskTypeDef).filter(TaskTypeDef.name.in_(request.tasks)).all()
-        
-        if db_task_types:
-            # Convert database TaskTypeDef to DynamicTaskType
-            task_types = []
-            for db_tt in db_task_types:
-                shifts = session.query(ShiftDef).filter(ShiftDef.task_type_id == db_tt.id).all()
-                # Get rules for this task type
-                rules = json.loads(db_tt.rules_json) if db_tt.rules_json else {}
-                
-                task_type_shifts = []
-                for s in shifts:
-                    # Check if this specific shift requires rest (can be in shift-specific rules or task-level rules)
-                    shift_requires_rest = False
-                    if rules.get("shifts"):
-                        # Check if this shift has specific rest rule
-                        shift_rule = next((sr for sr in rules.get("shifts", []) if sr.get("label") == s.label), None)
-                        if shift_rule:
-                            shift_requires_rest = shift_rule.get("requires_rest", False)
-                        else:
-                            shift_requires_rest = rules.get("requires_rest", False)
-                    else:
-                        shift_requires_rest = rules.get("requires_rest", False)
-                    
-                    task_type_shifts.append(TaskTypeShift(
-                        label=s.label,
-                        start_time=s.start_time,
-                        end_time=s.end_time,
-                        required_count=s.required_count,
-                        requires_rest=shift_requires_rest
-                    ))
-                task_types.append(DynamicTaskType(
-                    id=db_tt.id,
-                    name=db_tt.name,
-                    recurrence=db_tt.recurrence,
-                    required_count=db_tt.required_count,
-                    role_labels=db_tt.role_labels or [],
-                    rules_json=json.loads(db_tt.rules_json) if db_tt.rules_json else None,
-                    shifts=task_type_shifts
-                ))
-    
-    # Load dynamic fairness counts for configurable task types
-    dynamic_fairness_counts = {}
-    dynamic_rows = session.query(DynamicFairnessCount).all()
-    for row in dynamic_rows:
-        task_counts = dynamic_fairness_counts.setdefault(row.task_name, {})
-        task_counts[row.member_id] = row.count
-    
-    # Generate schedule
-    # If task_types is provided, schedule only those tasks
-    # If task_types is None, use default ATM/SysAid logic
-    scheduler = Scheduler(config, dynamic_counts=dynamic_fairness_counts)
-    schedule = scheduler.generate_schedule(
-        members, 
-        request.start_date, 
-        request.end_date, 
-        task_types=task_types,
-        task_members=request.task_members
-    )
+    result, cached, stats = _generate_cached(session, request)
+    schedule = result.schedule
     
     # Save to database
     db_schedule = ScheduleDB(
         start_date=request.start_date,
         end_date=request.end_date,
         status="draft",
-        created_at=datetime.now()
+        created_at=datetime.now(),
+        **_generation_settings(request)
     )
     session.add(db_schedule)
     session.flush()
     
-    # Save assignments
-    for assignment in schedule.assignments:
-        task_id = _task_identifier(assignment.task_type)
-        db_assignment = AssignmentDB(
-            task_type=task_id,
-            schedule_id=db_schedule.id,
-            member_id=assignment.assignee.id,
-            assignment_date=assignment.date,
-            week_start=assignment.week_start,
-            shift_label=assignment.shift_label,
-            custom_task_name=assignment.custom_task_name,
-            custom_task_shift=assignment.custom_task_shift,
-            recurrence=assignment.recurrence
-        )
-        session.add(db_assignment)
-        # Update fairness ledger
-        # Distinguish dynamic/custom tasks vs built-in enum tasks
-        if assignment.custom_task_name or (isinstance(assignment.task_type, str) and not _is_enum_task_identifier(assignment.task_type)):
-            tname = assignment.custom_task_name or task_id or "CUSTOM"
-            fairness_count = session.query(DynamicFairnessCount).filter(
-                DynamicFairnessCount.member_id == assignment.assignee.id,
-                DynamicFairnessCount.task_name == tname
-            ).first()
-            if not fairness_count:
-                fairness_count = DynamicFairnessCount(
-                    member_id=assignment.assignee.id,
-                    task_name=tname,
-                    count=0,
-                )
-                session.add(fairness_count)
-            fairness_count.count += 1
-            fairness_count.updated_at = date.today()
-        else:
-            # Enum task stored by its identifier string
-            task_str = task_id
-            fairness_count = session.query(FairnessCount).filter(
-                FairnessCount.member_id == assignment.assignee.id,
-                FairnessCount.task_type == task_str
-            ).first()
-            if not fairness_count:
-                from datetime import timedelta
-                fairness_count = FairnessCount(
-                    member_id=assignment.assignee.id,
-                    task_type=task_str,
-                    count=0,
-                    period_start=date.today() - timedelta(days=90),
-                    period_end=date.today()
-                )
-                session.add(fairness_count)
-            fairness_count.count += 1
-            fairness_count.updated_at = date.today()
-    
+    # Save assignments in bulk and update the fairness ledger once per (member, task)
+    assignments = schedule.assignments
+    rows = insert_assignments(session, db_schedule.id, assignments)
+    apply_fairness_deltas(session, fairness_deltas(rows))
+    apply_summary_deltas(session, summary_deltas(rows, db_schedule.status))
+    schedule_id = db_schedule.id
     session.commit()
-    session.refresh(db_schedule)
     
-    # Build response - return only assignments created for this schedule
-    assignments = session.query(AssignmentDB).filter(
-        AssignmentDB.schedule_id == db_schedule.id
-    ).all()
+    # Build the response from the saved rows rather than reading them back
+    names = {a.assignee.id: a.assignee.name for a in assignments}
+    assignment_responses = [_assignment_response(row, names.get(row["member_id"], "Unknown")) for row in rows]
     
-    assignment_responses = []
-    for a in assignments:
-        member = session.query(TeamMemberDB).filter(TeamMemberDB.id == a.member_id).first()
-        assignment_responses.append({
-            "id": a.id,
-            "task_type": a.task_type if isinstance(a.task_type, str) else a.task_type.value,
-            "member_id": a.member_id,
-            "member_name": member.name if member else "Unknown",
-            "assignment_date": a.assignment_date.isoformat(),
+    return {
+        "schedule_id": schedule_id,
+        "start_date": request.start_date.isoformat(),
+        "end_date": request.end_date.isoformat(),
+        "status": "draft",
+        "assignments": assignment_responses,
+        "audit_log": result.audit_log,
+        "cached": cached,
+        **_stats_response(stats)
+    }
+
+@app.post("/api/schedules/preview")
+async def preview_schedule(request: ScheduleGenerateRequest, session: Session = Depends(get_db), admin: User = Depends(require_admin)):
+    """Generate a schedule without saving it (results are cached like /generate)."""
+    result, cached, stats = _generate_cached(session, request)
+    return {
+        "start_date": request.start_date.isoformat(),
+        "end_date": request.end_date.isoformat(),
+        "assignments": [{
+            "task_type": _task_identifier(a.task_type),
+            "member_id": a.assignee.id,
+            "member_name": a.assignee.name,
+            "assignment_date": a.date.isoformat(),
             "week_start": a.week_start.isoformat() if a.week_start else None,
             "shift_label": a.shift_label,
             "custom_task_name": a.custom_task_name,
             "custom_task_shift": a.custom_task_shift,
             "recurrence": a.recurrence
-        })
-    
-    return {
-        "schedule_id": db_schedule.id,
-        "start_date": db_schedule.start_date.isoformat(),
-        "end_date": db_schedule.end_date.isoformat(),
-        "status": db_schedule.status,
-        "assignments": assignment_responses,
-        "audit_log": scheduler.audit.get_log()
+        } for a in result.schedule.assignments],
+        "audit_log": result.audit_log,
+        "cached": cached,
+        **_stats_response(stats)
     }
 
+@app.post("/api/schedules/generate/stream")
+async def generate_schedule_stream(request: ScheduleGenerateRequest, session: Session = Depends(get_db), admin: User = Depends(require_admin)):
+    """Generate a new schedule, streaming NDJSON batches as they are saved.
+    
+    Lines are `{"type": "schedule", ...}` first, then one `{"type": "batch", ...}`
+    per chunk of weeks (its assignments and audit lines, already committed),
+    then `{"type": "done", ...}`. A failure mid-stream emits `{"type": "error"}`;
+    batches committed before it are kept.
+    """
+    members = _load_members(session)
+    
+    if not members:
+        raise HTTPException(status_code=400, detail="No team members available")
+    
+    config = _load_request_config(request, session)
+    task_types = None
+    if request.tasks and len(request.tasks) > 0:
+        task_types = _load_task_types(session, request.tasks)
+    dynamic_fairness_counts = _load_dynamic_fairness_counts(session)
+    names = {m.id: m.name for m in members}
+    
+    def stream():
+        # The request session may be closed before the body is sent; use a dedicated one
+        stream_session = db.get_session()
+        scheduler = None
+        try:
+            db_schedule = ScheduleDB(
+                start_date=request.start_date,
+                end_date=request.end_date,
+                status="draft",
+                created_at=datetime.now(),
+                **_generation_settings(request)
+            )
+            stream_session.add(db_schedule)
+            stream_session.commit()
+            schedule_id = db_schedule.id
+            schedule_status = db_schedule.status
+            yield json.dumps({
+                "type": "schedule",
+                "schedule_id": schedule_id,
+                "start_date": db_schedule.start_date.isoformat(),
+                "end_date": db_schedule.end_date.isoformat(),
+                "status": schedule_status
+            }) + "\n"
+            
+            scheduler = Scheduler(config, dynamic_counts=dynamic_fairness_counts)
+            total = 0
+            batches = scheduler.generate_schedule_iter(
+                members,
+                request.start_date,
+                request.end_date,
+                task_types=task_types,
+                task_members=request.task_members
+            )
+            for batch in batches:
+                rows = insert_assignments(stream_session, schedule_id, batch)
+                apply_fairness_deltas(stream_session, fairness_deltas(rows))
+                apply_summary_deltas(stream_session, summary_deltas(rows, schedule_status))
+                line = json.dumps({
+                    "type": "batch",
+                    "assignments": [
+                        _assignment_response(row, names.get(row["member_id"], "Unknown")) for row in rows
+                    ],
+                    "audit_log": scheduler.audit.drain()
+                }) + "\n"
+                stream_session.commit()
+                total += len(rows)
+                yield line
+            yield json.dumps({"type": "done", "schedule_id": schedule_id, "assignments": total}) + "\n"
+        except Exception as e:
+            import traceback
+            print(f"Failed while streaming schedule generation: {e}")
+            traceback.print_exc()
+            stream_session.rollback()
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+        finally:
+            if scheduler is not None:
+                scheduler.audit.close()
+            stream_session.close()
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.post("/api/schedules/{schedule_id}/regenerate")
+async def regenerate_schedule(schedule_id: int, request: ScheduleRegenerateRequest, session: Session = Depends(get_db), admin: User = Depends(require_admin)):
+    """Regenerate a date window of a schedule, keeping pinned assignments, and persist only the changes."""
+    schedule = session.query(ScheduleDB).filter(ScheduleDB.id == schedule_id).first()
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    window_start = max(request.start_date, schedule.start_date)
+    window_end = min(request.end_date, schedule.end_date)
+    if window_start > window_end:
+        raise HTTPException(status_code=400, detail="Window does not overlap the schedule")
+    
+    try:
+        result = _regenerate_schedule(
+            session, schedule, window_start, window_end,
+            request.pinned_assignment_ids, task_members=request.task_members
+        )
+        session.commit()
+    except Exception as e:
+        import traceback
+        print(f"Failed to regenerate schedule {schedule_id}: {e}")
+        traceback.print_exc()
+        session.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    return result
+
 @app.get("/api/schedules", response_model=List[dict])
 async def get_schedules(session: Session = Depends(get_db), user: User = Depends(get_current_user)):
     """Get all schedules."""
@@ -854,35 +1287,10 @@ async def delete_schedule(schedule_id: int, session: Session = Depends(get_db),
             SwapRequest.assignment_id.in_(assignment_ids)
         ).delete(synchronize_session=False)
 
-    # Decrement fairness counts for these assignments if rows exist
-    for a in assignments:
-        # If this was a dynamic/custom task, decrement DynamicFairnessCount
-        from .database import DynamicFairnessCount
-        if a.custom_task_name or (isinstance(a.task_type, str) and a.task_type not in {t.value for t in TaskType}):
-            tname = a.custom_task_name or a.task_type
-            dfc = session.query(DynamicFairnessCount).filter(
-                DynamicFairnessCount.member_id == a.member_id,
-                DynamicFairnessCount.task_name == tname
-            ).first()
-            if dfc:
-                if dfc.count and dfc.count > 0:
-                    dfc.count -= 1
-                    dfc.updated_at = date.today()
-                # Clean up zeroed counters
-                if not dfc.count or dfc.count <= 0:
-                    session.delete(dfc)
-        else:
-            fc = session.query(FairnessCount).filter(
-                FairnessCount.member_id == a.member_id,
-                FairnessCount.task_type == a.task_type
-            ).first()
-            if fc:
-                if fc.count and fc.count > 0:
-                    fc.count -= 1
-                    fc.updated_at = date.today()
-                # Clean up zeroed counters
-                if not fc.count or fc.count <= 0:
-                    session.delete(fc)
+    # Decrement fairness counts for these assignments
+    keys = _assignment_keys(assignments)
+    apply_fairness_deltas(session, fairness_deltas(keys, -1))
+    apply_summary_deltas(session, summary_deltas(keys, schedule.status, -1))
 
     # Delete assignments
     if assignment_ids:
@@ -899,30 +1307,7 @@ async def delete_schedule(schedule_id: int, session: Session = Depends(get_db),
     ).all()
     orphan_ids = [o.id for o in orphaned]
     if orphaned:
-        for a in orphaned:
-            if a.custom_task_name or (isinstance(a.task_type, str) and a.task_type not in {t.value for t in TaskType}):
-                tname = a.custom_task_name or a.task_type
-                dfc = session.query(DynamicFairnessCount).filter(
-                    DynamicFairnessCount.member_id == a.member_id,
-                    DynamicFairnessCount.task_name == tname
-                ).first()
-                if dfc:
-                    if dfc.count and dfc.count > 0:
-                        dfc.count -= 1
-                        dfc.updated_at = date.today()
-                    if not dfc.count or dfc.count <= 0:
-                        session.delete(dfc)
-            else:
-                fc = session.query(FairnessCount).filter(
-                    FairnessCount.member_id == a.member_id,
-                    FairnessCount.task_type == a.task_type
-                ).first()
-                if fc:
-                    if fc.count and fc.count > 0:
-                        fc.count -= 1
-                        fc.updated_at = date.today()
-                    if not fc.count or fc.count <= 0:
-                        session.delete(fc)
+        apply_fairness_deltas(session, fairness_deltas(_assignment_keys(orphaned), -1))
         session.query(AssignmentDB).filter(AssignmentDB.id.in_(orphan_ids)).delete(synchronize_session=False)
 
     # Delete schedule
@@ -952,36 +1337,16 @@ async def recalculate_fairness(session: Session = Depends(get_db), user: User =
         session.query(FairnessCount).delete(synchronize_session=False)
         session.query(DynamicFairnessCount).delete(synchronize_session=False)
 
-        # Query relevant assignments
-        rows = session.query(AssignmentDB.member_id, AssignmentDB.task_type, AssignmentDB.custom_task_name).filter(
+        # Count assignments per (member, task) and write them in one upsert per table
+        rows = session.query(
+            AssignmentDB.member_id, AssignmentDB.task_type, AssignmentDB.custom_task_name, func.count()
+        ).filter(
             AssignmentDB.assignment_date >= cutoff
-        ).all()
-
-        enum_task_values = {t.value for t in TaskType}
-
-        for member_id, task_type, custom_name in rows:
-            if custom_name or (isinstance(task_type, str) and task_type not in enum_task_values):
-                tname = custom_name or task_type or 'CUSTOM'
-                dfc = session.query(DynamicFairnessCount).filter(
-                    DynamicFairnessCount.member_id == member_id,
-                    DynamicFairnessCount.task_name == tname
-                ).first()
-                if not dfc:
-                    dfc = DynamicFairnessCount(member_id=member_id, task_name=tname, count=0, updated_at=date.today())
-                    session.add(dfc)
-                dfc.count = (dfc.count or 0) + 1
-                dfc.updated_at = date.today()
-            else:
-                task_str = task_type
-                fc = session.query(FairnessCount).filter(
-                    FairnessCount.member_id == member_id,
-                    FairnessCount.task_type == task_str
-                ).first()
-                if not fc:
-                    fc = FairnessCount(member_id=member_id, task_type=task_str, count=0, period_start=date.today()-timedelta(days=window_days), period_end=date.today())
-                    session.add(fc)
-                fc.count = (fc.count or 0) + 1
-                fc.updated_at = date.today()
+        ).group_by(AssignmentDB.member_id, AssignmentDB.task_type, AssignmentDB.custom_task_name).all()
+        deltas = Counter()
+        for member_id, task_type, custom_name, count in rows:
+            deltas[fairness_key(member_id, task_type, custom_name)] += count
+        apply_fairness_deltas(session, deltas, period_days=window_days)
 
         session.commit()
 
@@ -1003,25 +1368,14 @@ async def get_schedule(schedule_id: int, session: Session = Depends(get_db), use
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
     
-    assignments = session.query(AssignmentDB).filter(
+    # Assignments with their member names in one joined query
+    rows = session.query(*AssignmentDB.__table__.c, TeamMemberDB.name.label("member_name")).outerjoin(
+        TeamMemberDB, TeamMemberDB.id == AssignmentDB.member_id
+    ).filter(
         AssignmentDB.schedule_id == schedule_id
-    ).all()
+    ).order_by(AssignmentDB.id).all()
     
-    assignment_responses = []
-    for a in assignments:
-        member = session.query(TeamMemberDB).filter(TeamMemberDB.id == a.member_id).first()
-        assignment_responses.append({
-            "id": a.id,
-            "task_type": a.task_type if isinstance(a.task_type, str) else a.task_type.value,
-            "member_id": a.member_id,
-            "member_name": member.name if member else "Unknown",
-            "assignment_date": a.assignment_date.isoformat(),
-            "week_start": a.week_start.isoformat() if a.week_start else None,
-            "shift_label": a.shift_label,
-            "custom_task_name": a.custom_task_name,
-            "custom_task_shift": a.custom_task_shift,
-            "recurrence": a.recurrence
-        })
+    assignment_responses = [_assignment_response(row._mapping, row.member_name or "Unknown") for row in rows]
     
     return {
         "id": schedule.id,
@@ -1040,8 +1394,7 @@ async def export_schedule_csv(schedule_id: int, session: Session = Depends(get_d
         raise HTTPException(status_code=404, detail="Schedule not found")
     
     # Build schedule model
-    db_members = session.query(TeamMemberDB).all()
-    members_dict = {m.id: db_member_to_model(m, session) for m in db_members}
+    members_dict = {m.id: m for m in _load_members(session)}
     
     assignments = session.query(AssignmentDB).filter(
         AssignmentDB.schedule_id == schedule_id
@@ -1080,8 +1433,7 @@ async def export_schedule_xlsx(schedule_id: int, session: Session = Depends(get_
         raise HTTPException(status_code=404, detail="Schedule not found")
 
     # Build schedule model
-    db_members = session.query(TeamMemberDB).all()
-    members_dict = {m.id: db_member_to_model(m, session) for m in db_members}
+    members_dict = {m.id: m for m in _load_members(session)}
 
     assignments = session.query(AssignmentDB).filter(
         AssignmentDB.schedule_id == schedule_id
@@ -1115,7 +1467,7 @@ async def export_schedule_xlsx(schedule_id: int, session: Session = Depends(get_
 async def get_fairness_counts(
     session: Session = Depends(get_db),
     schedule_id: Optional[int] = None,
-    statuses: Optional[str] = "draft,published",
+    statuses: Optional[str] = DEFAULT_STATUSES,
     include_columns: bool = False,
 ):
     """Get fairness counts for all members based on live schedules.
@@ -1124,113 +1476,23 @@ async def get_fairness_counts(
     - Otherwise, include assignments that belong to existing schedules filtered by `statuses` (comma-separated).
     - Orphaned assignments (no schedule) are excluded to avoid stale values after deletions.
     """
-    members = session.query(TeamMemberDB).all()
-    result = []
-
-    # Build base assignment query limited to live schedules
-    base_q = session.query(AssignmentDB)
-    if schedule_id is not None:
-        base_q = base_q.filter(AssignmentDB.schedule_id == schedule_id)
-    else:
-        base_q = base_q.join(ScheduleDB, AssignmentDB.schedule_id == ScheduleDB.id)
-        if statuses:
-            allowed_statuses = [s.strip() for s in statuses.split(',') if s.strip()]
-            if allowed_statuses:
-                base_q = base_q.filter(ScheduleDB.status.in_(allowed_statuses))
-
-    # Determine which task identifiers are present in the filtered assignments
-    present_types = set(
-        r[0] for r in base_q.with_entities(AssignmentDB.task_type).distinct().all()
-    )
-    enum_values = {t.value for t in TaskType}
-    enum_present = [tv for tv in enum_values if tv in present_types]
-    dynamic_task_types = [t for t in present_types if t not in enum_values]
-
-    for member in members:
-        counts: Dict[str, int] = {}
-        total = 0
-
-        # Built-in tasks actually present
-        for task_val in enum_present:
-            c = base_q.filter(
-                AssignmentDB.member_id == member.id,
-                AssignmentDB.task_type == task_val,
-            ).count()
-            counts[task_val] = c
-            total += c
-
-        # Dynamic/custom tasks present
-        for dt in dynamic_task_types:
-            c = base_q.filter(
-                AssignmentDB.member_id == member.id,
-                AssignmentDB.task_type == dt,
-            ).count()
-            counts[dt] = c
-            total += c
-
-        result.append({
-            "member_id": member.id,
-            "member_name": member.name,
-            "counts": counts,
-            "total": total,
-        })
-
+    table = fairness_table(session, schedule_id, statuses)
     if include_columns:
-        # Order columns: built-ins first (enum order), then dynamic alphabetical
-        builtin_order = [t.value for t in TaskType if t.value in enum_present]
-        dyn_order = sorted(dynamic_task_types)
-        columns = builtin_order + dyn_order
-        return {"columns": columns, "rows": result}
-    else:
-        return result
+        return table.to_dict()
+    return table.rows
 
 @app.get("/api/fairness/export/pdf")
 async def export_fairness_pdf(
     session: Session = Depends(get_db),
     user: User = Depends(get_current_user),
     schedule_id: Optional[int] = None,
-    statuses: Optional[str] = "draft,published",
+    statuses: Optional[str] = DEFAULT_STATUSES,
 ):
     """Export fairness tracking data to PDF based on live schedules (dynamic columns)."""
-    # Reuse the same logic as get_fairness_counts
-    base_q = session.query(AssignmentDB)
-    if schedule_id is not None:
-        base_q = base_q.filter(AssignmentDB.schedule_id == schedule_id)
-    else:
-        base_q = base_q.join(ScheduleDB, AssignmentDB.schedule_id == ScheduleDB.id)
-        if statuses:
-            allowed_statuses = [s.strip() for s in statuses.split(',') if s.strip()]
-            if allowed_statuses:
-                base_q = base_q.filter(ScheduleDB.status.in_(allowed_statuses))
-
-    present_types = set(r[0] for r in base_q.with_entities(AssignmentDB.task_type).distinct().all())
-    enum_values = {t.value for t in TaskType}
-    # Order: built-ins first (if present), then others alphabetically
-    builtin_order = [t.value for t in TaskType if t.value in present_types]
-    dynamic_order = sorted([t for t in present_types if t not in enum_values])
-    columns = builtin_order + dynamic_order
-
-    members = session.query(TeamMemberDB).all()
-    fairness_data = []
-    for member in members:
-        counts = {}
-        total = 0
-        for col in columns:
-            c = base_q.filter(
-                AssignmentDB.member_id == member.id,
-                AssignmentDB.task_type == col,
-            ).count()
-            counts[col] = c
-            total += c
-        fairness_data.append({
-            "member_id": member.id,
-            "member_name": member.name,
-            "counts": counts,
-            "total": total,
-        })
+    table = fairness_table(session, schedule_id, statuses)
 
     file_path = f"out/fairness_{date.today().isoformat()}.pdf"
-    export_fairness_to_pdf(fairness_data, file_path, columns=columns)
+    export_fairness_to_pdf(table.rows, file_path, columns=table.columns)
     return FileResponse(file_path, media_type="application/pdf", filename=f"fairness_{date.today().isoformat()}.pdf")
 
 # Convenience endpoint for frontend to always get dynamic columns + rows
@@ -1238,49 +1500,13 @@ async def export_fairness_pdf(
 async def get_fairness_table(
     session: Session = Depends(get_db),
     schedule_id: Optional[int] = None,
-    statuses: Optional[str] = "draft,published",
+    statuses: Optional[str] = DEFAULT_STATUSES,
 ):
     """Return fairness data as {columns, rows} based on live schedules, with dynamic columns.
 
     Built-in ATM/SysAid columns are included only if present in the filtered assignments.
     """
-    members = session.query(TeamMemberDB).all()
-    result = []
-
-    base_q = session.query(AssignmentDB)
-    if schedule_id is not None:
-        base_q = base_q.filter(AssignmentDB.schedule_id == schedule_id)
-    else:
-        base_q = base_q.join(ScheduleDB, AssignmentDB.schedule_id == ScheduleDB.id)
-        if statuses:
-            allowed_statuses = [s.strip() for s in statuses.split(',') if s.strip()]
-            if allowed_statuses:
-                base_q = base_q.filter(ScheduleDB.status.in_(allowed_statuses))
-
-    present_types = set(r[0] for r in base_q.with_entities(AssignmentDB.task_type).distinct().all())
-    enum_values = {t.value for t in TaskType}
-    builtin_order = [t.value for t in TaskType if t.value in present_types]
-    dynamic_order = sorted([t for t in present_types if t not in enum_values])
-    columns = builtin_order + dynamic_order
-
-    for member in members:
-        counts: Dict[str, int] = {}
-        total = 0
-        for col in columns:
-            c = base_q.filter(
-                AssignmentDB.member_id == member.id,
-                AssignmentDB.task_type == col,
-            ).count()
-            counts[col] = c
-            total += c
-        result.append({
-            "member_id": member.id,
-            "member_name": member.name,
-            "counts": counts,
-            "total": total,
-        })
-
-    return {"columns": columns, "rows": result}
+    return fairness_table(session, schedule_id, statuses).to_dict()
 
 # Configuration
 @app.get("/api/config")
@@ -1322,7 +1548,18 @@ async def startup_event():
     try:
         print("Initializing database...")
         db.create_tables()
+        session = db.get_session()
+        try:
+            if ensure_fairness_summary(session):
+                session.commit()
+                print("Built fairness summary from existing assignments")
+        finally:
+            session.close()
         print("Database initialized successfully")
+    except MigrationError as e:
+        # Fairness writes depend on this migration: refuse to start rather than fail on every write
+        print(f"ERROR: Database migration failed: {e}")
+        raise
     except Exception as e:
         import traceback
         print(f"ERROR: Failed to initialize database: {e}")
@@ -1343,6 +1580,7 @@ class TaskTypeDefCreate(BaseModel):
     role_labels: List[str] = []
     rules_json: Optional[dict] = None
     shifts: List[ShiftDefModel] = []
+    required_skills: List[str] = []
 
 @app.get("/api/task-types")
 async def list_task_types(session: Session = Depends(get_db), user: User = Depends(get_current_user)):
@@ -1357,6 +1595,7 @@ async def list_task_types(session: Session = Depends(get_db), user: User = Depen
             "required_count": t.required_count,
             "role_labels": t.role_labels or [],
             "rules_json": json.loads(t.rules_json) if t.rules_json else None,
+            "required_skills": t.required_skills or [],
             "shifts": [
                 {"id": s.id, "label": s.label, "start_time": s.start_time, "end_time": s.end_time, "required_count": s.required_count}
                 for s in shifts
@@ -1366,12 +1605,15 @@ async def list_task_types(session: Session = Depends(get_db), user: User = Depen
 
 @app.post("/api/task-types")
 async def create_task_type(payload: TaskTypeDefCreate, session: Session = Depends(get_db), admin: User = Depends(require_admin)):
+    if payload.name == ATM_PLAN_TASK_NAME and payload.rules_json and payload.rules_json.get("shift_plan"):
+        _validate_atm_shift_plan(payload.rules_json["shift_plan"])
     t = TaskTypeDef(
         name=payload.name,
         recurrence=payload.recurrence,
         required_count=payload.required_count,
         role_labels=payload.role_labels,
-        rules_json=json.dumps(payload.rules_json) if payload.rules_json else None
+        rules_json=json.dumps(payload.rules_json) if payload.rules_json else None,
+        required_skills=payload.required_skills
     )
     session.add(t)
     session.flush()
@@ -1403,12 +1645,15 @@ async def update_task_type(task_type_id: int, payload: TaskTypeDefUpdate, sessio
     t = session.query(TaskTypeDef).filter(TaskTypeDef.id == task_type_id).first()
     if not t:
         raise HTTPException(status_code=404, detail="Not found")
+    if payload.name == ATM_PLAN_TASK_NAME and payload.rules_json and payload.rules_json.get("shift_plan"):
+        _validate_atm_shift_plan(payload.rules_json["shift_plan"])
     session.query(ShiftDef).filter(ShiftDef.task_type_id == t.id).delete()
     t.name = payload.name
     t.recurrence = payload.recurrence
     t.required_count = payload.required_count
     t.role_labels = payload.role_labels
     t.rules_json = json.dumps(payload.rules_json) if payload.rules_json else None
+    t.required_skills = payload.required_skills
     session.flush()
     for sh in payload.shifts:
         s = ShiftDef(task_type_id=t.id, label=sh.label, start_time=sh.start_time, end_time=sh.end_time, required_count=sh.required_count)
@@ -1460,7 +1705,11 @@ async def propose_swap(payload: SwapRequestCreate, session: Session = Depends(ge
 
 @app.get("/api/swaps")
 async def list_swaps(session: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    swaps = session.query(SwapRequest).all()
+    swaps = session.query(SwapRequest).options(
+        selectinload(SwapRequest.assignment),
+        selectinload(SwapRequest.requested_by_member),
+        selectinload(SwapRequest.proposed_member),
+    ).all()
     outgoing = []
     incoming = []
     admin_pending = []
@@ -1517,7 +1766,7 @@ async def decide_swap(swap_id: int, approve: bool, session: Session = Depends(ge
     if approve and swap.proposed_member_id:
         assignment = session.query(AssignmentDB).filter(AssignmentDB.id == swap.assignment_id).first()
         if assignment:
-            assignment.member_id = swap.proposed_member_id
+            _reassign(session, assignment, swap.proposed_member_id)
     
     session.commit()
     return {"swap": _serialize_swap(swap)}
@@ -1534,7 +1783,7 @@ async def update_assignment(assignment_id: int, payload: AssignmentUpdate, sessi
     member = session.query(TeamMemberDB).filter(TeamMemberDB.id == payload.member_id).first()
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
-    assignment.member_id = payload.member_id
+    _reassign(session, assignment, payload.member_id)
     session.commit()
     return {"message": "Assignment updated"}
 
@@ -1547,8 +1796,7 @@ async def export_schedule_excel(schedule_id: int, session: Session = Depends(get
         raise HTTPException(status_code=404, detail="Schedule not found")
     
     # Build schedule model
-    db_members = session.query(TeamMemberDB).all()
-    members_dict = {m.id: db_member_to_model(m, session) for m in db_members}
+    members_dict = {m.id: m for m in _load_members(session)}
     
     assignments = session.query(AssignmentDB).filter(
         AssignmentDB.schedule_id == schedule_id
@@ -1585,8 +1833,7 @@ async def export_schedule_pdf(schedule_id: int, session: Session = Depends(get_d
         raise HTTPException(status_code=404, detail="Schedule not found")
     
     # Build schedule model
-    db_members = session.query(TeamMemberDB).all()
-    members_dict = {m.id: db_member_to_model(m, session) for m in db_members}
+    members_dict = {m.id: m for m in _load_members(session)}
     
     assignments = session.query(AssignmentDB).filter(
         AssignmentDB.schedule_id == schedule_id
@@ -0,0 +1,236 @@
+"""Structured, level-gated audit log for scheduling decisions.
+
+Events keep their fields (event type, date, member, task, candidate count)
+and a message template; text is only rendered when the log is read. Events
+below the configured level are never built. The buffer can be capped: the
+oldest events are then dropped (ring buffer) or appended to a spill file.
+"""
+
+import os
+import tempfile
+from collections import deque
+from datetime import date
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+
+def parse_level(level: str | int) -> int:
+    """Level number for a name such as "INFO" (numbers pass through)."""
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVELS[str(level).upper()]
+    except KeyError:
+        raise ValueError(f"Unknown audit level '{level}' (expected one of {', '.join(LEVELS)})")
+
+
+class AuditEvent:
+    """One audit record; `render()` formats its message on demand.
+
+    Without `fields` the template is used verbatim (plain messages).
+    """
+
+    __slots__ = ("level", "kind", "date", "member_id", "task", "candidates", "template", "fields")
+
+    def __init__(
+        self,
+        level: int,
+        kind: str,
+        template: str,
+        date: Optional[date] = None,
+        member_id: Optional[str] = None,
+        task: Optional[str] = None,
+        candidates: Optional[int] = None,
+        fields: Optional[Dict[str, Any]] = None
+    ):
+        self.level = level
+        self.kind = kind
+        self.template = template
+        self.date = date
+        self.member_id = member_id
+        self.task = task
+        self.candidates = candidates
+        self.fields = fields
+
+    def render(self) -> str:
+        """The event as a line of text."""
+        if self.fields is not None:
+            text = self.template.format(
+                date=self.date, member_id=self.member_id, task=self.task,
+                candidates=self.candidates, **self.fields
+            )
+        else:
+            text = self.template
+        return f"WARNING: {text}" if self.level >= WARNING else text
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The event as a JSON-serializable dict."""
+        return {
+            "level": LEVEL_NAMES.get(self.level, str(self.level)),
+            "event": self.kind,
+            "date": self.date.isoformat() if self.date else None,
+            "member_id": self.member_id,
+            "task": self.task,
+            "candidates": self.candidates,
+            "message": self.render(),
+        }
+
+
+class AuditLog:
+    """Audit log for scheduling decisions.
+
+    `max_entries` caps the in-memory buffer (0 = unbounded). When it is
+    exceeded the oldest events are appended as text to a spill file of this
+    log's own, created in `spill_dir`, or dropped if no directory is
+    configured. `close()` deletes the spill file.
+    """
+
+    def __init__(self, level: str | int = INFO, max_entries: int = 0, spill_dir: Optional[str] = None):
+        self.level = parse_level(level)
+        self.max_entries = max_entries
+        self.spill_dir = spill_dir
+        self.dropped = 0
+        self.spilled = 0
+        self._events: Deque[AuditEvent] = deque()
+        self._total = 0
+        self._spill_file = None
+        self._drained = 0  # spill file offset up to which `drain()` has returned lines
+
+    @classmethod
+    def from_config(cls, config) -> "AuditLog":
+        """Build an audit log from the `audit_*` settings of a `SchedulingConfig`."""
+        return cls(config.audit_level, config.audit_max_entries, config.audit_spill_dir)
+
+    def enabled(self, level: int) -> bool:
+        """True if events at `level` are recorded; guard costly arguments with this."""
+        return level >= self.level
+
+    def record(
+        self,
+        level: int,
+        kind: str,
+        template: str,
+        date: Optional[date] = None,
+        member_id: Optional[str] = None,
+        task: Optional[str] = None,
+        candidates: Optional[int] = None,
+        **fields
+    ):
+        """Record an event if `level` is enabled.
+
+        `template` is a `str.format` template over `date`, `member_id`,
+        `task`, `candidates` and any extra keyword fields.
+        """
+        if level < self.level:
+            return
+        self._append(AuditEvent(level, kind, template, date, member_id, task, candidates, fields))
+
+    def debug(self, kind: str, template: str, **kwargs):
+        if DEBUG >= self.level:
+            self.record(DEBUG, kind, template, **kwargs)
+
+    def info(self, kind: str, template: str, **kwargs):
+        if INFO >= self.level:
+            self.record(INFO, kind, template, **kwargs)
+
+    def warning(self, kind: str, template: str, **kwargs):
+        if WARNING >= self.level:
+            self.record(WARNING, kind, template, **kwargs)
+
+    def log(self, message: str):
+        """Add a plain INFO message to the audit log."""
+        if INFO >= self.level:
+            self._append(AuditEvent(INFO, "message", message))
+
+    def _append(self, event: AuditEvent):
+        self._events.append(event)
+        self._total += 1
+        if self.max_entries and len(self._events) > self.max_entries:
+            self._evict(max(1, self.max_entries // 2) if self.spill_dir else 1)
+
+    def _evict(self, count: int):
+        """Move the `count` oldest events out of memory."""
+        events = self._events
+        if self.spill_dir:
+            if self._spill_file is None:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                self._spill_file = tempfile.NamedTemporaryFile(
+                    "w+", encoding="utf-8", dir=self.spill_dir, prefix="audit-", suffix=".log"
+                )
+            self._spill_file.write("".join(events.popleft().render() + "\n" for _ in range(count)))
+            self.spilled += count
+        else:
+            for _ in range(count):
+                events.popleft()
+            self.dropped += count
+
+    def extend(self, events: Iterable[AuditEvent]):
+        """Append events recorded elsewhere (e.g. by a worker process)."""
+        for event in events:
+            if event.level >= self.level:
+                self._append(event)
+
+    def mark(self) -> int:
+        """Position to pass to `since()`."""
+        return self._total
+
+    def since(self, mark: int) -> List[AuditEvent]:
+        """Events recorded after `mark` that are still in memory."""
+        count = min(self._total - mark, len(self._events))
+        return list(self._events)[len(self._events) - count:] if count > 0 else []
+
+    @property
+    def events(self) -> List[AuditEvent]:
+        """Events currently held in memory."""
+        return list(self._events)
+
+    @property
+    def entries(self) -> List[str]:
+        """In-memory events rendered as text."""
+        return [event.render() for event in self._events]
+
+    def _read_spill(self, offset: int) -> str:
+        """Spilled text from `offset` on; further spills are still appended at the end."""
+        f = self._spill_file
+        if f is None:
+            return ""
+        f.flush()
+        f.seek(offset)
+        text = f.read()
+        f.seek(0, os.SEEK_END)
+        return text
+
+    def get_log(self) -> str:
+        """Get the full audit log as a string (spilled events included)."""
+        lines = []
+        if self.spilled:
+            lines.append(self._read_spill(0).rstrip("\n"))
+        if self.dropped:
+            lines.append(f"... {self.dropped} earlier audit entries dropped")
+        lines.extend(self.entries)
+        return "\n".join(lines)
+
+    def drain(self) -> List[str]:
+        """Return the entries recorded since the last drain as text and clear them.
+
+        Entries spilled in the meantime come first.
+        """
+        entries = []
+        if self._spill_file is not None:
+            entries = self._read_spill(self._drained).splitlines()
+            self._drained = self._spill_file.tell()
+        entries.extend(self.entries)
+        self._events.clear()
+        return entries
+
+    def close(self):
+        """Close and delete the spill file, if any."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
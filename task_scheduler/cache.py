@@ -0,0 +1,145 @@
+"""Content-addressed cache of generated schedules.
+
+Results are keyed by a digest of every scheduler input (roster with
+unavailability, config including the seed, task types, task members, date
+range and fairness counts). Identical inputs give identical output (see
+`SchedulingConfig.seed`), so a hit can skip the scheduler entirely.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, is_dataclass, replace
+from datetime import date
+from typing import Dict, List, Optional
+
+from .config import SchedulingConfig
+from .models import FairnessLedger, Schedule, TeamMember
+from .task_type_model import DynamicTaskType
+
+
+@dataclass
+class CachedSchedule:
+    """A generated schedule and its rendered audit log."""
+    schedule: Schedule
+    audit_log: str
+
+    def copy(self) -> "CachedSchedule":
+        """A copy with its own Schedule, assignments and assignees, safe to modify."""
+        members: Dict[str, TeamMember] = {}
+        assignments = []
+        for a in self.schedule.assignments:
+            member = members.get(a.assignee.id)
+            if member is None:
+                member = members[a.assignee.id] = copy.deepcopy(a.assignee)
+            assignments.append(replace(a, assignee=member))
+        schedule = Schedule(start_date=self.schedule.start_date, end_date=self.schedule.end_date)
+        schedule.extend(assignments)
+        return CachedSchedule(schedule, self.audit_log)
+
+
+def _canonical_member(member: TeamMember) -> list:
+    return [
+        member.id,
+        member.name,
+        sorted(member.office_days),
+        sorted(d.isoformat() for d in member.unavailable_dates),
+        sorted([start.isoformat(), end.isoformat()] for start, end in member.unavailable_ranges),
+        sorted(member.skills),
+    ]
+
+
+def schedule_digest(
+    members: List[TeamMember],
+    config: SchedulingConfig,
+    start_date: date,
+    end_date: date,
+    task_types: Optional[List[DynamicTaskType]] = None,
+    task_members: Optional[Dict[str, List[str]]] = None,
+    dynamic_counts: Optional[Dict[str, Dict[str, int]]] = None,
+    ledger: Optional[FairnessLedger] = None
+) -> str:
+    """Stable SHA-256 digest of the inputs of one `generate_schedule` call.
+
+    Roster order is part of the key since it is the default tie-break.
+    """
+    payload = {
+        "members": [_canonical_member(m) for m in members],
+        "config": asdict(config),
+        "range": [start_date.isoformat(), end_date.isoformat()],
+        "task_types": [asdict(t) if is_dataclass(t) else vars(t) for t in task_types or []],
+        "task_members": {task: sorted(ids) for task, ids in (task_members or {}).items()},
+        "dynamic_counts": {
+            task: {member_id: count for member_id, count in counts.items() if count}
+            for task, counts in (dynamic_counts or {}).items()
+        },
+        "ledger": ledger.member_counts if ledger is not None else {},
+    }
+    raw = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ScheduleCache:
+    """LRU cache of `CachedSchedule` results.
+
+    Evicts least recently used entries once there are more than
+    `max_entries` results or more than `max_assignments` assignments held
+    in total. Results are copied on the way in and out, so callers may
+    modify what they put or get without changing the cached entry.
+    """
+
+    def __init__(self, max_entries: int = 32, max_assignments: int = 200000):
+        self.max_entries = max_entries
+        self.max_assignments = max_assignments
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedSchedule]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedSchedule]:
+        """Cached result for `key`, marking it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry.copy()
+
+    def put(self, key: str, entry: CachedSchedule):
+        """Store a result, evicting old ones to stay within the limits."""
+        size = len(entry.schedule.assignments)
+        if self.max_entries <= 0 or size > self.max_assignments:
+            return
+        entry = entry.copy()  # outside the lock; it is the slow part
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.schedule.assignments)
+            self._entries[key] = entry
+            self._size += size
+            self._evict()
+
+    def resize(self, max_entries: int, max_assignments: int):
+        """Change the limits, evicting entries if needed."""
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_assignments = max_assignments
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_assignments):
+            _, old = self._entries.popitem(last=False)
+            self._size -= len(old.schedule.assignments)
@@ -1,11 +1,13 @@
 """Command-line interface for the task scheduler."""
 
 import click
+import json
 from datetime import date, timedelta
 from pathlib import Path
 from .loader import load_team
 from .config import SchedulingConfig
 from .scheduler import Scheduler
+from .stats import SchedulerStats
 from .export import export_to_csv, export_to_ics, export_audit_log
 
 
@@ -23,7 +25,9 @@ def cli():
 @click.option('--out', '-o', type=click.Path(), default='out/schedule.csv', help='Output CSV file path')
 @click.option('--ics', type=click.Path(), help='Optional: also export to ICS calendar file')
 @click.option('--audit', type=click.Path(), default='out/audit.log', help='Path for audit log file')
-def generate(team, config, start, end, out, ics, audit):
+@click.option('--stats', type=click.Path(), help='Optional: write scheduler instrumentation stats (JSON)')
+@click.option('--flamegraph', type=click.Path(), help='Optional: write phase times as collapsed stacks (flamegraph.pl / speedscope)')
+def generate(team, config, start, end, out, ics, audit, stats, flamegraph):
     """Generate a schedule for the specified date range."""
     try:
         # Parse dates
@@ -42,6 +46,8 @@ def generate(team, config, start, end, out, ics, audit):
         
         click.echo(f"Generating schedule from {start_date} to {end_date}...")
         scheduler = Scheduler(scheduling_config)
+        if (stats or flamegraph) and scheduler.stats is None:
+            scheduler.stats = SchedulerStats()
         schedule = scheduler.generate_schedule(members, start_date, end_date)
         
         click.echo(f"Generated {len(schedule.assignments)} assignments")
@@ -63,12 +69,23 @@ def generate(team, config, start, end, out, ics, audit):
         audit_path = Path(audit)
         audit_path.parent.mkdir(parents=True, exist_ok=True)
         export_audit_log(scheduler.audit.get_log(), audit)
+        scheduler.audit.close()
+        
+        for path, content in ((stats, lambda: json.dumps(scheduler.stats.to_dict(), indent=2)),
+                              (flamegraph, lambda: scheduler.stats.to_folded())):
+            if path:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                Path(path).write_text(content() + "\n", encoding="utf-8")
         
         click.echo(f"\nSchedule generated successfully!")
         click.echo(f"  - CSV: {out}")
         if ics:
             click.echo(f"  - ICS: {ics}")
         click.echo(f"  - Audit log: {audit}")
+        if stats:
+            click.echo(f"  - Stats: {stats}")
+        if flamegraph:
+            click.echo(f"  - Flamegraph stacks: {flamegraph}")
         
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
@@ -0,0 +1,175 @@
+"""Columnar schedule store for long horizons.
+
+`ColumnarSchedule` keeps assignments as parallel typed arrays (date
+ordinals, member indices, `TASKS` codes and interned shift strings) instead
+of one object per assignment, and materializes `Assignment` objects only when they
+are read. It offers the read API of `Schedule`, so exports accept either.
+"""
+
+from array import array
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from .models import TASKS, Assignment, Schedule, TaskType, TeamMember
+
+_COLUMNS = ("_dates", "_weeks", "_members", "_tasks", "_shifts", "_custom_names", "_custom_shifts", "_recurrences")
+
+
+class ColumnarSchedule:
+    """Append-only schedule stored column-wise.
+
+    Each row costs a few bytes per column; strings (task identifiers, shift
+    labels) are interned once. Lookup indexes (by date, member, week, task)
+    are built on first use and extended as rows are added.
+    """
+
+    def __init__(self, start_date: Optional[date] = None, end_date: Optional[date] = None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self._dates = array("i")
+        self._weeks = array("i")  # 0 = no week start
+        self._members = array("i")
+        self._tasks = array("i")  # TASKS codes
+        self._shifts = array("i")
+        self._custom_names = array("i")
+        self._custom_shifts = array("i")
+        self._recurrences = array("i")
+        self.members: List[TeamMember] = []
+        self._member_index: Dict[str, int] = {}
+        # Interned strings; code 0 is None
+        self._values: List[Optional[str]] = [None]
+        self._codes: Dict[Optional[str], int] = {None: 0}
+        # column name -> (rows indexed so far, { key -> rows })
+        self._indexes: Dict[str, tuple] = {}
+
+    @classmethod
+    def from_schedule(cls, schedule: Schedule) -> "ColumnarSchedule":
+        """Compact an existing `Schedule`."""
+        store = cls(schedule.start_date, schedule.end_date)
+        store.extend(schedule.assignments)
+        return store
+
+    def to_schedule(self) -> Schedule:
+        """Materialize every row into a regular `Schedule`."""
+        schedule = Schedule(start_date=self.start_date, end_date=self.end_date)
+        schedule.extend(list(self))
+        return schedule
+
+    def _code(self, value: Optional[str]) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._values)
+            self._values.append(value)
+        return code
+
+    def add(self, assignment: Assignment):
+        """Append an assignment."""
+        member = assignment.assignee
+        member_pos = self._member_index.get(member.id)
+        if member_pos is None:
+            member_pos = self._member_index[member.id] = len(self.members)
+            self.members.append(member)
+        self._dates.append(assignment.date.toordinal())
+        self._weeks.append(assignment.week_start.toordinal() if assignment.week_start else 0)
+        self._members.append(member_pos)
+        self._tasks.append(TASKS.code(assignment.task_type))
+        self._shifts.append(self._code(assignment.shift_label))
+        self._custom_names.append(self._code(assignment.custom_task_name))
+        self._custom_shifts.append(self._code(assignment.custom_task_shift))
+        self._recurrences.append(self._code(assignment.recurrence))
+
+    def extend(self, assignments: Iterable[Assignment]):
+        """Append several assignments."""
+        for assignment in assignments:
+            self.add(assignment)
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def _row(self, i: int) -> Assignment:
+        values = self._values
+        week = self._weeks[i]
+        return Assignment(
+            task_type=TASKS.task_type(self._tasks[i]),
+            assignee=self.members[self._members[i]],
+            date=date.fromordinal(self._dates[i]),
+            week_start=date.fromordinal(week) if week else None,
+            shift_label=values[self._shifts[i]],
+            custom_task_name=values[self._custom_names[i]],
+            custom_task_shift=values[self._custom_shifts[i]],
+            recurrence=values[self._recurrences[i]],
+        )
+
+    def __getitem__(self, i: int) -> Assignment:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("schedule row out of range")
+        return self._row(i)
+
+    def __iter__(self) -> Iterator[Assignment]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    @property
+    def assignments(self) -> List[Assignment]:
+        """Every row as an `Assignment` (materializes all of them; prefer iterating)."""
+        return list(self)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays."""
+        return sum(getattr(self, name).itemsize * len(getattr(self, name)) for name in _COLUMNS)
+
+    def _index(self, column: str) -> Dict[int, array]:
+        """{ value -> row numbers } for a column, extended to the current length."""
+        values = getattr(self, column)
+        indexed, rows_by_key = self._indexes.get(column, (0, {}))
+        for i in range(indexed, len(values)):
+            rows = rows_by_key.get(values[i])
+            if rows is None:
+                rows = rows_by_key[values[i]] = array("i")
+            rows.append(i)
+        self._indexes[column] = (len(values), rows_by_key)
+        return rows_by_key
+
+    def _rows(self, column: str, key: int) -> List[Assignment]:
+        """Rows whose `column` equals `key`."""
+        return [self._row(i) for i in self._index(column).get(key, ())]
+
+    def get_assignments_for_date(self, check_date: date) -> List[Assignment]:
+        """Get all assignments for a specific date."""
+        return self._rows("_dates", check_date.toordinal())
+
+    def get_assignments_for_member(self, member_id: str) -> List[Assignment]:
+        """Get all assignments for a specific member."""
+        member_pos = self._member_index.get(member_id)
+        return [] if member_pos is None else self._rows("_members", member_pos)
+
+    def get_assignments_for_week(self, week_start: date) -> List[Assignment]:
+        """Get all assignments recorded for a week (weekly tasks)."""
+        return self._rows("_weeks", week_start.toordinal())
+
+    def get_assignments_for_task(self, task: str | TaskType) -> List[Assignment]:
+        """Get all assignments for a task identifier (enum value or custom task name)."""
+        # A row's identifier is its custom task name, else its task type
+        task_code = TASKS.code(task)
+        name_code = self._codes.get(TASKS.name(task_code), -1)
+        return [
+            self._row(i)
+            for i, (name, code) in enumerate(zip(self._custom_names, self._tasks))
+            if name == name_code or (not name and code == task_code)
+        ]
+
+    def get_assignments_by_date(self) -> Dict[date, List[Assignment]]:
+        """Get assignments grouped by date, in date order."""
+        rows_by_key = self._index("_dates")
+        return {date.fromordinal(d): [self._row(i) for i in rows_by_key[d]] for d in sorted(rows_by_key)}
+
+    def get_rest_days(self) -> Set[date]:
+        """Get all rest days (days following ATM_MIDNIGHT assignments)."""
+        code = TASKS.code(TaskType.ATM_MIDNIGHT)
+        return {
+            date.fromordinal(d) + timedelta(days=1)
+            for d, task in zip(self._dates, self._tasks) if task == code
+        }
@@ -3,8 +3,9 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from dataclasses import dataclass, field
+import os
 from datetime import time
-from typing import Optional
+from typing import Any, Dict, List, Optional
 import yaml
 
 
@@ -26,9 +27,39 @@ class SchedulingConfig:
     # Cooldown rules (avoid consecutive heavy shifts)
     atm_b_cooldown_days: int = 2  # Minimum days between B-shift assignments
     
+    # ATM shifts per weekday, e.g. {0: [{"task_type": "ATM_MORNING", "label": "Morning (07:30)",
+    # "rest_next_day": False}, ...]}; None = the built-in ATM_SHIFT_PLAN
+    atm_shift_plan: Optional[Dict[Any, List[Dict[str, Any]]]] = None
+    
     # SysAid rules
     sysaid_week_start_day: int = 0  # 0=Monday, 6=Sunday
     
+    # Load caps: at most `max` shifts per member in any `days` days, per task scope
+    # ("*", "ATM", "SYSAID", a task type value or a dynamic task name), e.g. {"task": "ATM", "max": 3, "days": 7}
+    load_caps: List[Dict[str, Any]] = field(default_factory=list)
+    
+    # Engine
+    backend: str = "python"  # "python" or "numpy" (vectorized scoring, needs numpy)
+    engine_mode: str = "greedy"  # "greedy" or "flow" (min-cost-flow plan for daily slots)
+    flow_time_budget_seconds: float = 5.0  # per planned task group; unplanned slots fall back to greedy, 0 = greedy only
+    flow_max_candidates: int = 16  # lowest-count candidates considered per slot
+    parallel_workers: int = 1  # processes for independent dynamic task groups (0 = CPU count, 1 = serial)
+    stream_chunk_weeks: int = 4  # weeks per batch yielded by generate_schedule_iter
+    instrument: bool = False  # collect Scheduler.stats (phase times, candidates, rejections, tie-breaks)
+    
+    # Per-request selection settings
+    seed: Optional[int] = None  # seeded tie-breaking (None = roster order)
+    fairness_aggressiveness: int = 1  # 1 = per-task counts first; higher also weighs total load
+    
+    # Audit log
+    audit_level: str = "INFO"  # DEBUG also records every selection and tie-break
+    audit_max_entries: int = 50000  # events kept in memory (0 = unbounded)
+    audit_spill_dir: Optional[str] = None  # older events go to a per-run file here instead of being dropped
+    
+    # Result cache (API generate/preview)
+    cache_max_entries: int = 32  # cached schedules (0 = disabled)
+    cache_max_assignments: int = 200000  # total assignments held across cached schedules
+    
     @classmethod
     def from_yaml(cls, file_path: str) -> "SchedulingConfig":
         """Load configuration from YAML file."""
@@ -48,6 +79,8 @@ class SchedulingConfig:
                 config.atm_rest_rule_enabled = atm['rest_rule_enabled']
             if 'b_cooldown_days' in atm:
                 config.atm_b_cooldown_days = atm['b_cooldown_days']
+            if 'shift_plan' in atm:
+                config.atm_shift_plan = atm['shift_plan']
             if 'windows' in atm:
                 w = atm['windows']
                 if 'morning' in w:
@@ -60,10 +93,49 @@ class SchedulingConfig:
                     config.atm_night_window_start = time(*map(int, w['night']['start'].split(':')))
                     config.atm_night_window_end = time(*map(int, w['night']['end'].split(':')))
         
+        if 'engine' in data:
+            engine = data['engine']
+            if 'backend' in engine:
+                config.backend = engine['backend']
+            if 'mode' in engine:
+                config.engine_mode = engine['mode']
+            if 'flow_time_budget_seconds' in engine:
+                config.flow_time_budget_seconds = float(engine['flow_time_budget_seconds'])
+            if 'flow_max_candidates' in engine:
+                config.flow_max_candidates = int(engine['flow_max_candidates'])
+            if 'parallel_workers' in engine:
+                config.parallel_workers = int(engine['parallel_workers'])
+            if 'stream_chunk_weeks' in engine:
+                config.stream_chunk_weeks = int(engine['stream_chunk_weeks'])
+            if 'instrument' in engine:
+                config.instrument = bool(engine['instrument'])
+        
+        if 'audit' in data:
+            audit = data['audit']
+            if 'level' in audit:
+                config.audit_level = str(audit['level']).upper()
+            if 'max_entries' in audit:
+                config.audit_max_entries = int(audit['max_entries'])
+            if 'spill_dir' in audit:
+                config.audit_spill_dir = audit['spill_dir']
+            elif 'spill_path' in audit:
+                # Older configs named one shared file; spill files now go next to it
+                config.audit_spill_dir = os.path.dirname(audit['spill_path']) or "."
+        
+        if 'cache' in data:
+            cache = data['cache']
+            if 'max_entries' in cache:
+                config.cache_max_entries = int(cache['max_entries'])
+            if 'max_assignments' in cache:
+                config.cache_max_assignments = int(cache['max_assignments'])
+        
         if 'sysaid' in data:
             sysaid = data['sysaid']
             if 'week_start_day' in sysaid:
                 config.sysaid_week_start_day = sysaid['week_start_day']
         
+        if data.get('load_caps'):
+            config.load_caps = list(data['load_caps'])
+        
         return config
 
@@ -1,7 +1,7 @@
 """Database models and configuration."""
 
 from datetime import date, datetime
-from sqlalchemy import create_engine, Column, Integer, String, Date, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import create_engine, Column, Integer, String, Date, DateTime, Boolean, ForeignKey, Text, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.types import TypeDecorator, VARCHAR
@@ -53,6 +53,7 @@ class TeamMemberDB(Base):
     name = Column(String, nullable=False)
     office_days = Column(JSONEncodedSet, default=set)
     email = Column(String, nullable=True)
+    skills = Column(JSONEncodedSet, default=set)  # qualifications, e.g. {"linux", "atm"}
     created_at = Column(Date, default=date.today)
     updated_at = Column(Date, default=date.today, onupdate=date.today)
     
@@ -101,8 +102,9 @@ class AssignmentDB(Base):
 
 
 class FairnessCount(Base):
-    """Database model for tracking assignment counts."""
+    """Database model for tracking assignment counts (one row per member and task)."""
     __tablename__ = "fairness_counts"
+    __table_args__ = (UniqueConstraint("member_id", "task_type", name="uq_fairness_counts_member_task"),)
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     member_id = Column(String, ForeignKey("team_members.id"), nullable=False)
@@ -118,8 +120,9 @@ class FairnessCount(Base):
 
 
 class DynamicFairnessCount(Base):
-    """Fairness counts for dynamic (configurable) task types."""
+    """Fairness counts for dynamic (configurable) task types (one row per member and task)."""
     __tablename__ = "dynamic_fairness_counts"
+    __table_args__ = (UniqueConstraint("member_id", "task_name", name="uq_dynamic_fairness_counts_member_task"),)
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     member_id = Column(String, ForeignKey("team_members.id"), nullable=False)
@@ -130,6 +133,28 @@ class DynamicFairnessCount(Base):
     member = relationship("TeamMemberDB")
 
 
+class FairnessSummary(Base):
+    """Assignment counts per member, task, schedule status and month.
+
+    Kept in step with `assignments` (of schedules that exist) by every write
+    path, so fairness reads sum a few rows instead of scanning history.
+    `month` is the first day of the month; a schedule without a status is
+    recorded under "".
+    """
+    __tablename__ = "fairness_summary"
+    __table_args__ = (
+        UniqueConstraint("member_id", "task_type", "status", "month", name="uq_fairness_summary_key"),
+        Index("ix_fairness_summary_status", "status", "member_id", "task_type", "count"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    member_id = Column(String, ForeignKey("team_members.id"), nullable=False)
+    task_type = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    month = Column(Date, nullable=False)
+    count = Column(Integer, default=0)
+
+
 class ScheduleDB(Base):
     """Database model for schedules."""
     __tablename__ = "schedules"
@@ -140,6 +165,10 @@ class ScheduleDB(Base):
     created_at = Column(DateTime, default=datetime.now)
     created_by = Column(String, nullable=True)
     status = Column(String, default="draft")  # draft, published, archived
+    # Generation settings, reused when a window of the schedule is regenerated
+    seed = Column(Integer, nullable=True)
+    config_override_json = Column(Text, nullable=True)
+    task_members_json = Column(Text, nullable=True)
     # Back-reference to assignments
     assignments = relationship("AssignmentDB", back_populates="schedule", cascade="all, delete-orphan")
 
@@ -154,6 +183,7 @@ class TaskTypeDef(Base):
     required_count = Column(Integer, default=1)
     role_labels = Column(JSONEncodedList, default=list)  # ["A", "B"] etc.
     rules_json = Column(Text, nullable=True)  # advanced rules JSON
+    required_skills = Column(JSONEncodedList, default=list)  # members need all of these skills
 
 
 class ShiftDef(Base):
@@ -202,6 +232,10 @@ class User(Base):
     member_id = Column(String, ForeignKey("team_members.id"), nullable=True)
     must_change_password = Column(Boolean, default=False)
 
+class MigrationError(RuntimeError):
+    """A schema migration the application cannot run without failed."""
+
+
 class Database:
     """Database connection and session management."""
     
@@ -233,6 +267,12 @@ class Database:
                     conn.exec_driver_sql(
                         "ALTER TABLE IF EXISTS team_members ADD COLUMN IF NOT EXISTS email VARCHAR"
                     )
+                    conn.exec_driver_sql(
+                        "ALTER TABLE IF EXISTS team_members ADD COLUMN IF NOT EXISTS skills VARCHAR"
+                    )
+                    conn.exec_driver_sql(
+                        "ALTER TABLE IF EXISTS task_type_defs ADD COLUMN IF NOT EXISTS required_skills VARCHAR"
+                    )
                     conn.exec_driver_sql(
                         "ALTER TABLE IF EXISTS assignments ADD COLUMN IF NOT EXISTS shift_label VARCHAR"
                     )
@@ -248,6 +288,15 @@ class Database:
                     conn.exec_driver_sql(
                         "ALTER TABLE IF EXISTS assignments ADD COLUMN IF NOT EXISTS schedule_id INTEGER"
                     )
+                    conn.exec_driver_sql(
+                        "ALTER TABLE IF EXISTS schedules ADD COLUMN IF NOT EXISTS seed INTEGER"
+                    )
+                    conn.exec_driver_sql(
+                        "ALTER TABLE IF EXISTS schedules ADD COLUMN IF NOT EXISTS config_override_json TEXT"
+                    )
+                    conn.exec_driver_sql(
+                        "ALTER TABLE IF EXISTS schedules ADD COLUMN IF NOT EXISTS task_members_json TEXT"
+                    )
                     conn.exec_driver_sql(
                         "ALTER TABLE IF EXISTS swap_requests ADD COLUMN IF NOT EXISTS peer_decision VARCHAR"
                     )
@@ -259,6 +308,36 @@ class Database:
         except Exception:
             # Never block startup on best-effort migration
             pass
+        self._add_fairness_unique_keys()
+    
+    def _add_fairness_unique_keys(self):
+        """Merge duplicate fairness counters and add their unique (member, task) keys.
+        
+        Counter upserts use ON CONFLICT (member_id, task), which fails on
+        every write without these keys, so a failure here raises
+        MigrationError instead of being skipped.
+        """
+        if self.engine.dialect.name != "postgresql":
+            return
+        try:
+            with self.engine.begin() as conn:
+                for table, task_column in (("fairness_counts", "task_type"), ("dynamic_fairness_counts", "task_name")):
+                    # Fold duplicate rows into the oldest one before adding the key
+                    conn.exec_driver_sql(
+                        f"UPDATE {table} f SET count = d.total FROM ("
+                        f"SELECT MIN(id) AS id, SUM(count) AS total FROM {table} "
+                        f"GROUP BY member_id, {task_column} HAVING COUNT(*) > 1"
+                        f") d WHERE f.id = d.id"
+                    )
+                    conn.exec_driver_sql(
+                        f"DELETE FROM {table} f USING {table} g "
+                        f"WHERE f.member_id = g.member_id AND f.{task_column} = g.{task_column} AND f.id > g.id"
+                    )
+                    conn.exec_driver_sql(
+                        f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{table}_member_task ON {table} (member_id, {task_column})"
+                    )
+        except Exception as e:
+            raise MigrationError(f"Could not add unique keys to the fairness counter tables: {e}") from e
     
     def get_session(self):
         """Get a database session."""
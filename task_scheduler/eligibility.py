@@ -0,0 +1,217 @@
+"""Bitmask-based eligibility index used by the scheduler.
+
+Every member gets a bit position; a set of members is a plain Python int.
+Per-day availability, rest-day blocks and "already booked today" state are
+kept as masks so filtering candidates for a slot is a handful of AND/NOT
+operations instead of a scan over members and their unavailable ranges.
+"""
+
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .models import TeamMember
+
+
+class EligibilityIndex:
+    """Encodes member availability and bookings as integer bitmasks."""
+
+    def __init__(
+        self,
+        members: List[TeamMember],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ):
+        self.members: List[TeamMember] = []
+        self.index: Dict[str, int] = {}
+        for member in members:
+            if member.id not in self.index:
+                self.index[member.id] = len(self.members)
+                self.members.append(member)
+        self.all_mask = (1 << len(self.members)) - 1
+
+        # weekday -> mask of members whose office_days include that weekday
+        self._office_masks = [0] * 7
+        for member in self.members:
+            bit = 1 << self.index[member.id]
+            for weekday in member.office_days:
+                if 0 <= weekday <= 6:
+                    self._office_masks[weekday] |= bit
+
+        # skill -> mask of members who have it
+        self._skill_masks: Dict[str, int] = {}
+        for member in self.members:
+            bit = 1 << self.index[member.id]
+            for skill in member.skills:
+                self._skill_masks[skill] = self._skill_masks.get(skill, 0) | bit
+
+        # date -> mask of members explicitly unavailable on that date
+        self._unavailable: Dict[date, int] = {}
+        self._horizon: Optional[Tuple[date, date]] = None
+        if start_date and end_date:
+            self._precompute_unavailable(start_date, end_date)
+
+        # layer name -> { date -> mask }
+        self._layers: Dict[str, Dict[date, int]] = {}
+        # id(list) -> (list, mask); the list is kept alive so its id stays unique
+        self._pool_cache: Dict[int, Tuple[List[TeamMember], int]] = {}
+
+    def _precompute_unavailable(self, start_date: date, end_date: date):
+        """Fill unavailable masks for the horizon (padded for weekly lookahead)."""
+        lo = start_date - timedelta(days=7)
+        hi = end_date + timedelta(days=7)
+        self._horizon = (lo, hi)
+        unavailable = self._unavailable
+        for member in self.members:
+            bit = 1 << self.index[member.id]
+            for d in member.unavailable_dates:
+                if lo <= d <= hi:
+                    unavailable[d] = unavailable.get(d, 0) | bit
+            for start, end in member.unavailable_ranges:
+                current = max(start, lo)
+                last = min(end, hi)
+                while current <= last:
+                    unavailable[current] = unavailable.get(current, 0) | bit
+                    current += timedelta(days=1)
+
+    def _unavailable_mask(self, check_date: date) -> int:
+        mask = self._unavailable.get(check_date)
+        if mask is not None:
+            return mask
+        if self._horizon and self._horizon[0] <= check_date <= self._horizon[1]:
+            return 0
+        # Outside the precomputed horizon: compute once and cache
+        mask = 0
+        for member in self.members:
+            if check_date in member.unavailable_dates or any(
+                start <= check_date <= end for start, end in member.unavailable_ranges
+            ):
+                mask |= 1 << self.index[member.id]
+        self._unavailable[check_date] = mask
+        return mask
+
+    def available(self, check_date: date, requires_office_days: bool = True) -> int:
+        """Mask of members available on `check_date`.
+
+        With `requires_office_days` this matches `TeamMember.is_available_on`;
+        without it only explicit unavailable dates/ranges are honoured (the
+        ATM 24/7 rule).
+        """
+        mask = self.all_mask & ~self._unavailable_mask(check_date)
+        if requires_office_days:
+            mask &= self._office_masks[check_date.weekday()]
+        return mask
+
+    def available_all(self, dates: Iterable[date], requires_office_days: bool = True) -> int:
+        """Mask of members available on every date in `dates`."""
+        mask = self.all_mask
+        for d in dates:
+            mask &= self.available(d, requires_office_days)
+        return mask
+
+    def knows(self, members: List[TeamMember]) -> bool:
+        """True if every member in `members` has a bit in this index."""
+        return all(m.id in self.index for m in members)
+
+    def pool(self, members: List[TeamMember]) -> int:
+        """Mask for a subset of members (cached per list object)."""
+        cached = self._pool_cache.get(id(members))
+        if cached is not None and cached[0] is members:
+            return cached[1]
+        mask = 0
+        for member in members:
+            bit = self.index.get(member.id)
+            if bit is not None:
+                mask |= 1 << bit
+        self._pool_cache[id(members)] = (members, mask)
+        return mask
+
+    def skilled(self, skills: Iterable[str]) -> int:
+        """Mask of members who have every skill in `skills`."""
+        mask = self.all_mask
+        for skill in skills:
+            mask &= self._skill_masks.get(skill, 0)
+        return mask
+
+    def with_ids(self, member_ids: Iterable[str]) -> int:
+        """Mask of the members with these ids (unknown ids are ignored)."""
+        mask = 0
+        index = self.index
+        for member_id in member_ids:
+            bit = index.get(member_id)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def bit(self, member_id: str) -> int:
+        return 1 << self.index[member_id]
+
+    def book(self, layer: str, check_date: date, member_id: str):
+        """Mark a member as blocked/booked on a date within a named layer."""
+        days = self._layers.setdefault(layer, {})
+        days[check_date] = days.get(check_date, 0) | (1 << self.index[member_id])
+
+    def booked(self, layer: str, check_date: date) -> int:
+        """Mask of members booked on a date within a named layer."""
+        days = self._layers.get(layer)
+        if not days:
+            return 0
+        return days.get(check_date, 0)
+
+    def forget_before(self, check_date: date):
+        """Drop bookings and cached availability for dates before `check_date`."""
+        for days in self._layers.values():
+            for d in [d for d in days if d < check_date]:
+                del days[d]
+        for d in [d for d in self._unavailable if d < check_date]:
+            del self._unavailable[d]
+
+    def contains(self, mask: int) -> "MaskCheck":
+        """Predicate testing whether a member's bit is set in `mask`."""
+        return MaskCheck(self, mask)
+
+    @staticmethod
+    def count(mask: int) -> int:
+        """Number of members in a mask."""
+        return bin(mask).count("1")
+
+    def members_in(self, mask: int) -> List[TeamMember]:
+        """Materialize a mask back to members, in roster order."""
+        result = []
+        members = self.members
+        while mask:
+            low = mask & -mask
+            result.append(members[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+
+class MaskCheck:
+    """Eligibility predicate: membership in a mask plus an optional extra check.
+
+    The mask stays accessible so vectorized backends can filter candidates in
+    bulk and only run `extra` on the members they actually consider.
+    """
+
+    __slots__ = ("index", "mask", "extra")
+
+    def __init__(
+        self,
+        index: EligibilityIndex,
+        mask: int,
+        extra: Optional[Callable[[TeamMember], bool]] = None
+    ):
+        self.index = index
+        self.mask = mask
+        self.extra = extra
+
+    def __call__(self, member: TeamMember) -> bool:
+        if not self.mask >> self.index.index[member.id] & 1:
+            return False
+        return self.extra is None or self.extra(member)
+
+    def also(self, extra: Callable[[TeamMember], bool]) -> "MaskCheck":
+        """Return a check that additionally requires `extra` (after any existing extra check)."""
+        if self.extra is not None:
+            first = self.extra
+            return MaskCheck(self.index, self.mask, lambda m: first(m) and extra(m))
+        return MaskCheck(self.index, self.mask, extra)
@@ -6,7 +6,7 @@ from typing import List, Optional
 from pathlib import Path
 import pytz
 from ics import Calendar, Event
-from .models import Schedule, Assignment, TaskType
+from .models import TASKS, Schedule, Assignment, TaskType
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Alignment
@@ -28,8 +28,7 @@ def export_to_csv(schedule: Schedule, file_path: str):
         writer.writerow(['Date', 'Task', 'Role', 'Assignee', 'Week Start (SysAid)'])
         
         # Write one row per assignment with Task and Role columns for dynamic tasks
-        def _tt_value(t):
-            return t if isinstance(t, str) else t.value
+        _tt_value = TASKS.key
 
         def _wrap_csv_text(val: str, width: int = 40) -> str:
             """Soft-wrap long values at spaces/hyphens to help viewers render without overflow."""
@@ -51,7 +50,11 @@ def export_to_csv(schedule: Schedule, file_path: str):
                 lines.append(cur.rstrip())
             return "\n".join(lines)
 
-        sorted_assignments = sorted(schedule.assignments, key=lambda a: (a.date, _tt_value(a.task_type)))
+        sorted_assignments = (
+            a
+            for day_assignments in schedule.get_assignments_by_date().values()
+            for a in sorted(day_assignments, key=lambda a: _tt_value(a.task_type))
+        )
         for assignment in sorted_assignments:
             week_start_str = assignment.week_start.isoformat() if assignment.week_start else ""
             assignee_display = assignment.assignee.name
@@ -73,11 +76,10 @@ def export_to_ics(schedule: Schedule, file_path: str, timezone: str = "Africa/Ad
     tz = pytz.timezone(timezone)
     cal = Calendar()
     
-    def _tt_value(t):
-        return t if isinstance(t, str) else t.value
+    _tt_value = TASKS.key
 
     def _is_task_eq(t, enum_val):
-        return _tt_value(t) == enum_val.value
+        return TASKS.code(t) == TASKS.code(enum_val)
 
     # Group assignments by date and task type for better calendar entries
     assignments_by_date = {}
@@ -166,8 +168,7 @@ def export_to_xlsx(schedule: Schedule, file_path: str):
     ws.title = "Schedule"
 
     # If schedule contains only default task types, keep calendar columns; otherwise export vertical rows (Date, Task, Role, Assignee)
-    def _tt_value(t):
-        return t if isinstance(t, str) else t.value
+    _tt_value = TASKS.key
 
     task_types = { _tt_value(a.task_type) for a in schedule.assignments }
     default_tasks = {TaskType.ATM_MORNING.value, TaskType.ATM_MIDNIGHT.value, TaskType.SYSAID_MAKER.value, TaskType.SYSAID_CHECKER.value}
@@ -182,12 +183,9 @@ def export_to_xlsx(schedule: Schedule, file_path: str):
         ]
         ws.append(headers)
 
-        by_date = {}
-        for a in schedule.assignments:
-            d = a.date
-            by_date.setdefault(d, []).append(a)
+        by_date = schedule.get_assignments_by_date()
 
-        for day in sorted(by_date.keys()):
+        for day in by_date:
             row = [day.isoformat(), "", "", "", ""]
             aggregates: dict[str, list] = {}
             for a in by_date[day]:
@@ -205,7 +203,11 @@ def export_to_xlsx(schedule: Schedule, file_path: str):
         # Vertical layout for dynamic/custom tasks
         headers = ["Date", "Task", "Role", "Assignee", "Week Start"]
         ws.append(headers)
-        for a in sorted(schedule.assignments, key=lambda x: (x.date, _tt_value(x.task_type))):
+        for a in (
+            x
+            for day_assignments in schedule.get_assignments_by_date().values()
+            for x in sorted(day_assignments, key=lambda x: _tt_value(x.task_type))
+        ):
             role = a.custom_task_shift or a.shift_label or ''
             week = a.week_start.isoformat() if a.week_start else ''
             assignee = a.assignee.name
@@ -252,13 +254,9 @@ def export_to_pdf(schedule: Schedule, file_path: str):
     )
     
     # Group assignments by date
-    def _tt_value(t):
-        return t if isinstance(t, str) else t.value
+    _tt_value = TASKS.key
 
-    by_date = {}
-    for a in schedule.assignments:
-        d = a.date
-        by_date.setdefault(d, []).append(a)
+    by_date = schedule.get_assignments_by_date()
     
     # Table data: adapt layout for default or dynamic tasks
     task_types = { _tt_value(a.task_type) for a in schedule.assignments }
@@ -321,7 +319,7 @@ def export_to_pdf(schedule: Schedule, file_path: str):
             p_header('SysAid Maker'),
             p_header('SysAid Checker'),
         ]]
-        for day in sorted(by_date.keys()):
+        for day in by_date:
             row = [day.strftime('%Y-%m-%d (%A)'), '', '', '', '']
             aggregates: dict[str, list] = {}
             for a in by_date[day]:
@@ -346,7 +344,7 @@ def export_to_pdf(schedule: Schedule, file_path: str):
             p_header('Assignee'),
             p_header('Week Start'),
         ]]
-        for day in sorted(by_date.keys()):
+        for day in by_date:
             for a in by_date[day]:
                 display = a.assignee.name
                 role = a.custom_task_shift or a.shift_label or ''
@@ -0,0 +1,148 @@
+"""Fairness matrix (assignment counts per member and task) for live schedules.
+
+`fairness_table` backs /api/fairness, /api/fairness/table and the fairness
+PDF export. It reads the whole matrix in one query: the roster LEFT JOINed to
+a ``GROUP BY member_id, task_type`` over the `FairnessSummary` table (or over
+one schedule's assignments). `check_fairness_summary` compares the summary
+with a full recompute from assignments and `rebuild_fairness_summary`
+replaces it with one.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .database import AssignmentDB, FairnessSummary, ScheduleDB, TeamMemberDB
+from .models import TASKS
+from .persistence import apply_summary_deltas, summary_key
+
+DEFAULT_STATUSES = "draft,published"
+
+
+def parse_statuses(statuses: Optional[str]) -> List[str]:
+    """Schedule statuses from a comma-separated query parameter (empty = any status)."""
+    return [s.strip() for s in (statuses or "").split(",") if s.strip()]
+
+
+def order_columns(task_types: Iterable[str]) -> List[str]:
+    """Built-in tasks first (enum order), then the others alphabetically."""
+    present = set(task_types)
+    builtin = [name for name in TASKS.builtin_names if name in present]
+    return builtin + sorted(t for t in present if not TASKS.is_builtin(t))
+
+
+@dataclass
+class FairnessTable:
+    """Counts per member for the task columns present in the filtered assignments.
+
+    Every row's `counts` has an entry (possibly 0) for each of `columns`.
+    """
+    columns: List[str] = field(default_factory=list)
+    rows: List[dict] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {"columns": self.columns, "rows": self.rows}
+
+
+def fairness_table(session: Session, schedule_id: Optional[int] = None, statuses: Optional[str] = DEFAULT_STATUSES) -> FairnessTable:
+    """Build the fairness matrix.
+
+    With `schedule_id`, only that schedule's assignments count. Otherwise
+    assignments of existing schedules whose status is in `statuses` count,
+    read from the summary table; orphaned assignments (no schedule) are
+    excluded to avoid stale values after deletions.
+    """
+    if schedule_id is not None:
+        counts_q = session.query(
+            AssignmentDB.member_id.label("member_id"),
+            AssignmentDB.task_type.label("task_type"),
+            func.count().label("count"),
+        ).filter(
+            AssignmentDB.schedule_id == schedule_id
+        ).group_by(AssignmentDB.member_id, AssignmentDB.task_type)
+    else:
+        counts_q = session.query(
+            FairnessSummary.member_id.label("member_id"),
+            FairnessSummary.task_type.label("task_type"),
+            func.sum(FairnessSummary.count).label("count"),
+        )
+        allowed_statuses = parse_statuses(statuses)
+        if allowed_statuses:
+            counts_q = counts_q.filter(FairnessSummary.status.in_(allowed_statuses))
+        counts_q = counts_q.group_by(FairnessSummary.member_id, FairnessSummary.task_type)
+    counts = counts_q.subquery()
+
+    result = session.query(
+        TeamMemberDB.id, TeamMemberDB.name, counts.c.task_type, counts.c.count
+    ).outerjoin(
+        counts, counts.c.member_id == TeamMemberDB.id
+    ).order_by(TeamMemberDB.id)
+
+    by_member: Dict[str, dict] = {}
+    for member_id, member_name, task_type, count in result:
+        row = by_member.get(member_id)
+        if row is None:
+            row = by_member[member_id] = {"member_id": member_id, "member_name": member_name, "counts": {}, "total": 0}
+        if task_type is not None:
+            row["counts"][task_type] = count
+            row["total"] += count
+
+    columns = order_columns(t for row in by_member.values() for t in row["counts"])
+    rows = list(by_member.values())
+    for row in rows:
+        row["counts"] = {column: row["counts"].get(column, 0) for column in columns}
+    return FairnessTable(columns, rows)
+
+
+def recompute_fairness_summary(session: Session) -> Counter:
+    """Summary counts recomputed from the assignments of existing schedules."""
+    rows = session.query(
+        AssignmentDB.member_id, AssignmentDB.task_type, ScheduleDB.status, AssignmentDB.assignment_date, func.count()
+    ).join(
+        ScheduleDB, AssignmentDB.schedule_id == ScheduleDB.id
+    ).group_by(AssignmentDB.member_id, AssignmentDB.task_type, ScheduleDB.status, AssignmentDB.assignment_date)
+    counts: Counter = Counter()
+    for member_id, task_type, status, assignment_date, count in rows:
+        counts[summary_key(member_id, task_type, status, assignment_date)] += count
+    return counts
+
+
+def check_fairness_summary(session: Session) -> List[dict]:
+    """Summary rows that differ from a full recompute (empty if consistent)."""
+    stored: Counter = Counter()
+    for row in session.query(FairnessSummary):
+        stored[(row.member_id, row.task_type, row.status, row.month)] += row.count or 0
+    expected = recompute_fairness_summary(session)
+    return [{
+        "member_id": key[0],
+        "task_type": key[1],
+        "status": key[2],
+        "month": key[3].isoformat(),
+        "stored": stored.get(key, 0),
+        "expected": expected.get(key, 0),
+    } for key in sorted(set(stored) | set(expected)) if stored.get(key, 0) != expected.get(key, 0)]
+
+
+def rebuild_fairness_summary(session: Session) -> int:
+    """Replace the summary with a full recompute; returns the number of rows. The caller commits."""
+    session.query(FairnessSummary).delete(synchronize_session=False)
+    counts = recompute_fairness_summary(session)
+    apply_summary_deltas(session, counts)
+    return len(counts)
+
+
+def ensure_fairness_summary(session: Session) -> bool:
+    """Build the summary if it is empty but scheduled assignments exist (e.g. after upgrading).
+
+    Returns whether it was rebuilt. The caller commits.
+    """
+    if session.query(FairnessSummary.id).first() is not None:
+        return False
+    scheduled = session.query(AssignmentDB.id).join(ScheduleDB, AssignmentDB.schedule_id == ScheduleDB.id).first()
+    if scheduled is None:
+        return False
+    rebuild_fairness_summary(session)
+    return True
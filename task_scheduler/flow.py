@@ -0,0 +1,218 @@
+"""Min-cost-flow planning of daily slots.
+
+Used by the "flow" engine mode. A horizon's slots are matched to members in
+one optimization instead of greedily day by day:
+
+    source -> slot -> (member, day) -> member -> sink
+
+Each slot node carries one unit; a (member, day) node lets a member take at
+most one slot per day; the member -> sink arcs have increasing marginal costs
+(convex load), so the cheapest max flow fills as many slots as possible while
+spreading load evenly. Rules that depend on earlier choices (B-shift rest and
+cooldown, dynamic rest days) are not expressible as flow constraints; the
+scheduler replays the plan chronologically and repairs violating slots.
+"""
+
+import heapq
+import time
+from collections import Counter
+from datetime import date
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .models import TeamMember
+
+INF = float("inf")
+
+
+class MinCostFlow:
+    """Successive shortest path min-cost flow (Dijkstra with potentials).
+
+    Costs must be non-negative integers. Edge `e` and its residual `e ^ 1`
+    are stored next to each other.
+    """
+
+    def __init__(self):
+        self._graph: List[List[int]] = []
+        self._to: List[int] = []
+        self._cap: List[int] = []
+        self._cost: List[int] = []
+
+    def add_node(self) -> int:
+        self._graph.append([])
+        return len(self._graph) - 1
+
+    def add_edge(self, u: int, v: int, cap: int, cost: int) -> int:
+        """Add an arc u -> v and return its id."""
+        e = len(self._to)
+        self._to += [v, u]
+        self._cap += [cap, 0]
+        self._cost += [cost, -cost]
+        self._graph[u].append(e)
+        self._graph[v].append(e + 1)
+        return e
+
+    def edge_flow(self, e: int) -> int:
+        """Units currently sent along arc `e`."""
+        return self._cap[e ^ 1]
+
+    def solve(self, source: int, sink: int, deadline: Optional[float] = None) -> Tuple[int, int, bool]:
+        """Send as much flow as possible at minimum cost.
+
+        Returns (flow, cost, finished). If `deadline` (a `time.monotonic()`
+        value) passes, stops early with `finished=False`; the flow found so
+        far is still a valid min-cost flow of that value.
+        """
+        graph, to, cap, cost = self._graph, self._to, self._cap, self._cost
+        n = len(graph)
+        potential = [0] * n
+        total_flow = total_cost = 0
+        while True:
+            if deadline is not None and time.monotonic() > deadline:
+                return total_flow, total_cost, False
+            dist = [INF] * n
+            prev = [-1] * n
+            dist[source] = 0
+            heap = [(0, source)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                if u == sink:
+                    break
+                pu = potential[u]
+                for e in graph[u]:
+                    if cap[e] > 0:
+                        v = to[e]
+                        nd = d + cost[e] + pu - potential[v]
+                        if nd < dist[v]:
+                            dist[v] = nd
+                            prev[v] = e
+                            heapq.heappush(heap, (nd, v))
+            reach = dist[sink]
+            if reach == INF:
+                return total_flow, total_cost, True
+            # Early exit from Dijkstra: clamp unsettled nodes to the sink distance
+            for v in range(n):
+                potential[v] += dist[v] if dist[v] < reach else reach
+
+            push = INF
+            v = sink
+            while v != source:
+                e = prev[v]
+                push = min(push, cap[e])
+                v = to[e ^ 1]
+            v = sink
+            while v != source:
+                e = prev[v]
+                cap[e] -= push
+                cap[e ^ 1] += push
+                total_cost += push * cost[e]
+                v = to[e ^ 1]
+            total_flow += push
+
+
+def plan_slots(
+    slot_dates: List[date],
+    slot_candidates: List[List[str]],
+    arc_cost: Callable[[int, str], int],
+    base_load: Dict[str, int],
+    time_budget: Optional[float] = None
+) -> Tuple[List[Optional[str]], bool]:
+    """Assign member ids to slots with at most one slot per member per day.
+
+    `slot_candidates[i]` lists the members allowed in slot `i` (in
+    preference order for tie-breaking); `arc_cost(i, member_id)` is a static
+    non-negative cost for that pairing; `base_load` seeds each member's
+    convex load cost. Returns (assignee per slot or None, finished).
+    """
+    deadline = time.monotonic() + time_budget if time_budget else None
+    net = MinCostFlow()
+    source = net.add_node()
+    sink = net.add_node()
+
+    member_nodes: Dict[str, int] = {}
+    member_days: Dict[str, set] = {}
+    day_nodes: Dict[Tuple[str, date], int] = {}
+    slot_arcs: List[List[Tuple[int, str]]] = []
+    for i, (slot_date, candidates) in enumerate(zip(slot_dates, slot_candidates)):
+        slot = net.add_node()
+        net.add_edge(source, slot, 1, 0)
+        arcs = []
+        for member_id in candidates:
+            day = day_nodes.get((member_id, slot_date))
+            if day is None:
+                day = day_nodes[(member_id, slot_date)] = net.add_node()
+                member = member_nodes.get(member_id)
+                if member is None:
+                    member = member_nodes[member_id] = net.add_node()
+                net.add_edge(day, member, 1, 0)
+                member_days.setdefault(member_id, set()).add(slot_date)
+            arcs.append((net.add_edge(slot, day, 1, arc_cost(i, member_id)), member_id))
+        slot_arcs.append(arcs)
+
+    # Convex load: the k-th extra slot for a member costs base + k
+    for member_id, node in member_nodes.items():
+        base = base_load.get(member_id, 0)
+        for k in range(len(member_days[member_id])):
+            net.add_edge(node, sink, 1, base + k)
+
+    _, _, finished = net.solve(source, sink, deadline)
+
+    plan: List[Optional[str]] = []
+    for arcs in slot_arcs:
+        plan.append(next((member_id for e, member_id in arcs if net.edge_flow(e)), None))
+    return plan, finished
+
+
+class SlotPlan:
+    """Planned assignee per slot key plus each member's remaining planned load.
+
+    Keys are (date, shift label) pairs. `forced` keys must be kept even if
+    the member is no longer eligible (history and pinned assignments); their
+    members are also reserved on that date so repairs don't double-book them.
+    With a `window` (first, last day), slots entirely outside it that have
+    no planned member stay empty.
+
+    An `advisory` plan (a flow plan) is only a preference: a planned member
+    is kept when they score as well as the best eligible member, and every
+    planned slot reserves its member on that date so earlier slots of the
+    day leave them free if someone else can step in.
+    """
+
+    def __init__(
+        self,
+        assigned: Dict[Hashable, TeamMember],
+        forced: Iterable[Hashable] = (),
+        window: Optional[Tuple[date, date]] = None,
+        advisory: bool = False
+    ):
+        self.assigned = assigned
+        self.forced = set(forced)
+        self.window = window
+        self.advisory = advisory
+        self.remaining = Counter(member.id for member in assigned.values())
+        self._reserved: Dict[date, Counter] = {}
+        for key in (assigned if advisory else self.forced):
+            member = assigned.get(key)
+            if member is not None:
+                self._reserved.setdefault(key[0], Counter())[member.id] += 1
+
+    def is_forced(self, key: Hashable) -> bool:
+        return key in self.forced and key in self.assigned
+
+    def outside_window(self, first: date, last: date) -> bool:
+        """Whether a slot covering [first, last] lies entirely outside the window."""
+        return self.window is not None and (last < self.window[0] or first > self.window[1])
+
+    def reserved(self, day: date) -> Counter:
+        """Members held by forced (or, in advisory plans, planned) slots on `day` that are not yet taken."""
+        return self._reserved.get(day, Counter())
+
+    def pop(self, key: Hashable) -> Optional[TeamMember]:
+        """Take the planned member for a slot (None if unplanned)."""
+        member = self.assigned.pop(key, None)
+        if member is not None:
+            self.remaining[member.id] -= 1
+            if self.advisory or key in self.forced:
+                self._reserved[key[0]][member.id] -= 1
+        return member
@@ -44,7 +44,8 @@ def load_team(file_path: str) -> List[TeamMember]:
             id=member_id,
             office_days=office_days,
             unavailable_dates=unavailable_dates,
-            unavailable_ranges=unavailable_ranges
+            unavailable_ranges=unavailable_ranges,
+            skills=set(member_data.get('skills', []))
         )
         members.append(member)
     
@@ -0,0 +1,198 @@
+"""Optional NumPy backend for fairness bookkeeping and candidate scoring.
+
+Counts are held as a dense members x tasks matrix and each slot is scored
+with array operations over all eligible members at once. NumPy is optional
+(the `numpy` extra): `available()` reports whether the backend can be used,
+`require()` raises if it cannot, and the pure-Python `FairnessLedger` /
+`FairQueue` path remains the reference implementation.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+from .models import TASKS, TeamMember
+from .eligibility import EligibilityIndex, MaskCheck
+
+
+def available() -> bool:
+    """True if NumPy is installed."""
+    return np is not None
+
+
+def require():
+    """Raise a RuntimeError explaining how to get NumPy if it is not installed."""
+    if np is None:
+        raise RuntimeError(
+            "The numpy backend needs NumPy: install it with `pip install task-scheduler[numpy]` "
+            "(or `pip install numpy`), or set engine.backend to \"python\""
+        )
+
+
+def mask_to_array(mask: int, size: int) -> "np.ndarray":
+    """Unpack a member bitmask into a boolean array of length `size`."""
+    raw = np.frombuffer(mask.to_bytes((size + 7) // 8 or 1, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:size].astype(bool)
+
+
+class MatrixLedger:
+    """Fairness counts as a dense members x tasks matrix.
+
+    Drop-in replacement for `FairnessLedger`: `member_index` maps member ids
+    to rows, `task_index` maps `TASKS` codes to columns and `totals` keeps
+    the per-member row sums. Rows are created in the order given, so passing
+    the roster order of an `EligibilityIndex` aligns rows with its bits.
+    """
+
+    def __init__(self, member_ids: Iterable[str] = (), fairness_window_days: int = 90):
+        require()
+        self.fairness_window_days = fairness_window_days
+        self.member_index: Dict[str, int] = {}
+        for member_id in member_ids:
+            self.member_index.setdefault(member_id, len(self.member_index))
+        self.task_index: Dict[int, int] = {}
+        self.counts = np.zeros((len(self.member_index), 0), dtype=np.int64)
+        self.totals = np.zeros(len(self.member_index), dtype=np.int64)
+
+    @classmethod
+    def from_ledger(cls, ledger, member_ids: Iterable[str]) -> "MatrixLedger":
+        """Build a matrix ledger from any ledger exposing `member_counts`."""
+        matrix = cls(member_ids, fairness_window_days=ledger.fairness_window_days)
+        for member_id, task_counts in ledger.member_counts.items():
+            for key, count in task_counts.items():
+                matrix.add(member_id, key, count)
+        return matrix
+
+    @classmethod
+    def from_task_counts(cls, task_counts: Dict[str, Dict[str, int]], member_ids: Iterable[str]) -> "MatrixLedger":
+        """Build a matrix from { task_name -> { member_id -> count } }."""
+        matrix = cls(member_ids)
+        for task_name, counts in task_counts.items():
+            for member_id, count in counts.items():
+                matrix.add(member_id, task_name, count)
+        return matrix
+
+    def __getstate__(self):
+        # Codes are per process; ship task names to worker processes
+        state = dict(self.__dict__)
+        state["task_index"] = {TASKS.name(code): col for code, col in self.task_index.items()}
+        return state
+
+    def __setstate__(self, state):
+        state["task_index"] = {TASKS.code(name): col for name, col in state["task_index"].items()}
+        self.__dict__.update(state)
+
+    @staticmethod
+    def _key(task_type) -> int:
+        return TASKS.code(task_type)
+
+    def _row(self, member_id: str) -> int:
+        row = self.member_index.get(member_id)
+        if row is None:
+            row = self.member_index[member_id] = len(self.member_index)
+            self.counts = np.vstack([self.counts, np.zeros((1, self.counts.shape[1]), dtype=np.int64)])
+            self.totals = np.append(self.totals, 0)
+        return row
+
+    def _col(self, key: int) -> int:
+        col = self.task_index.get(key)
+        if col is None:
+            col = self.task_index[key] = len(self.task_index)
+            self.counts = np.hstack([self.counts, np.zeros((self.counts.shape[0], 1), dtype=np.int64)])
+        return col
+
+    def add(self, member_id: str, task_type, amount: int):
+        """Add `amount` to a member's count for a task."""
+        row = self._row(member_id)
+        col = self._col(self._key(task_type))
+        self.counts[row, col] += amount
+        self.totals[row] += amount
+
+    def get_count(self, member_id: str, task_type) -> int:
+        """Get assignment count for a member and task type."""
+        row = self.member_index.get(member_id)
+        col = self.task_index.get(self._key(task_type))
+        if row is None or col is None:
+            return 0
+        return int(self.counts[row, col])
+
+    def increment(self, member_id: str, task_type):
+        """Increment count for a member and task type."""
+        self.add(member_id, task_type, 1)
+
+    def get_total_count(self, member_id: str) -> int:
+        """Get total assignment count across all task types."""
+        row = self.member_index.get(member_id)
+        return 0 if row is None else int(self.totals[row])
+
+    def column(self, task_type) -> "np.ndarray":
+        """Counts of every member (in row order) for one task."""
+        col = self._col(self._key(task_type))
+        return self.counts[:, col]
+
+    @property
+    def member_counts(self) -> Dict[str, Dict[str, int]]:
+        """Non-zero counts as { member_id -> { task -> count } }, like `FairnessLedger`."""
+        result: Dict[str, Dict[str, int]] = {}
+        for member_id, row in self.member_index.items():
+            for key, col in self.task_index.items():
+                count = int(self.counts[row, col])
+                if count:
+                    result.setdefault(member_id, {})[TASKS.name(key)] = count
+        return result
+
+
+class MatrixQueue:
+    """Vectorized counterpart of `FairQueue`.
+
+    `key_arrays()` returns the score columns (primary first) indexed by the
+    bit positions of `index`. Each selection lexsorts the eligible members
+    and only runs the check's extra predicate (cooldown, rest) on the members
+    actually inspected. Ties resolve by `tie_ranks` (indexed like the key
+    columns) or else in roster order, as in `FairQueue`.
+    """
+
+    def __init__(
+        self,
+        index: EligibilityIndex,
+        pool_mask: int,
+        key_arrays: Callable[[], Tuple["np.ndarray", ...]],
+        tie_ranks: Optional[List[int]] = None
+    ):
+        self._index = index
+        self._pool_mask = pool_mask
+        self._key_arrays = key_arrays
+        self._tie_ranks = np.asarray(tie_ranks, dtype=np.int64) if tie_ranks is not None else None
+
+    def select(self, is_eligible: MaskCheck) -> Tuple[Optional[TeamMember], bool]:
+        """Return the best eligible member and whether it tied on the primary score."""
+        mask = is_eligible.mask & self._pool_mask
+        if not mask:
+            return None, False
+        members: List[TeamMember] = self._index.members
+        candidates = np.flatnonzero(mask_to_array(mask, len(members)))
+        keys = [k[candidates] for k in self._key_arrays()]
+        # lexsort treats the last key as primary; candidates are already in roster order
+        sort_keys = keys[::-1]
+        if self._tie_ranks is not None:
+            sort_keys.insert(0, self._tie_ranks[candidates])
+        order = np.lexsort(sort_keys)
+        primary = keys[0]
+        extra = is_eligible.extra
+        best = None
+        best_primary = None
+        for pos in order:
+            if best is not None and primary[pos] != best_primary:
+                break
+            member = members[candidates[pos]]
+            if extra is not None and not extra(member):
+                continue
+            if best is None:
+                best = member
+                best_primary = primary[pos]
+            else:
+                return best, True
+        return best, False
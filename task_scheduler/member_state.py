@@ -0,0 +1,152 @@
+"""Per-member rest, cooldown and load-cap state maintained during schedule generation."""
+
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+@dataclass
+class MemberState:
+    """Rolling scheduling state for one member.
+
+    `rest_days` maps a scope (e.g. "ATM" or a dynamic task name) to the
+    pending rest days earned by assignments in that scope.
+    """
+    last_b_shift: Optional[date] = None
+    cooldown_until: Optional[date] = None  # inclusive
+    rest_days: Dict[str, Set[date]] = field(default_factory=dict)
+
+
+class MemberStateTracker:
+    """Tracks last B-shift, pending rest days and cooldown expiry per member.
+
+    Updated as each assignment is made so rest and cooldown checks are O(1)
+    instead of scanning previous assignments.
+    """
+
+    def __init__(self, b_cooldown_days: int = 0):
+        self.b_cooldown_days = b_cooldown_days
+        self._states: Dict[str, MemberState] = {}
+
+    def state(self, member_id: str) -> MemberState:
+        """Get (or create) the state for a member."""
+        st = self._states.get(member_id)
+        if st is None:
+            st = self._states[member_id] = MemberState()
+        return st
+
+    def add_rest_day(self, member_id: str, scope: str, rest_day: Optional[date], as_of: Optional[date] = None):
+        """Record a pending rest day; days before `as_of` are dropped."""
+        if rest_day is None:
+            return
+        days = self.state(member_id).rest_days.setdefault(scope, set())
+        if as_of is not None and days:
+            stale = [d for d in days if d < as_of]
+            for d in stale:
+                days.discard(d)
+        days.add(rest_day)
+
+    def record_b_shift(self, member_id: str, assignment_date: date, rest_day: Optional[date] = None, scope: str = "ATM"):
+        """Record a B-shift: updates cooldown expiry and the pending rest day."""
+        st = self.state(member_id)
+        if st.last_b_shift is None or assignment_date > st.last_b_shift:
+            st.last_b_shift = assignment_date
+            st.cooldown_until = assignment_date + timedelta(days=self.b_cooldown_days)
+        self.add_rest_day(member_id, scope, rest_day, as_of=assignment_date)
+
+    def is_resting(self, member_id: str, scope: str, check_date: date) -> bool:
+        """True if the member has a pending rest day in `scope` on `check_date`."""
+        st = self._states.get(member_id)
+        if st is None:
+            return False
+        days = st.rest_days.get(scope)
+        return bool(days) and check_date in days
+
+    def in_cooldown(self, member_id: str, check_date: date) -> bool:
+        """True if `check_date` falls within the member's B-shift cooldown."""
+        st = self._states.get(member_id)
+        return st is not None and st.cooldown_until is not None and check_date <= st.cooldown_until
+
+
+@dataclass(frozen=True)
+class LoadCap:
+    """At most `max_shifts` assignments per member in any `days` consecutive days.
+
+    `task` is the scope the cap counts: "*" (every task), "ATM", "SYSAID",
+    a built-in task type (e.g. "ATM_MIDNIGHT") or a dynamic task type name.
+    """
+    max_shifts: int
+    days: int
+    task: str = "*"
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> "LoadCap":
+        """Parse a config entry such as ``{"task": "ATM", "max": 3, "days": 7}``."""
+        try:
+            cap = cls(
+                max_shifts=int(spec["max"] if "max" in spec else spec["max_shifts"]),
+                days=int(spec["days"]),
+                task=str(spec.get("task", "*")),
+            )
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Invalid load cap {spec!r} (expected task, max and days)")
+        if cap.max_shifts < 0 or cap.days < 1:
+            raise ValueError(f"Invalid load cap {spec!r} (max must be >= 0 and days >= 1)")
+        return cap
+
+    def fits(self, taken: List[int], new: List[int]) -> bool:
+        """Whether adding assignments on the `new` day ordinals keeps every window within the cap.
+
+        `taken` and `new` are sorted; only assignments within `days` of the
+        new ones are looked at.
+        """
+        span = self.days - 1
+        lo = bisect_left(taken, new[0] - span)
+        hi = bisect_right(taken, new[-1] + span)
+        points = sorted(taken[lo:hi] + new) if lo < hi else new
+        k = self.max_shifts
+        return all(points[j + k] - points[j] > span for j in range(len(points) - k))
+
+
+class LoadWindows:
+    """Per-member sliding-window assignment counters for a set of `LoadCap`s.
+
+    Each (cap, member) keeps the sorted day ordinals of the member's
+    assignments in the cap's scope. Tasks are scheduled one after another
+    over the whole horizon, so a member's earlier assignments can lie on
+    either side of a new one; a check only looks at the few assignments
+    within `days` of it, and within one task's pass new days are appended at
+    the end.
+    """
+
+    def __init__(self, caps: List[LoadCap]):
+        self.caps = caps
+        self._days: List[Dict[str, List[int]]] = [{} for _ in caps]
+        self._scoped: Dict[Tuple[str, ...], Tuple[int, ...]] = {}
+
+    def caps_for(self, scopes: Tuple[str, ...]) -> Tuple[int, ...]:
+        """Positions of the caps counting assignments in `scopes` (e.g. ("ATM", "ATM_MORNING"))."""
+        found = self._scoped.get(scopes)
+        if found is None:
+            found = self._scoped[scopes] = tuple(
+                i for i, cap in enumerate(self.caps) if cap.task == "*" or cap.task in scopes
+            )
+        return found
+
+    def allows(self, member_id: str, ordinals: List[int], caps: Tuple[int, ...]) -> bool:
+        """Whether the member can take assignments on `ordinals` (sorted) without exceeding `caps`."""
+        for i in caps:
+            if not self.caps[i].fits(self._days[i].get(member_id, []), ordinals):
+                return False
+        return True
+
+    def add(self, member_id: str, ordinals: List[int], caps: Tuple[int, ...]):
+        """Count assignments on `ordinals` for the member."""
+        for i in caps:
+            taken = self._days[i].setdefault(member_id, [])
+            for ordinal in ordinals:
+                if not taken or ordinal >= taken[-1]:
+                    taken.append(ordinal)
+                else:
+                    insort(taken, ordinal)
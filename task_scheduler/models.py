@@ -2,7 +2,8 @@
 
 from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import List, Optional, Set
+import threading
+from typing import Dict, List, Optional, Set, Tuple
 from enum import Enum
 
 
@@ -15,7 +16,68 @@ class TaskType(str, Enum):
     DYNAMIC = "DYNAMIC"  # Placeholder for configurable task types
 
 
-@dataclass
+class TaskRegistry:
+    """Interns task identifiers to small integer codes.
+
+    Built-in `TaskType` members get codes 0..N-1 in declaration order and
+    dynamic task type names get the following codes as they are first seen,
+    so "is this a built-in task" is a single comparison. Since `TaskType` is
+    a `str` enum, a member and its value map to the same code.
+    """
+
+    def __init__(self):
+        self._builtin: Tuple[TaskType, ...] = tuple(TaskType)
+        self._names: List[str] = [t.value for t in self._builtin]
+        self._codes: Dict[str, int] = {name: code for code, name in enumerate(self._names)}
+        self._lock = threading.Lock()
+
+    @property
+    def builtin_count(self) -> int:
+        return len(self._builtin)
+
+    @property
+    def builtin_names(self) -> Tuple[str, ...]:
+        """Built-in task identifiers in declaration order."""
+        return tuple(self._names[:len(self._builtin)])
+
+    def code(self, task: "str | TaskType") -> int:
+        """Code for a task (registering new dynamic names)."""
+        code = self._codes.get(task)
+        if code is None:
+            with self._lock:
+                name = str(task)
+                code = self._codes.get(name)
+                if code is None:
+                    code = self._codes[name] = len(self._names)
+                    self._names.append(name)
+        return code
+
+    def name(self, code: int) -> str:
+        """Task identifier for a code."""
+        return self._names[code]
+
+    def key(self, task: "str | TaskType") -> str:
+        """Canonical string identifier (enum value or dynamic name)."""
+        return self._names[self.code(task)]
+
+    def is_builtin(self, task: "str | TaskType") -> bool:
+        """True for `TaskType` members and their values."""
+        code = self._codes.get(task)
+        return code is not None and code < len(self._builtin)
+
+    def task_type(self, task: "str | TaskType | int") -> "str | TaskType":
+        """The `TaskType` member for built-in identifiers (or codes), else the name itself."""
+        code = task if isinstance(task, int) else self.code(task)
+        if code < len(self._builtin):
+            return self._builtin[code]
+        return self._names[code]
+
+
+# Shared registry; codes are stable for the lifetime of the process
+TASKS = TaskRegistry()
+
+
+@dataclass(slots=True)
 class TeamMember:
     """Represents a team member with their availability and office schedule."""
     name: str
@@ -24,6 +86,7 @@ class TeamMember:
     unavailable_dates: Set[date] = field(default_factory=set)
     unavailable_ranges: List[tuple[date, date]] = field(default_factory=list)  # (start, end) inclusive
     email: Optional[str] = None
+    skills: Set[str] = field(default_factory=set)  # qualifications matched against task types' required skills
     
     def is_available_on(self, check_date: date) -> bool:
         """Check if member is available on a specific date."""
@@ -51,7 +114,7 @@ class TeamMember:
         return False
 
 
-@dataclass
+@dataclass(slots=True)
 class Assignment:
     """Represents a task assignment to a team member.
 
@@ -82,12 +145,11 @@ class FairnessLedger:
     
     def get_count(self, member_id: str, task_type: str | TaskType) -> int:
         """Get assignment count for a member and task type."""
-        key = task_type.value if isinstance(task_type, TaskType) else str(task_type)
-        return self.member_counts.get(member_id, {}).get(key, 0)
+        return self.member_counts.get(member_id, {}).get(TASKS.key(task_type), 0)
     
     def increment(self, member_id: str, task_type: str | TaskType):
         """Increment count for a member and task type."""
-        key = task_type.value if isinstance(task_type, TaskType) else str(task_type)
+        key = TASKS.key(task_type)
         if member_id not in self.member_counts:
             self.member_counts[member_id] = {}
         if key not in self.member_counts[member_id]:
@@ -99,33 +161,103 @@ class FairnessLedger:
         return sum(self.member_counts.get(member_id, {}).values())
 
 
+def assignment_task_key(assignment: "Assignment") -> str:
+    """Task identifier for an assignment (custom task name or built-in enum value)."""
+    return assignment.custom_task_name or TASKS.key(assignment.task_type)
+
+
+def assignment_task_code(assignment: "Assignment") -> int:
+    """`TASKS` code of an assignment's task identifier."""
+    return TASKS.code(assignment.custom_task_name or assignment.task_type)
+
+
+def assignment_slot_key(assignment: "Assignment") -> tuple:
+    """Identity of the slot an assignment fills: (week start or date, shift label).
+
+    Weekly assignments repeat the same key on every day of their week.
+    """
+    anchor = assignment.week_start or assignment.date
+    return (anchor, assignment.shift_label or assignment_task_key(assignment))
+
+
 @dataclass
 class Schedule:
-    """Complete schedule for a time period."""
+    """Complete schedule for a time period.
+
+    Secondary indexes (by date, member, week start and task code) are
+    maintained incrementally. Use `add`/`extend`; assignments appended to
+    `assignments` directly are picked up on the next lookup, and a replaced
+    or shrunk list triggers a rebuild.
+    """
     assignments: List[Assignment] = field(default_factory=list)
     start_date: Optional[date] = None
     end_date: Optional[date] = None
+    _by_date: Dict[date, List[Assignment]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_member: Dict[str, List[Assignment]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_week: Dict[date, List[Assignment]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_task: Dict[int, List[Assignment]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _indexed_list: Optional[List[Assignment]] = field(default=None, init=False, repr=False, compare=False)
+    _indexed_count: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def _index_assignment(self, assignment: Assignment):
+        self._by_date.setdefault(assignment.date, []).append(assignment)
+        self._by_member.setdefault(assignment.assignee.id, []).append(assignment)
+        if assignment.week_start:
+            self._by_week.setdefault(assignment.week_start, []).append(assignment)
+        self._by_task.setdefault(assignment_task_code(assignment), []).append(assignment)
+    
+    def _sync_indexes(self):
+        """Bring the indexes up to date with `assignments`."""
+        if self._indexed_list is not self.assignments or len(self.assignments) < self._indexed_count:
+            self._by_date.clear()
+            self._by_member.clear()
+            self._by_week.clear()
+            self._by_task.clear()
+            self._indexed_list = self.assignments
+            self._indexed_count = 0
+        for assignment in self.assignments[self._indexed_count:]:
+            self._index_assignment(assignment)
+        self._indexed_count = len(self.assignments)
+    
+    def add(self, assignment: Assignment):
+        """Append an assignment and index it."""
+        self._sync_indexes()
+        self.assignments.append(assignment)
+        self._index_assignment(assignment)
+        self._indexed_count += 1
+    
+    def extend(self, assignments: List[Assignment]):
+        """Append several assignments and index them."""
+        for assignment in assignments:
+            self.add(assignment)
     
     def get_assignments_for_date(self, check_date: date) -> List[Assignment]:
         """Get all assignments for a specific date."""
-        return [a for a in self.assignments if a.date == check_date]
+        self._sync_indexes()
+        return list(self._by_date.get(check_date, ()))
     
     def get_assignments_for_member(self, member_id: str) -> List[Assignment]:
         """Get all assignments for a specific member."""
-        return [a for a in self.assignments if a.assignee.id == member_id]
+        self._sync_indexes()
+        return list(self._by_member.get(member_id, ()))
+    
+    def get_assignments_for_week(self, week_start: date) -> List[Assignment]:
+        """Get all assignments recorded for a week (weekly tasks)."""
+        self._sync_indexes()
+        return list(self._by_week.get(week_start, ()))
+    
+    def get_assignments_for_task(self, task: str | TaskType) -> List[Assignment]:
+        """Get all assignments for a task identifier (enum value or custom task name)."""
+        self._sync_indexes()
+        return list(self._by_task.get(TASKS.code(task), ()))
+    
+    def get_assignments_by_date(self) -> Dict[date, List[Assignment]]:
+        """Get assignments grouped by date, in date order."""
+        self._sync_indexes()
+        return {d: list(self._by_date[d]) for d in sorted(self._by_date)}
     
     def get_rest_days(self) -> Set[date]:
         """Get all rest days (days following ATM_MIDNIGHT assignments)."""
-        rest_days = set()
-        for assignment in self.assignments:
-            is_b_shift = False
-            if isinstance(assignment.task_type, TaskType):
-                is_b_shift = (assignment.task_type == TaskType.ATM_MIDNIGHT)
-            else:
-                is_b_shift = (str(assignment.task_type) == TaskType.ATM_MIDNIGHT.value)
-            if is_b_shift:
-                from datetime import timedelta
-                rest_day = assignment.date + timedelta(days=1)
-                rest_days.add(rest_day)
-        return rest_days
-
+        from datetime import timedelta
+        self._sync_indexes()
+        return {a.date + timedelta(days=1) for a in self._by_task.get(TASKS.code(TaskType.ATM_MIDNIGHT), ())}
@@ -0,0 +1,199 @@
+"""Bulk writes of generated schedules.
+
+`insert_assignments` stores a batch of assignments with multi-row INSERT ...
+RETURNING statements instead of one ORM object per row, and returns the rows
+as dicts (with their new ids) so responses can be built without reading them
+back. Fairness counter changes are summed per (member, task) first with
+`fairness_deltas` and written by `apply_fairness_deltas` as one upsert per
+counter table; `summary_deltas` / `apply_summary_deltas` do the same for the
+`FairnessSummary` table that fairness reads use, which also follows schedule
+status changes made through any session.
+"""
+
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, event, func, insert, inspect, tuple_
+from sqlalchemy.orm import Session
+
+from .database import AssignmentDB, DynamicFairnessCount, FairnessCount, FairnessSummary, ScheduleDB
+from .models import TASKS, Assignment
+
+# (dynamic, member_id, task): dynamic counters are keyed by task name
+FairnessKey = Tuple[bool, str, str]
+# (member_id, task_type, schedule status, first day of the month)
+SummaryKey = Tuple[str, str, str, date]
+
+# Counters created by the generate path cover this many days back
+FAIRNESS_PERIOD_DAYS = 90
+
+# Keys per zero-count cleanup statement (keeps bound parameters under SQLite's limit)
+_DELETE_BATCH = 200
+
+
+def fairness_key(member_id: str, task_id: Optional[str], custom_task_name: Optional[str]) -> FairnessKey:
+    """The fairness counter an assignment of `task_id` counts towards."""
+    if custom_task_name or (task_id is not None and not TASKS.is_builtin(task_id)):
+        return True, member_id, custom_task_name or task_id or "CUSTOM"
+    return False, member_id, task_id
+
+
+def assignment_rows(schedule_id: Optional[int], assignments: Iterable[Assignment]) -> List[dict]:
+    """Column values of `assignments` as `AssignmentDB` rows of a schedule."""
+    return [{
+        "task_type": TASKS.key(a.task_type),
+        "schedule_id": schedule_id,
+        "member_id": a.assignee.id,
+        "assignment_date": a.date,
+        "week_start": a.week_start,
+        "shift_label": a.shift_label,
+        "custom_task_name": a.custom_task_name,
+        "custom_task_shift": a.custom_task_shift,
+        "recurrence": a.recurrence,
+    } for a in assignments]
+
+
+def insert_assignments(session: Session, schedule_id: Optional[int], assignments: Iterable[Assignment]) -> List[dict]:
+    """Insert assignments in bulk and return the stored rows (with their ids), in id order."""
+    rows = assignment_rows(schedule_id, assignments)
+    if not rows:
+        return rows
+    if session.get_bind().dialect.insert_executemany_returning:
+        # Batched into multi-row INSERT ... VALUES (...), (...) RETURNING; every
+        # column is returned, so the rows need not come back in parameter order
+        # (which would make some drivers fall back to one row per statement)
+        table = AssignmentDB.__table__
+        result = session.execute(insert(table).returning(*table.c), rows)
+        stored = [dict(row) for row in result.mappings()]
+    else:
+        objects = [AssignmentDB(**row) for row in rows]
+        session.add_all(objects)
+        session.flush()
+        stored = [dict(row, id=obj.id) for row, obj in zip(rows, objects)]
+    stored.sort(key=lambda row: row["id"])
+    return stored
+
+
+def fairness_deltas(rows: Iterable[Mapping], delta: int = 1) -> Counter:
+    """Counter changes for assignment rows (dicts with member_id/task_type/custom_task_name)."""
+    deltas: Counter = Counter()
+    for row in rows:
+        deltas[fairness_key(row["member_id"], row["task_type"], row.get("custom_task_name"))] += delta
+    return deltas
+
+
+def _upsert_insert(session: Session):
+    """The dialect's INSERT construct supporting ON CONFLICT DO UPDATE."""
+    name = session.get_bind().dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    elif name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as upsert
+    else:
+        raise RuntimeError(f"Fairness counters need PostgreSQL or SQLite, not {name}")
+    return upsert
+
+
+def _upsert(session: Session, model, key_columns: Sequence, deltas: Mapping[tuple, int], new_row: dict, refresh: Sequence[str] = ()):
+    """Add {key: delta} to the `count` of a table with a unique key in one statement.
+
+    `key_columns` name the unique key (in key order); `new_row` fills the
+    other columns of rows that don't exist yet, and the `refresh` columns
+    are also overwritten from it on conflict. Rows are sent in key order so
+    concurrent writers lock overlapping keys in the same order and cannot
+    deadlock each other.
+    """
+    upsert = _upsert_insert(session)
+    stmt = upsert(model)
+    set_ = {"count": model.count + stmt.excluded["count"]}
+    for column in refresh:
+        set_[column] = stmt.excluded[column]
+    stmt = stmt.on_conflict_do_update(index_elements=list(key_columns), set_=set_)
+    names = [column.key for column in key_columns]
+    session.execute(stmt, [
+        {**dict(zip(names, key)), "count": delta, **new_row}
+        for key, delta in sorted(deltas.items())
+    ])
+    # Clean up zeroed counters (and ones a decrement created); only decremented keys can be
+    decremented = sorted(key for key, delta in deltas.items() if delta < 0)
+    for start in range(0, len(decremented), _DELETE_BATCH):
+        keys = decremented[start:start + _DELETE_BATCH]
+        session.execute(delete(model).where(tuple_(*key_columns).in_(keys), model.count <= 0))
+
+
+def apply_fairness_deltas(session: Session, deltas: Mapping[FairnessKey, int], period_days: int = FAIRNESS_PERIOD_DAYS):
+    """Add summed changes to the fairness counters, creating or removing rows as needed.
+
+    Each table is changed by a single INSERT ... ON CONFLICT (member_id,
+    task) DO UPDATE SET count = count + delta, so concurrent writers never
+    lose increments; counters that drop to zero are then deleted. New
+    static counters cover the last `period_days` days. The caller commits.
+    """
+    static: Dict[Tuple[str, str], int] = {}
+    dynamic: Dict[Tuple[str, str], int] = {}
+    for (is_dynamic, member_id, task), delta in deltas.items():
+        if delta:
+            target = dynamic if is_dynamic else static
+            target[(member_id, task)] = target.get((member_id, task), 0) + delta
+    today = date.today()
+    if static:
+        period = {"period_start": today - timedelta(days=period_days), "period_end": today}
+        _upsert(session, FairnessCount, (FairnessCount.member_id, FairnessCount.task_type), static,
+                {"updated_at": today, **period}, refresh=("updated_at",))
+    if dynamic:
+        _upsert(session, DynamicFairnessCount, (DynamicFairnessCount.member_id, DynamicFairnessCount.task_name), dynamic,
+                {"updated_at": today}, refresh=("updated_at",))
+
+
+def summary_key(member_id: str, task_type: str, status: Optional[str], assignment_date: date) -> SummaryKey:
+    """The `FairnessSummary` row an assignment of a schedule with `status` counts towards."""
+    return member_id, task_type, status or "", assignment_date.replace(day=1)
+
+
+def summary_deltas(rows: Iterable[Mapping], status: Optional[str], delta: int = 1) -> Counter:
+    """Summary changes for assignment rows (dicts with member_id/task_type/assignment_date) of one schedule."""
+    deltas: Counter = Counter()
+    for row in rows:
+        deltas[summary_key(row["member_id"], row["task_type"], status, row["assignment_date"])] += delta
+    return deltas
+
+
+def apply_summary_deltas(session: Session, deltas: Mapping[SummaryKey, int]):
+    """Add changes to the fairness summary in one upsert, deleting rows that drop to zero.
+
+    Call this in the same transaction as the assignment writes it mirrors.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if deltas:
+        _upsert(session, FairnessSummary, (
+            FairnessSummary.member_id, FairnessSummary.task_type, FairnessSummary.status, FairnessSummary.month
+        ), deltas, {})
+
+
+@event.listens_for(Session, "before_flush")
+def _move_summary_on_status_change(session: Session, flush_context, instances):
+    """Move a schedule's summary counts to its new status when the status is changed."""
+    for obj in session.dirty:
+        if not isinstance(obj, ScheduleDB) or obj.id is None:
+            continue
+        history = inspect(obj).attrs.status.history
+        if history.deleted:
+            old_status = history.deleted[0]
+        elif history.added:
+            # Set on an expired instance (e.g. after a commit): the old value was never loaded
+            old_status = session.query(ScheduleDB.status).filter(ScheduleDB.id == obj.id).scalar()
+        else:
+            continue
+        if old_status == obj.status:
+            continue
+        rows = session.query(
+            AssignmentDB.member_id, AssignmentDB.task_type, AssignmentDB.assignment_date, func.count()
+        ).filter(
+            AssignmentDB.schedule_id == obj.id
+        ).group_by(AssignmentDB.member_id, AssignmentDB.task_type, AssignmentDB.assignment_date)
+        deltas: Counter = Counter()
+        for member_id, task_type, assignment_date, count in rows:
+            deltas[summary_key(member_id, task_type, old_status, assignment_date)] -= count
+            deltas[summary_key(member_id, task_type, obj.status, assignment_date)] += count
+        apply_summary_deltas(session, deltas)
@@ -1,12 +1,28 @@
 """Core scheduling logic for ATM and SysAid tasks."""
 
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from concurrent.futures.process import BrokenProcessPool
 from datetime import date, timedelta
 import calendar
-from typing import List, Optional, Set, Tuple, Dict, Any
-from .models import TeamMember, Assignment, TaskType, Schedule, FairnessLedger
+import heapq
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from .models import TeamMember, Assignment, TaskType, Schedule, FairnessLedger, assignment_slot_key
 from .config import SchedulingConfig
-from .rest_day_helper import calculate_rest_day, is_rest_day
-from .task_type_model import DynamicTaskType, TaskTypeShift
+from .rest_day_helper import calculate_rest_day
+from .task_type_model import DynamicTaskType
+from .task_plan import CompiledShift, TaskPlan, compile_atm_plan, compile_task_type
+from .eligibility import EligibilityIndex, MaskCheck
+from .member_state import LoadCap, LoadWindows, MemberStateTracker
+from .selection import FairQueue, Rotation, seeded_ranks
+from . import matrix_backend
+from .audit import AuditEvent, AuditLog, DEBUG
+from .flow import SlotPlan, plan_slots
+from .stats import SchedulerStats
+from .columnar import ColumnarSchedule
+
+_NO_PHASE = nullcontext()
 
 ATM_SHIFT_PLAN = {
     0: [  # Monday
@@ -41,21 +57,7 @@ ATM_SHIFT_PLAN = {
         {"task_type": TaskType.ATM_MIDNIGHT, "label": "Night (16:00)", "rest_next_day": False},
     ],
 }
-
-
-class AuditLog:
-    """Simple audit log for scheduling decisions."""
-    
-    def __init__(self):
-        self.entries: List[str] = []
-    
-    def log(self, message: str):
-        """Add an entry to the audit log."""
-        self.entries.append(message)
-    
-    def get_log(self) -> str:
-        """Get the full audit log as a string."""
-        return "\n".join(self.entries)
+DEFAULT_ATM_PLAN = compile_atm_plan(ATM_SHIFT_PLAN)
 
 
 class Scheduler:
@@ -67,14 +69,69 @@ class Scheduler:
         ledger: Optional[FairnessLedger] = None,
         dynamic_counts: Optional[Dict[str, Dict[str, int]]] = None
     ):
+        if config.backend == "numpy":
+            matrix_backend.require()
         self.config = config
         self.ledger = ledger or FairnessLedger(fairness_window_days=config.fairness_window_days)
-        self.audit = AuditLog()
+        self.audit = AuditLog.from_config(config)
         # Track fairness for dynamic task types (custom task types from database)
         if dynamic_counts:
             self.dynamic_task_counts = {task: dict(counts) for task, counts in dynamic_counts.items()}
         else:
             self.dynamic_task_counts = {}
+        self._eligibility: Optional[EligibilityIndex] = None
+        # Last day of the current run; weekly slots started in a chunk run up to it
+        self._run_end: Optional[date] = None
+        self._member_state = MemberStateTracker(config.atm_b_cooldown_days)
+        # Sliding-window load caps (None when none are configured)
+        self._load_caps = [LoadCap.from_dict(spec) for spec in config.load_caps]
+        self._load: Optional[LoadWindows] = LoadWindows(self._load_caps) if self._load_caps else None
+        # (task key, id(pool)) -> (pool, queue)
+        self._queues: Dict[Tuple[str, int], Tuple[List[TeamMember], Any]] = {}
+        # task name -> (pool, rotation) for task types with the rotation rule
+        self._rotations: Dict[str, Tuple[List[TeamMember], Rotation]] = {}
+        # Set by generate_schedule when the NumPy backend is active
+        self._matrix_index: Optional[EligibilityIndex] = None
+        self._dynamic_matrix: Optional[matrix_backend.MatrixLedger] = None
+        # Per-scope slot plans ("ATM", "SYSAID" or a task type name) set by regenerate_schedule
+        self._plans: Dict[str, SlotPlan] = {}
+        # Instrumentation (phase times, candidates, rejections, tie-breaks); None = off
+        self.stats: Optional[SchedulerStats] = SchedulerStats() if config.instrument else None
+        # ATM shifts per weekday (config/database plan or the built-in ATM_SHIFT_PLAN)
+        self.atm_plan: TaskPlan = compile_atm_plan(config.atm_shift_plan) if config.atm_shift_plan else DEFAULT_ATM_PLAN
+    
+    def _phase(self, name: str):
+        """Context manager timing a phase when instrumentation is on."""
+        return self.stats.phase(name) if self.stats is not None else _NO_PHASE
+    
+    def _record_slot(self, task: str, mask: int, filters: Tuple[Tuple[str, int], ...]):
+        """Record a slot's candidates and the members each filter removed.
+
+        `mask` starts as the task's pool; `filters` are (reason, blocked mask)
+        pairs in the order they are applied.
+        """
+        stats = self.stats
+        for reason, blocked in filters:
+            stats.reject(reason, EligibilityIndex.count(mask & blocked))
+            mask &= ~blocked
+        stats.slot(task, EligibilityIndex.count(mask))
+    
+    def _setup_backend(self, index: EligibilityIndex):
+        """Switch fairness bookkeeping to dense matrices if the NumPy backend is configured."""
+        self._matrix_index = None
+        self._dynamic_matrix = None
+        if self.config.backend != "numpy":
+            return
+        member_ids = [m.id for m in index.members]
+        self.ledger = matrix_backend.MatrixLedger.from_ledger(self.ledger, member_ids)
+        self._dynamic_matrix = matrix_backend.MatrixLedger.from_task_counts(self.dynamic_task_counts, member_ids)
+        self._matrix_index = index
+    
+    def _index_for(self, members: List[TeamMember]) -> EligibilityIndex:
+        """Return the eligibility index, building one if `members` are not covered."""
+        if self._eligibility is None or not self._eligibility.knows(members):
+            self._eligibility = EligibilityIndex(members)
+        return self._eligibility
     
     def generate_schedule(
         self,
@@ -95,30 +152,110 @@ class Scheduler:
                        If None, uses hardcoded ATM/SysAid logic (backward compatibility)
         """
         schedule = Schedule(start_date=start_date, end_date=end_date)
+        with self._phase("generate"):
+            self._start_run(members, start_date, end_date)
+            self._schedule_range(members, start_date, end_date, task_types, task_members, schedule)
+        return schedule
+    
+    def generate_schedule_iter(
+        self,
+        members: List[TeamMember],
+        start_date: date,
+        end_date: date,
+        task_types: Optional[List[DynamicTaskType]] = None,
+        task_members: Optional[Dict[str, List[str]]] = None,
+        chunk_weeks: Optional[int] = None
+    ) -> Iterator[List[Assignment]]:
+        """
+        Generate a schedule as a sequence of batches, one per chunk of weeks.
+        
+        Chunks end the day before a SysAid week start. A weekly task type
+        whose week starts on another day is finished in the chunk where the
+        week starts, so its batch can run a few days past the chunk's end.
+        Fairness counts, rest days and cooldowns carry over from chunk
+        to chunk; only the previous chunk's assignments are kept in memory.
+        Each batch is yielded (in date order) as soon as its chunk is done.
+        Slots are covered as by `generate_schedule` over the same range, but
+        assignees can differ because tasks are interleaved chunk by chunk.
+        """
+        chunk_weeks = max(1, chunk_weeks or self.config.stream_chunk_weeks)
+        self._start_run(members, start_date, end_date)
+        previous: List[Assignment] = []
+        chunk_start = start_date
+        while chunk_start <= end_date:
+            offset = (chunk_start.weekday() - self.config.sysaid_week_start_day) % 7
+            chunk_end = min(chunk_start - timedelta(days=offset) + timedelta(weeks=chunk_weeks, days=-1), end_date)
+            self._eligibility.forget_before(chunk_start - timedelta(days=7))
+            
+            # The previous chunk is history: weeks it covered are skipped and its rest days still apply
+            history = Schedule(start_date=chunk_start, end_date=chunk_end)
+            history.extend(previous)
+            with self._phase("generate_chunk"):
+                done = self._schedule_range(members, chunk_start, chunk_end, task_types, task_members, history, parallel=False)
+            if not done:
+                return
+            previous = history.assignments[len(previous):]
+            yield sorted(previous, key=lambda a: a.date)
+            chunk_start = chunk_end + timedelta(days=1)
+    
+    def generate_schedule_compact(
+        self,
+        members: List[TeamMember],
+        start_date: date,
+        end_date: date,
+        task_types: Optional[List[DynamicTaskType]] = None,
+        task_members: Optional[Dict[str, List[str]]] = None,
+        chunk_weeks: Optional[int] = None
+    ) -> ColumnarSchedule:
+        """
+        Generate a schedule into a `ColumnarSchedule` for long horizons.
         
+        Runs `generate_schedule_iter` and compacts each batch as it arrives,
+        so only one chunk of `Assignment` objects is alive at a time.
+        """
+        store = ColumnarSchedule(start_date=start_date, end_date=end_date)
+        for batch in self.generate_schedule_iter(members, start_date, end_date, task_types, task_members, chunk_weeks):
+            store.extend(batch)
+        return store
+    
+    def _start_run(self, members: List[TeamMember], start_date: date, end_date: date):
+        """Reset per-run state (eligibility, rest/cooldown/load tracking, queues)."""
+        self._eligibility = EligibilityIndex(members, start_date, end_date)
+        self._run_end = end_date
+        self._member_state = MemberStateTracker(self.config.atm_b_cooldown_days)
+        self._load = LoadWindows(self._load_caps) if self._load_caps else None
+        self._queues = {}
+        self._rotations = {}
+        self._setup_backend(self._eligibility)
+    
+    def _schedule_range(
+        self,
+        members: List[TeamMember],
+        start_date: date,
+        end_date: date,
+        task_types: Optional[List[DynamicTaskType]],
+        task_members: Optional[Dict[str, List[str]]],
+        schedule: Schedule,
+        parallel: bool = True
+    ) -> bool:
+        """Schedule every task in [start_date, end_date] into `schedule`.
+        
+        Returns False if there is nothing to schedule for the selected members.
+        """
         if task_types:
             # Use database-driven task types
-            for task_type in task_types:
-                # Filter members for this task type if task_members mapping is provided
-                task_specific_members = members
-                if task_members and task_type.name in task_members:
-                    selected_member_ids = set(task_members[task_type.name])
-                    task_specific_members = [m for m in members if m.id in selected_member_ids]
-                    if not task_specific_members:
-                        self.audit.log(f"WARNING: No members selected for task type '{task_type.name}', skipping")
-                        continue
-                    self.audit.log(f"Using {len(task_specific_members)} selected members for task type '{task_type.name}'")
-                
-                if task_type.recurrence == "daily":
-                    assignments = self._schedule_daily_task_type(task_specific_members, task_type, start_date, end_date, schedule)
-                elif task_type.recurrence == "weekly":
-                    assignments = self._schedule_weekly_task_type(task_specific_members, task_type, start_date, end_date, schedule)
-                elif task_type.recurrence == "monthly":
-                    assignments = self._schedule_monthly_task_type(task_specific_members, task_type, start_date, end_date, schedule)
-                else:
-                    self.audit.log(f"WARNING: Unknown recurrence '{task_type.recurrence}' for task type '{task_type.name}', skipping")
-                    continue
-                schedule.assignments.extend(assignments)
+            groups = self._independent_task_groups(members, task_types, task_members)
+            results = None
+            if parallel and len(groups) > 1 and self.config.parallel_workers != 1 and not self._plans:
+                with self._phase("parallel"):
+                    results = self._schedule_task_groups_parallel(members, task_types, task_members, groups, start_date, end_date)
+            if results is None:
+                results = self._schedule_task_types(members, task_types, task_members, start_date, end_date, schedule)
+            else:
+                # Merge in task_types order so the result matches a serial run
+                for assignments, entries in results:
+                    self.audit.extend(entries)
+                    schedule.extend(assignments)
         else:
             # Backward compatibility: use hardcoded ATM/SysAid logic
             # Filter members if task_members mapping is provided with "default" key
@@ -127,20 +264,261 @@ class Scheduler:
                 selected_member_ids = set(task_members["default"])
                 atm_sysaid_members = [m for m in members if m.id in selected_member_ids]
                 if not atm_sysaid_members:
-                    self.audit.log("WARNING: No members selected for default ATM/SysAid schedule, skipping")
-                    return schedule
-                self.audit.log(f"Using {len(atm_sysaid_members)} selected members for default ATM/SysAid schedule")
+                    self.audit.warning("members", "No members selected for default ATM/SysAid schedule, skipping")
+                    return False
+                self.audit.info("members", "Using {candidates} selected members for default ATM/SysAid schedule", candidates=len(atm_sysaid_members))
             
             # Schedule SysAid FIRST to ensure we have enough members
             # Then schedule ATM while avoiding conflicts with SysAid weeks
-            sysaid_assignments = self._schedule_sysaid(atm_sysaid_members, start_date, end_date, schedule)
-            schedule.assignments.extend(sysaid_assignments)
+            with self._phase("sysaid"):
+                sysaid_assignments = self._schedule_sysaid(atm_sysaid_members, start_date, end_date, schedule)
+            schedule.extend(sysaid_assignments)
             
             # Now schedule ATM, but exclude members who have SysAid assignments during their weeks
-            atm_assignments = self._schedule_atm_with_sysaid_conflict_check(atm_sysaid_members, start_date, end_date, schedule)
-            schedule.assignments.extend(atm_assignments)
+            with self._phase("atm"):
+                atm_assignments = self._schedule_atm_with_sysaid_conflict_check(atm_sysaid_members, start_date, end_date, schedule)
+            schedule.extend(atm_assignments)
         
-        return schedule
+        return True
+    
+    def regenerate_schedule(
+        self,
+        existing: Schedule,
+        members: List[TeamMember],
+        window_start: date,
+        window_end: date,
+        pinned: Optional[List[Assignment]] = None,
+        task_types: Optional[List[DynamicTaskType]] = None,
+        task_members: Optional[Dict[str, List[str]]] = None
+    ) -> Schedule:
+        """
+        Regenerate the slots of an existing schedule that fall in a date window.
+        
+        Assignments before the window are kept as they are. Inside the window
+        only `pinned` assignments are kept and every other slot is recomputed.
+        After the window, assignments are kept unless the new choices leave
+        them breaking a rest/cooldown rule (or the member became
+        unavailable), in which case that slot is recomputed too. Slots outside
+        the window that are empty (or whose member is no longer in `members`)
+        stay empty. Weekly slots belong to the window if their week overlaps it.
+        
+        Returns the full regenerated schedule for `existing`'s date range.
+        """
+        pinned_keys = {assignment_slot_key(a) for a in (pinned or [])}
+        by_id = {m.id: m for m in members}
+        slots: Dict[str, Tuple[Dict[tuple, TeamMember], Set[tuple]]] = {}
+        for a in existing.assignments:
+            member = by_id.get(a.assignee.id)
+            if member is None:
+                continue
+            key = assignment_slot_key(a)
+            first = key[0]
+            last = first + timedelta(days=6) if a.week_start else first
+            if last < window_start:
+                forced = True
+            elif first <= window_end:
+                if key not in pinned_keys:
+                    continue
+                forced = True
+            else:
+                forced = False
+            assigned, forced_keys = slots.setdefault(self._plan_scope(a), ({}, set()))
+            assigned[key] = member
+            if forced:
+                forced_keys.add(key)
+        
+        window = (window_start, window_end)
+        self._plans = {
+            scope: SlotPlan(assigned, forced_keys, window)
+            for scope, (assigned, forced_keys) in slots.items()
+        }
+        # Scopes with nothing to keep still get an (empty) plan so their slots are repaired consistently
+        for scope in self._scopes_for(task_types):
+            self._plans.setdefault(scope, SlotPlan({}, window=window))
+        try:
+            return self.generate_schedule(
+                members, existing.start_date, existing.end_date,
+                task_types=task_types, task_members=task_members
+            )
+        finally:
+            self._plans = {}
+    
+    @staticmethod
+    def _plan_scope(assignment: Assignment) -> str:
+        """Slot plan scope of an assignment: "ATM", "SYSAID" or its task type name."""
+        if assignment.custom_task_name:
+            return assignment.custom_task_name
+        if assignment.task_type in (TaskType.ATM_MORNING, TaskType.ATM_MIDNIGHT):
+            return "ATM"
+        if assignment.task_type in (TaskType.SYSAID_MAKER, TaskType.SYSAID_CHECKER):
+            return "SYSAID"
+        return str(assignment.task_type)
+    
+    @staticmethod
+    def _scopes_for(task_types: Optional[List[DynamicTaskType]]) -> List[str]:
+        if task_types:
+            return [t.name for t in task_types]
+        return ["ATM", "SYSAID"]
+    
+    def _schedule_task_types(
+        self,
+        members: List[TeamMember],
+        task_types: List[DynamicTaskType],
+        task_members: Optional[Dict[str, List[str]]],
+        start_date: date,
+        end_date: date,
+        schedule: Schedule
+    ) -> List[Tuple[List[Assignment], List[AuditEvent]]]:
+        """Schedule dynamic task types in order, adding them to `schedule`.
+
+        Returns (assignments, audit events) per task type.
+        """
+        results = []
+        for task_type in task_types:
+            mark = self.audit.mark()
+            with self._phase(task_type.recurrence), self._phase(task_type.name):
+                assignments = self._schedule_task_type(members, task_type, task_members, start_date, end_date, schedule)
+            schedule.extend(assignments)
+            results.append((assignments, self.audit.since(mark)))
+        return results
+    
+    def _schedule_task_type(
+        self,
+        members: List[TeamMember],
+        task_type: DynamicTaskType,
+        task_members: Optional[Dict[str, List[str]]],
+        start_date: date,
+        end_date: date,
+        schedule: Schedule
+    ) -> List[Assignment]:
+        """Schedule one dynamic task type against the schedule built so far."""
+        plan = compile_task_type(task_type)
+        
+        # Narrow the pool to the task_members selection (if any) and members with the required skills
+        task_specific_members = members
+        index = self._index_for(members)
+        all_mask = index.pool(members)
+        mask = all_mask
+        if task_members and task_type.name in task_members:
+            mask &= index.with_ids(task_members[task_type.name])
+            if not mask:
+                self.audit.warning("members", "No members selected for task type '{task}', skipping", task=task_type.name)
+                return []
+            self.audit.info("members", "Using {candidates} selected members for task type '{task}'", task=task_type.name, candidates=index.count(mask))
+        if plan.required_skills:
+            mask &= index.skilled(plan.required_skills)
+            if not mask:
+                self.audit.warning("members", "No members with the skills required for task type '{task}' ({skills}), skipping", task=task_type.name, skills=", ".join(plan.required_skills))
+                return []
+        if mask != all_mask:
+            task_specific_members = index.members_in(mask)
+        
+        if plan.recurrence == "daily":
+            return self._schedule_daily_task_type(task_specific_members, plan, start_date, end_date, schedule)
+        elif plan.recurrence == "weekly":
+            return self._schedule_weekly_task_type(task_specific_members, plan, start_date, end_date, schedule)
+        elif plan.recurrence == "monthly":
+            return self._schedule_monthly_task_type(task_specific_members, plan, start_date, end_date, schedule)
+        self.audit.warning("config", "Unknown recurrence '{recurrence}' for task type '{task}', skipping", task=task_type.name, recurrence=task_type.recurrence)
+        return []
+    
+    @staticmethod
+    def _independent_task_groups(
+        members: List[TeamMember],
+        task_types: List[DynamicTaskType],
+        task_members: Optional[Dict[str, List[str]]]
+    ) -> List[List[int]]:
+        """Partition task types (by position) into groups that share no members.
+
+        Task types only interact through members they have in common (same-day
+        bookings), so separate groups can be scheduled independently. A task
+        type without a `task_members` entry uses every member.
+        """
+        all_ids = {m.id for m in members}
+        parent = list(range(len(task_types)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        owner: Dict[str, int] = {}
+        for i, task_type in enumerate(task_types):
+            if task_members and task_type.name in task_members:
+                ids = all_ids.intersection(task_members[task_type.name])
+            else:
+                ids = all_ids
+            for member_id in ids:
+                j = owner.setdefault(member_id, i)
+                if j != i:
+                    parent[find(i)] = find(j)
+        
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(task_types)):
+            groups.setdefault(find(i), []).append(i)
+        return list(groups.values())
+    
+    def _schedule_task_groups_parallel(
+        self,
+        members: List[TeamMember],
+        task_types: List[DynamicTaskType],
+        task_members: Optional[Dict[str, List[str]]],
+        groups: List[List[int]],
+        start_date: date,
+        end_date: date
+    ) -> Optional[List[Tuple[List[Assignment], List[AuditEvent]]]]:
+        """Schedule independent task type groups on a process pool.
+
+        Returns (assignments, audit events) per task type in `task_types`
+        order, or None if the pool could not be used (the caller then
+        schedules serially).
+        """
+        workers = self.config.parallel_workers or os.cpu_count() or 1
+        by_id = {m.id: m for m in members}
+        results: List[Optional[Tuple[List[Assignment], List[AuditEvent]]]] = [None] * len(task_types)
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(groups))) as pool:
+                futures = []
+                for group in groups:
+                    group_types = [task_types[i] for i in group]
+                    group_ids = set()
+                    for task_type in group_types:
+                        if task_members and task_type.name in task_members:
+                            group_ids.update(task_members[task_type.name])
+                        else:
+                            group_ids = set(by_id)
+                            break
+                    futures.append(pool.submit(
+                        _schedule_task_group,
+                        self.config,
+                        self.ledger,
+                        {t.name: self.dynamic_task_counts[t.name] for t in group_types if t.name in self.dynamic_task_counts},
+                        [m for m in members if m.id in group_ids],
+                        group_types,
+                        task_members,
+                        start_date,
+                        end_date,
+                        self.stats is not None,
+                    ))
+                for group, future in zip(groups, futures):
+                    group_results, counts, stats = future.result()
+                    self.dynamic_task_counts.update(counts)
+                    if stats is not None:
+                        self.stats.merge(stats, self.stats.current_path)
+                    for i, (assignments, entries) in zip(group, group_results):
+                        for a in assignments:
+                            a.assignee = by_id[a.assignee.id]
+                        results[i] = (assignments, entries)
+        except (OSError, BrokenProcessPool) as e:
+            self.audit.warning("parallel", "Parallel scheduling unavailable ({error}), scheduling task types serially", error=e)
+            return None
+        
+        if self._dynamic_matrix is not None:
+            self._dynamic_matrix = matrix_backend.MatrixLedger.from_task_counts(
+                self.dynamic_task_counts, [m.id for m in self._eligibility.members]
+            )
+        return results
     
     def _schedule_atm_with_sysaid_conflict_check(
         self,
@@ -151,81 +529,66 @@ class Scheduler:
     ) -> List[Assignment]:
         """Schedule ATM monitoring tasks while avoiding conflicts with SysAid assignments."""
         assignments = []
+        index = self._index_for(members)
+        
+        # Book SysAid duty days so B-shift rest days can be checked against them
+        for sysaid_task in (TaskType.SYSAID_MAKER, TaskType.SYSAID_CHECKER):
+            for a in existing_schedule.get_assignments_for_task(sysaid_task):
+                if a.assignee.id in index.index:
+                    index.book("sysaid", a.date, a.assignee.id)
         
-        # Build map of SysAid assignments by week
-        sysaid_by_week = {}  # {week_start: set(member_ids)}
-        for a in existing_schedule.assignments:
-            if a.task_type in {TaskType.SYSAID_MAKER, TaskType.SYSAID_CHECKER} and a.week_start:
-                if a.week_start not in sysaid_by_week:
-                    sysaid_by_week[a.week_start] = set()
-                sysaid_by_week[a.week_start].add(a.assignee.id)
+        plan = self._plans.get("ATM")
+        if plan is None and self._flow_planning():
+            plan = self._plan_atm_with_flow(members, start_date, end_date)
         
         current_date = start_date
         while current_date <= end_date:
-            weekday = current_date.weekday()
-            shifts = ATM_SHIFT_PLAN.get(weekday, ATM_SHIFT_PLAN[0])
-            assigned_today = {a.assignee.id for a in assignments if a.date == current_date}
+            for shift in self.atm_plan.shifts_on(current_date):
+                task_type = shift.task_type
+                label = shift.label
+                rest_next_day = shift.requires_rest
 
-            # Check which week this date belongs to (for SysAid conflict check)
-            days_since_monday = current_date.weekday() - self.config.sysaid_week_start_day
-            if days_since_monday < 0:
-                days_since_monday += 7
-            week_start = current_date - timedelta(days=days_since_monday)
-            sysaid_members_this_week = sysaid_by_week.get(week_start, set())
-
-            for shift in shifts:
-                task_type = shift["task_type"]
-                label = shift["label"]
-                rest_next_day = shift.get("rest_next_day", False)
-
-                eligible = self._get_eligible_members(members, current_date, task_type, assignments)
+                exclude = index.booked("atm", current_date)  # already assigned today
 
                 # If this shift creates a rest day (B-shift), avoid assigning members
                 # whose rest day would overlap with a SysAid assignment. Previously
                 # we excluded all SysAid members for the whole week which caused
                 # shortages; instead only block those with an actual conflict on
                 # the computed rest day.
+                conflict = 0
                 if rest_next_day:
                     rest_day = calculate_rest_day(current_date)
                     if rest_day:
-                        # collect members who have SysAid assignment on the rest day
-                        sysaid_on_rest = set()
-                        for a in existing_schedule.assignments:
-                            a_task = a.task_type
-                            a_task_is_sys = False
-                            if isinstance(a_task, TaskType):
-                                a_task_is_sys = a_task in {TaskType.SYSAID_MAKER, TaskType.SYSAID_CHECKER}
-                            else:
-                                a_task_is_sys = str(a_task) in {TaskType.SYSAID_MAKER.value, TaskType.SYSAID_CHECKER.value}
-                            if a_task_is_sys and a.date == rest_day:
-                                sysaid_on_rest.add(a.assignee.id)
-
-                        eligible = [m for m in eligible if m.id not in sysaid_on_rest]
-
-                # Do not assign members already assigned today
-                eligible = [m for m in eligible if m.id not in assigned_today]
-
-                if not eligible:
-                    self.audit.log(f"WARNING: {current_date} - No eligible members for {label} ({task_type.value})")
+                        conflict = index.booked("sysaid", rest_day)
+
+                is_eligible = self._get_eligibility_check(members, current_date, task_type, exclude, conflict)
+                if plan is not None:
+                    assignee = self._take_planned(plan, (current_date, label), members, is_eligible, lambda m: (
+                        self.ledger.get_count(m.id, task_type), self.ledger.get_total_count(m.id)
+                    ))
+                else:
+                    assignee = self._select_assignee(members, task_type, current_date, is_eligible) if is_eligible else None
+
+                if assignee is None:
+                    self.audit.warning("no_candidates", "{date} - No eligible members for {label} ({task})", date=current_date, task=task_type.value, candidates=0, label=label)
                     continue
 
-                assignee = self._select_assignee(eligible, task_type, current_date)
                 assignments.append(Assignment(
                     task_type=task_type,
                     assignee=assignee,
                     date=current_date,
                     shift_label=label
                 ))
-                assigned_today.add(assignee.id)
+                self._book_atm(index, assignee, task_type, current_date)
 
                 if self.config.atm_rest_rule_enabled and rest_next_day:
                     rest_day = calculate_rest_day(current_date)
                     if rest_day:
-                        self.audit.log(f"{current_date} - Assigned {assignee.name} to {label}. Rest on {rest_day}")
+                        self.audit.info("assigned", "{date} - Assigned {name} to {label}. Rest on {rest_day}", date=current_date, member_id=assignee.id, task=task_type.value, name=assignee.name, label=label, rest_day=rest_day)
                     else:
-                        self.audit.log(f"{current_date} - Assigned {assignee.name} to {label} (no rest day)")
+                        self.audit.info("assigned", "{date} - Assigned {name} to {label} (no rest day)", date=current_date, member_id=assignee.id, task=task_type.value, name=assignee.name, label=label)
                 else:
-                    self.audit.log(f"{current_date} - Assigned {assignee.name} to {label}")
+                    self.audit.info("assigned", "{date} - Assigned {name} to {label}", date=current_date, member_id=assignee.id, task=task_type.value, name=assignee.name, label=label)
 
                 self.ledger.increment(assignee.id, task_type)
 
@@ -241,41 +604,39 @@ class Scheduler:
     ) -> List[Assignment]:
         """Schedule ATM monitoring tasks (daily)."""
         assignments = []
+        index = self._index_for(members)
         current_date = start_date
         while current_date <= end_date:
-            weekday = current_date.weekday()
-            shifts = ATM_SHIFT_PLAN.get(weekday, ATM_SHIFT_PLAN[0])
-            assigned_today = {a.assignee.id for a in assignments if a.date == current_date}
-
-            for shift in shifts:
-                task_type = shift["task_type"]
-                label = shift["label"]
-                rest_next_day = shift.get("rest_next_day", False)
+            for shift in self.atm_plan.shifts_on(current_date):
+                task_type = shift.task_type
+                label = shift.label
+                rest_next_day = shift.requires_rest
 
-                eligible = self._get_eligible_members(members, current_date, task_type, assignments)
-                eligible = [m for m in eligible if m.id not in assigned_today]
+                is_eligible = self._get_eligibility_check(
+                    members, current_date, task_type, index.booked("atm", current_date)
+                )
+                assignee = self._select_assignee(members, task_type, current_date, is_eligible) if is_eligible else None
 
-                if not eligible:
-                    self.audit.log(f"WARNING: {current_date} - No eligible members for {label} ({task_type.value})")
+                if assignee is None:
+                    self.audit.warning("no_candidates", "{date} - No eligible members for {label} ({task})", date=current_date, task=task_type.value, candidates=0, label=label)
                     continue
 
-                assignee = self._select_assignee(eligible, task_type, current_date)
                 assignments.append(Assignment(
                     task_type=task_type,
                     assignee=assignee,
                     date=current_date,
                     shift_label=label
                 ))
-                assigned_today.add(assignee.id)
+                self._book_atm(index, assignee, task_type, current_date)
 
                 if self.config.atm_rest_rule_enabled and rest_next_day:
                     rest_day = calculate_rest_day(current_date)
                     if rest_day:
-                        self.audit.log(f"{current_date} - Assigned {assignee.name} to {label}. Rest on {rest_day}")
+                        self.audit.info("assigned", "{date} - Assigned {name} to {label}. Rest on {rest_day}", date=current_date, member_id=assignee.id, task=task_type.value, name=assignee.name, label=label, rest_day=rest_day)
                     else:
-                        self.audit.log(f"{current_date} - Assigned {assignee.name} to {label} (no rest day)")
+                        self.audit.info("assigned", "{date} - Assigned {name} to {label} (no rest day)", date=current_date, member_id=assignee.id, task=task_type.value, name=assignee.name, label=label)
                 else:
-                    self.audit.log(f"{current_date} - Assigned {assignee.name} to {label}")
+                    self.audit.info("assigned", "{date} - Assigned {name} to {label}", date=current_date, member_id=assignee.id, task=task_type.value, name=assignee.name, label=label)
 
                 self.ledger.increment(assignee.id, task_type)
 
@@ -292,24 +653,18 @@ class Scheduler:
     ) -> List[Assignment]:
         """Schedule SysAid tasks (weekly)."""
         assignments = []
-        # Build per-member rest-day map from existing ATM assignments
-        # Accept either enum TaskType or string identifier for dynamic tasks
-        b_assignments = [
-            a for a in existing_schedule.assignments
-            if (a.task_type == TaskType.ATM_MIDNIGHT) or (isinstance(a.task_type, str) and a.task_type == TaskType.ATM_MIDNIGHT.value)
-        ]
-        member_rest_days = {}
-        for a in b_assignments:
+        index = self._index_for(members)
+        pool = index.pool(members)
+        # Weeks already in the schedule (e.g. from the previous chunk of a streamed run) are skipped
+        processed_weeks = {a.week_start for a in existing_schedule.get_assignments_for_task(TaskType.SYSAID_MAKER)}
+        # Build per-date rest mask from existing ATM assignments
+        rest_masks = {}
+        for a in existing_schedule.get_assignments_for_task(TaskType.ATM_MIDNIGHT):
             rd = calculate_rest_day(a.date)
-            if rd:
-                member_rest_days.setdefault(a.assignee.id, set()).add(rd)
+            if rd and a.assignee.id in index.index:
+                rest_masks[rd] = rest_masks.get(rd, 0) | index.bit(a.assignee.id)
 
-        # Map ATM assignments by date to avoid double-booking with SysAid
-        atm_by_date = {}
-        for a in existing_schedule.assignments:
-            if (a.task_type == TaskType.ATM_MORNING) or (isinstance(a.task_type, str) and a.task_type == TaskType.ATM_MORNING.value) or \
-               (a.task_type == TaskType.ATM_MIDNIGHT) or (isinstance(a.task_type, str) and a.task_type == TaskType.ATM_MIDNIGHT.value):
-                atm_by_date.setdefault(a.date, set()).add(a.assignee.id)
+        plan = self._plans.get("SYSAID")
         
         # Find week boundaries
         current_date = start_date
@@ -322,9 +677,10 @@ class Scheduler:
             week_end = week_start + timedelta(days=6)
             
             # Skip if we've already processed this week
-            if any(a.week_start == week_start for a in assignments):
+            if week_start in processed_weeks:
                 current_date = week_end + timedelta(days=1)
                 continue
+            processed_weeks.add(week_start)
             
             # Check Monday-Saturday for SysAid (no Sunday coverage)
             week_dates = [week_start + timedelta(days=i) for i in range(6)]
@@ -332,53 +688,76 @@ class Scheduler:
             # Find eligible members (must be in office for all days of the week)
             # Since SysAid is scheduled FIRST, we don't need to check for ATM conflicts here
             # ATM will be scheduled later and will avoid SysAid conflicts
-            eligible_members = []
-            for member in members:
-                # Check if member is available for all days in the week
-                rest_set = member_rest_days.get(member.id, set())
-                
-                # Member must be available on all week days (Mon-Sat)
-                is_available_all_week = all(
-                    member.is_available_on(d) and (d not in rest_set)
-                    for d in week_dates
-                )
-                
-                if is_available_all_week:
-                    eligible_members.append(member)
+            available = index.available_all(week_dates)
+            resting = 0
+            for d in week_dates:
+                resting |= rest_masks.get(d, 0)
+            mask = pool & available & ~resting
+            if self.stats is not None:
+                self._record_slot("SYSAID", pool, (("unavailable", ~available), ("rest_day", resting)))
+            found = index.count(mask)
+            maker_label = f"Maker duty (week of {week_start.isoformat()})"
+            checker_label = f"Checker duty (week of {week_start.isoformat()})"
+            # Weeks held by a regeneration plan go through it even when short of candidates
+            pinned = plan is not None and (
+                plan.outside_window(week_start, week_end)
+                or (plan.is_forced((week_start, maker_label)) and plan.is_forced((week_start, checker_label)))
+            )
             
-            if len(eligible_members) < 2:
-                self.audit.log(f"WARNING: Week {week_start} - Insufficient eligible members for SysAid (need 2, found {len(eligible_members)})")
+            if found < 2 and not pinned:
+                self.audit.warning("insufficient", "Week {date} - Insufficient eligible members for SysAid (need 2, found {candidates})", date=week_start, task="SYSAID", candidates=found)
                 current_date = week_end + timedelta(days=1)
                 continue
             
             # Select maker and checker based on fairness
-            maker = self._select_assignee(eligible_members, TaskType.SYSAID_MAKER, week_start)
-            eligible_no_maker = [m for m in eligible_members if m.id != maker.id]
-            checker = self._select_assignee(eligible_no_maker, TaskType.SYSAID_CHECKER, week_start)
+            # A week that starts in this chunk is finished here, even past the chunk's end
+            days_in_range = [d for d in week_dates if d <= max(end_date, self._run_end or end_date)]
+            maker_scopes = ("SYSAID", TaskType.SYSAID_MAKER.value)
+            checker_scopes = ("SYSAID", TaskType.SYSAID_CHECKER.value)
+            if plan is not None:
+                maker = self._take_planned(plan, (week_start, maker_label), members, self._within_load_caps(index.contains(mask), maker_scopes, days_in_range), lambda m: (
+                    self.ledger.get_count(m.id, TaskType.SYSAID_MAKER), self.ledger.get_total_count(m.id)
+                ), week_end)
+                if maker is not None:
+                    mask &= ~index.bit(maker.id)
+                checker = self._take_planned(plan, (week_start, checker_label), members, self._within_load_caps(index.contains(mask), checker_scopes, days_in_range), lambda m: (
+                    self.ledger.get_count(m.id, TaskType.SYSAID_CHECKER), self.ledger.get_total_count(m.id)
+                ), week_end)
+            else:
+                maker = self._select_assignee(members, TaskType.SYSAID_MAKER, week_start, self._within_load_caps(index.contains(mask), maker_scopes, days_in_range))
+                checker = None
+                if maker is not None:
+                    mask &= ~index.bit(maker.id)
+                    checker = self._select_assignee(members, TaskType.SYSAID_CHECKER, week_start, self._within_load_caps(index.contains(mask), checker_scopes, days_in_range))
+            duties = [
+                (TaskType.SYSAID_MAKER, maker, maker_label, maker_scopes),
+                (TaskType.SYSAID_CHECKER, checker, checker_label, checker_scopes),
+            ]
+            if maker is None or checker is None:
+                self.audit.warning("insufficient", "Week {date} - Insufficient eligible members for SysAid (need 2, found {candidates})", date=week_start, task="SYSAID", candidates=found)
+                if plan is None or not plan.outside_window(week_start, week_end):
+                    current_date = week_end + timedelta(days=1)
+                    continue
+                # Outside a regeneration window the remaining duty is kept as it was
+                duties = [duty for duty in duties if duty[1] is not None]
             
             # Create assignments for the week
-            for week_date in week_dates:
-                if week_date <= end_date:
+            for week_date in days_in_range:
+                for task, member, label, _ in duties:
                     assignments.append(Assignment(
-                        task_type=TaskType.SYSAID_MAKER,
-                        assignee=maker,
+                        task_type=task,
+                        assignee=member,
                         date=week_date,
                         week_start=week_start,
-                        shift_label=f"Maker duty (week of {week_start.isoformat()})"
-                    ))
-                    assignments.append(Assignment(
-                        task_type=TaskType.SYSAID_CHECKER,
-                        assignee=checker,
-                        date=week_date,
-                        week_start=week_start,
-                        shift_label=f"Checker duty (week of {week_start.isoformat()})"
+                        shift_label=label
                     ))
             
-            self.audit.log(f"Week {week_start} - Assigned {maker.name} (Maker) and {checker.name} (Checker)")
-            
-            # Update ledger (count once per week, not per day)
-            self.ledger.increment(maker.id, TaskType.SYSAID_MAKER)
-            self.ledger.increment(checker.id, TaskType.SYSAID_CHECKER)
+            for task, member, _, scopes in duties:
+                self._record_load(member.id, scopes, days_in_range)
+                # Update ledger (count once per week, not per day)
+                self.ledger.increment(member.id, task)
+            if maker is not None and checker is not None:
+                self.audit.info("assigned", "Week {date} - Assigned {maker} (Maker) and {checker} (Checker)", date=week_start, member_id=maker.id, task="SYSAID", maker=maker.name, checker=checker.name)
             
             current_date = week_end + timedelta(days=1)
         
@@ -387,60 +766,67 @@ class Scheduler:
     def _schedule_daily_task_type(
         self,
         members: List[TeamMember],
-        task_type: DynamicTaskType,
+        task_type: TaskPlan,
         start_date: date,
         end_date: date,
         existing_schedule: Schedule
     ) -> List[Assignment]:
         """Schedule a daily task type from database."""
         assignments = []
+        index = self._index_for(members)
+        self._seed_dynamic_rest_days(task_type, existing_schedule)
+        plan = self._plans.get(task_type.name)
+        if plan is None and self._flow_planning():
+            plan = self._plan_daily_with_flow(members, task_type, start_date, end_date)
         current_date = start_date
         
         while current_date <= end_date:
-            weekday = current_date.weekday()
-            shifts = task_type.get_shifts_for_weekday(weekday)
-            assigned_today = {a.assignee.id for a in assignments if a.date == current_date}
-            
-            # Also check existing schedule for conflicts
-            existing_today = {a.assignee.id for a in existing_schedule.assignments if a.date == current_date}
-            assigned_today.update(existing_today)
-            
-            for shift in shifts:
-                # Get eligible members for this shift
-                eligible = self._get_eligible_members_for_dynamic_task(
-                    members, current_date, task_type, shift, existing_schedule, assignments
+            for shift in task_type.shifts_on(current_date):
+                # Get eligible members for this shift (excludes anyone already
+                # booked today by this or an earlier task type)
+                is_eligible = self._get_eligibility_check_for_dynamic_task(
+                    members, current_date, task_type, shift
                 )
-                eligible = [m for m in eligible if m.id not in assigned_today]
+                if plan is not None:
+                    assignee = self._take_planned(plan, (current_date, shift.slot_label), members, is_eligible, lambda m: (
+                        self._get_fairness_count_for_dynamic_task(m.id, task_type), self.ledger.get_total_count(m.id)
+                    ))
+                else:
+                    # Select assignee based on improved fairness algorithm
+                    assignee = self._select_assignee_for_dynamic_task_improved(
+                        members, task_type, current_date, is_eligible
+                    ) if is_eligible else None
                 
-                if not eligible:
-                    self.audit.log(f"WARNING: {current_date} - No eligible members for {task_type.name} - {shift.label}")
+                if assignee is None:
+                    self.audit.warning("no_candidates", "{date} - No eligible members for {task} - {shift}", date=current_date, task=task_type.name, candidates=0, shift=shift.label)
                     continue
                 
-                # Select assignee based on improved fairness algorithm
-                assignee = self._select_assignee_for_dynamic_task_improved(eligible, task_type, current_date, [])
-                
                 # Create assignment for dynamic task
                 # Use the task type name (string) as the stored task identifier for dynamic tasks
                 assignments.append(Assignment(
                     task_type=task_type.name,
                     assignee=assignee,
                     date=current_date,
-                    shift_label=f"{task_type.name} - {shift.label}",
+                    shift_label=shift.slot_label,
                     custom_task_name=task_type.name,
                     custom_task_shift=shift.label,
                     recurrence=task_type.recurrence
                 ))
-                assigned_today.add(assignee.id)
+                index.book("assigned", current_date, assignee.id)
+                self._record_load(assignee.id, (task_type.name,), (current_date,))
+                self._member_state.add_rest_day(
+                    assignee.id, task_type.name, calculate_rest_day(current_date), as_of=current_date
+                )
                 
                 # Handle rest day if required
                 if shift.requires_rest:
                     rest_day = calculate_rest_day(current_date)
                     if rest_day:
-                        self.audit.log(f"{current_date} - Assigned {assignee.name} to {task_type.name} - {shift.label}. Rest on {rest_day}")
+                        self.audit.info("assigned", "{date} - Assigned {name} to {task} - {shift}. Rest on {rest_day}", date=current_date, member_id=assignee.id, task=task_type.name, name=assignee.name, shift=shift.label, rest_day=rest_day)
                     else:
-                        self.audit.log(f"{current_date} - Assigned {assignee.name} to {task_type.name} - {shift.label} (no rest day)")
+                        self.audit.info("assigned", "{date} - Assigned {name} to {task} - {shift} (no rest day)", date=current_date, member_id=assignee.id, task=task_type.name, name=assignee.name, shift=shift.label)
                 else:
-                    self.audit.log(f"{current_date} - Assigned {assignee.name} to {task_type.name} - {shift.label}")
+                    self.audit.info("assigned", "{date} - Assigned {name} to {task} - {shift}", date=current_date, member_id=assignee.id, task=task_type.name, name=assignee.name, shift=shift.label)
                 
                 # Update fairness ledger (using task type name as key)
                 self._increment_fairness_for_dynamic_task(assignee.id, task_type)
@@ -452,26 +838,30 @@ class Scheduler:
     def _schedule_weekly_task_type(
         self,
         members: List[TeamMember],
-        task_type: DynamicTaskType,
+        task_type: TaskPlan,
         start_date: date,
         end_date: date,
         existing_schedule: Schedule
     ) -> List[Assignment]:
         """Schedule a weekly task type from database."""
         assignments = []
+        index = self._index_for(members)
+        pool = index.pool(members)
+        processed_weeks = {a.week_start for a in existing_schedule.get_assignments_for_task(task_type.name) if a.week_start}
         
-        # Get week start day from rules or default to Monday
-        week_start_day = task_type.rules_json.get("week_start_day", 0) if task_type.rules_json else 0
+        week_start_day = task_type.week_start_day
         
-        # Build rest days map from existing assignments
-        member_rest_days = {}
-        for a in existing_schedule.assignments:
-            if a.shift_label and task_type.name in a.shift_label:
+        # Build per-date rest mask from existing assignments of this task type
+        rest_masks = {}
+        for a in existing_schedule.get_assignments_for_task(task_type.name):
+            if a.assignee.id in index.index:
                 # Check if this assignment requires rest
                 # We'll need to track this in the assignment or check shift definition
                 rd = calculate_rest_day(a.date)
                 if rd:
-                    member_rest_days.setdefault(a.assignee.id, set()).add(rd)
+                    rest_masks[rd] = rest_masks.get(rd, 0) | index.bit(a.assignee.id)
+        
+        plan = self._plans.get(task_type.name)
         
         current_date = start_date
         while current_date <= end_date:
@@ -483,62 +873,81 @@ class Scheduler:
             week_end = week_start + timedelta(days=6)
             
             # Skip if already processed
-            if any(a.week_start == week_start for a in assignments if hasattr(a, 'week_start')):
+            if week_start in processed_weeks:
                 current_date = week_end + timedelta(days=1)
                 continue
+            processed_weeks.add(week_start)
             
-            # Get week dates (exclude Sunday if configured)
-            exclude_sunday = task_type.rules_json.get("exclude_sunday", True) if task_type.rules_json else True
-            week_dates = [week_start + timedelta(days=i) for i in range(6 if exclude_sunday else 7)]
+            # Get week dates (Sunday excluded unless the rules include it)
+            week_dates = [week_start + timedelta(days=i) for i in range(task_type.week_length)]
             
             # Find eligible members
-            eligible_members = []
-            for member in members:
-                rest_set = member_rest_days.get(member.id, set())
-                is_available_all_week = all(
-                    member.is_available_on(d) and (d not in rest_set)
-                    for d in week_dates
-                )
-                if is_available_all_week:
-                    eligible_members.append(member)
+            available = index.available_all(week_dates)
+            resting = 0
+            for d in week_dates:
+                resting |= rest_masks.get(d, 0)
+            mask = pool & available & ~resting
+            if self.stats is not None:
+                self._record_slot(task_type.name, pool, (("unavailable", ~available), ("rest_day", resting)))
+            found = index.count(mask)
+            slot_keys = [
+                (week_start, f"{task_type.name} - {role} (week of {week_start.isoformat()})")
+                for role in task_type.roles
+            ]
+            # Weeks held by a regeneration plan go through it even when short of candidates
+            pinned = plan is not None and (
+                plan.outside_window(week_start, week_end) or all(plan.is_forced(key) for key in slot_keys)
+            )
             
-            if len(eligible_members) < task_type.required_count:
-                self.audit.log(f"WARNING: Week {week_start} - Insufficient eligible members for {task_type.name} (need {task_type.required_count}, found {len(eligible_members)})")
+            if found < task_type.required_count and not pinned:
+                self.audit.warning("insufficient", "Week {date} - Insufficient eligible members for {task} (need {need}, found {candidates})", date=week_start, task=task_type.name, candidates=found, need=task_type.required_count)
                 current_date = week_end + timedelta(days=1)
                 continue
             
             # Select assignees based on role labels or required count with improved fairness
             # For weekly tasks, we want to ensure equal distribution across all weeks
+            scopes = (task_type.name,)
+            # A week that starts in this chunk is finished here, even past the chunk's end
+            days_in_range = [d for d in week_dates if d <= max(end_date, self._run_end or end_date)]
             selected_members = []
-            for i in range(task_type.required_count):
-                if i < len(eligible_members):
-                    # Select based on improved fairness algorithm
-                    remaining = [m for m in eligible_members if m.id not in [s.id for s in selected_members]]
-                    if remaining:
-                        # Use improved selection that ensures fairness
-                        selected = self._select_assignee_for_dynamic_task_improved(
-                            remaining, task_type, week_start, selected_members
-                        )
-                        selected_members.append(selected)
+            for role_label, key in zip(task_type.roles, slot_keys):
+                # Use improved selection that ensures fairness; members already
+                # picked this week are removed from the mask
+                is_eligible = self._within_load_caps(index.contains(mask), scopes, days_in_range)
+                if plan is not None:
+                    selected = self._take_planned(plan, key, members, is_eligible, lambda m: (
+                        self._get_fairness_count_for_dynamic_task(m.id, task_type), self.ledger.get_total_count(m.id)
+                    ), week_end)
+                else:
+                    selected = self._select_assignee_for_dynamic_task_improved(
+                        members, task_type, week_start, is_eligible
+                    )
+                if selected is None:
+                    # Outside a regeneration window, an empty role doesn't drop the ones kept after it
+                    if plan is not None and plan.outside_window(week_start, week_end):
+                        continue
+                    break
+                selected_members.append((role_label, selected))
+                mask &= ~index.bit(selected.id)
+                self._record_load(selected.id, scopes, days_in_range)
             
             # Create assignments for the week
-            for week_date in week_dates:
-                if week_date <= end_date:
-                    for idx, member in enumerate(selected_members):
-                        role_label = task_type.role_labels[idx] if idx < len(task_type.role_labels) else f"Role {idx+1}"
-                        assignments.append(Assignment(
-                            task_type=task_type.name,
-                            assignee=member,
-                            date=week_date,
-                            week_start=week_start,
-                            shift_label=f"{task_type.name} - {role_label} (week of {week_start.isoformat()})",
-                            custom_task_name=task_type.name,
-                            custom_task_shift=role_label,
-                            recurrence=task_type.recurrence
-                        ))
-                        self._increment_fairness_for_dynamic_task(member.id, task_type)
+            for week_date in days_in_range:
+                for role_label, member in selected_members:
+                    assignments.append(Assignment(
+                        task_type=task_type.name,
+                        assignee=member,
+                        date=week_date,
+                        week_start=week_start,
+                        shift_label=f"{task_type.name} - {role_label} (week of {week_start.isoformat()})",
+                        custom_task_name=task_type.name,
+                        custom_task_shift=role_label,
+                        recurrence=task_type.recurrence
+                    ))
+                    index.book("assigned", week_date, member.id)
+                    self._increment_fairness_for_dynamic_task(member.id, task_type)
             
-            self.audit.log(f"Week {week_start} - Assigned {len(selected_members)} members to {task_type.name}")
+            self.audit.info("assigned", "Week {date} - Assigned {count} members to {task}", date=week_start, task=task_type.name, count=len(selected_members))
             current_date = week_end + timedelta(days=1)
         
         return assignments
@@ -546,41 +955,19 @@ class Scheduler:
     def _schedule_monthly_task_type(
         self,
         members: List[TeamMember],
-        task_type: DynamicTaskType,
+        task_type: TaskPlan,
         start_date: date,
         end_date: date,
         existing_schedule: Schedule
     ) -> List[Assignment]:
         """Schedule a monthly task type from database with equal distribution."""
         assignments = []
+        index = self._index_for(members)
+        self._seed_dynamic_rest_days(task_type, existing_schedule)
         
-        # Determine scheduling day: can be an integer day (1..31), negative (e.g. -1 means last day),
-        # or the string 'EOM' / 'eom' to indicate end-of-month. Default to 1st.
-        raw_dom = None
-        if task_type.rules_json:
-            raw_dom = task_type.rules_json.get("day_of_month", None)
-            # Some task definitions may use a boolean flag for end-of-month
-            if raw_dom is None and task_type.rules_json.get("eom"):
-                raw_dom = "EOM"
-        if raw_dom is None:
-            day_of_month = 1
-            eom = False
-        else:
-            if isinstance(raw_dom, str) and raw_dom.strip().upper() == "EOM":
-                eom = True
-                day_of_month = None
-            elif isinstance(raw_dom, int) and raw_dom < 0:
-                # negative indexing like -1 means last day
-                eom = True
-                day_of_month = None
-            else:
-                try:
-                    day_of_month = int(raw_dom)
-                    eom = False
-                except Exception:
-                    # fallback to 1st
-                    day_of_month = 1
-                    eom = False
+        # Scheduling day: a day of month (1..31) or the last day (eom)
+        day_of_month = task_type.day_of_month
+        eom = task_type.eom
 
         # First, collect all dates that need assignments by iterating months
         dates_to_schedule = []
@@ -614,7 +1001,7 @@ class Scheduler:
                     adjusted = next_monday
                 else:
                     # no valid fallback within range
-                    self.audit.log(f"{candidate} falls on Saturday and no fallback within range; skipping")
+                    self.audit.info("monthly_date", "{date} falls on Saturday and no fallback within range; skipping", date=candidate, task=task_type.name)
                     adjusted = None
             elif candidate.weekday() == 6:
                 # Sunday: prefer next Monday, else previous Friday
@@ -625,14 +1012,14 @@ class Scheduler:
                 elif prev_friday >= start_date:
                     adjusted = prev_friday
                 else:
-                    self.audit.log(f"{candidate} falls on Sunday and no fallback within range; skipping")
+                    self.audit.info("monthly_date", "{date} falls on Sunday and no fallback within range; skipping", date=candidate, task=task_type.name)
                     adjusted = None
 
             if adjusted and adjusted >= start_date and adjusted <= end_date:
                 # avoid duplicates if adjustment causes same date twice
                 if adjusted not in dates_to_schedule:
                     if adjusted != candidate:
-                        self.audit.log(f"Adjusted monthly candidate {candidate} -> {adjusted}")
+                        self.audit.info("monthly_date", "Adjusted monthly candidate {date} -> {adjusted}", date=candidate, task=task_type.name, adjusted=adjusted)
                     dates_to_schedule.append(adjusted)
 
             # advance to first of next month
@@ -649,8 +1036,7 @@ class Scheduler:
         # Calculate total slots needed (dates * shifts per date)
         total_slots = 0
         for schedule_date in dates_to_schedule:
-            shifts = task_type.get_shifts_for_weekday(schedule_date.weekday())
-            total_slots += len(shifts)
+            total_slots += len(task_type.shifts_on(schedule_date))
         
         # For equal distribution: calculate how many assignments each member should get
         # This ensures fairness when members > slots or slots > members
@@ -665,292 +1051,549 @@ class Scheduler:
         # Track how many assignments each member has received
         member_assignment_counts = {m.id: 0 for m in members}
         
-        # Sort members by current fairness count (ascending) for initial ordering
-        members_sorted = sorted(members, key=lambda m: self._get_fairness_count_for_dynamic_task(m.id, task_type))
+        # Rank members by current fairness count (ascending); the first
+        # `extra_assignments` in this order get one extra slot as their target
+        tie_ranks = self._tie_ranks(f"monthly:{task_type.name}", members) or list(range(len(members)))
+        members_sorted = [m for _, m in sorted(
+            zip(tie_ranks, members), key=lambda pair: (self._get_fairness_count_for_dynamic_task(pair[1].id, task_type), pair[0])
+        )]
+        targets: Dict[str, int] = {}
+        for rank, member in enumerate(members_sorted):
+            targets.setdefault(member.id, base_assignments + (1 if rank < extra_assignments else 0))
+        
+        # Prioritize members who haven't reached their target assignment count.
+        # Score (lower is better):
+        # Primary: how far below target (negative means below target, positive means above)
+        # Secondary: fairness count
+        # Tertiary: total count
+        queue = FairQueue(members, lambda m: (
+            member_assignment_counts[m.id] - targets[m.id],
+            self._get_fairness_count_for_dynamic_task(m.id, task_type),
+            self.ledger.get_total_count(m.id),
+        ), tie_ranks)
+        
+        plan = self._plans.get(task_type.name)
         
         # Process each date
         for schedule_date in dates_to_schedule:
-            shifts = task_type.get_shifts_for_weekday(schedule_date.weekday())
-            assigned_today = {a.assignee.id for a in assignments if a.date == schedule_date}
-            existing_today = {a.assignee.id for a in existing_schedule.assignments if a.date == schedule_date}
-            assigned_today.update(existing_today)
-            
-            for shift in shifts:
-                # Get eligible members
-                eligible = self._get_eligible_members_for_dynamic_task(
-                    members, schedule_date, task_type, shift, existing_schedule, assignments
+            for shift in task_type.shifts_on(schedule_date):
+                is_eligible = self._get_eligibility_check_for_dynamic_task(
+                    members, schedule_date, task_type, shift
                 )
-                eligible = [m for m in eligible if m.id not in assigned_today]
+                if plan is not None:
+                    assignee = self._take_planned(plan, (schedule_date, shift.slot_label), members, is_eligible, lambda m: (
+                        member_assignment_counts[m.id] - targets[m.id],
+                        self._get_fairness_count_for_dynamic_task(m.id, task_type),
+                        self.ledger.get_total_count(m.id),
+                    ))
+                else:
+                    assignee, tied = queue.select(is_eligible) if is_eligible else (None, False)
+                    if tied and self.stats is not None:
+                        self.stats.tie_break(task_type.name)
                 
-                if not eligible:
-                    self.audit.log(f"WARNING: {schedule_date} - No eligible members for {task_type.name} - {shift.label}")
+                if assignee is None:
+                    self.audit.warning("no_candidates", "{date} - No eligible members for {task} - {shift}", date=schedule_date, task=task_type.name, candidates=0, shift=shift.label)
                     continue
                 
-                # Select assignee with improved fairness algorithm
-                # Prioritize members who haven't reached their target assignment count
-                target_scores = []
-                for member in eligible:
-                    current_count = member_assignment_counts[member.id]
-                    fairness_count = self._get_fairness_count_for_dynamic_task(member.id, task_type)
-                    
-                    # Calculate target for this member
-                    member_index = next(i for i, m in enumerate(members_sorted) if m.id == member.id)
-                    target = base_assignments + (1 if member_index < extra_assignments else 0)
-                    
-                    # Score: lower is better
-                    # Primary: how far below target (negative means below target, positive means above)
-                    # Secondary: fairness count
-                    # Tertiary: total count
-                    score = (current_count - target, fairness_count, self.ledger.get_total_count(member.id))
-                    target_scores.append((score, member))
-                
-                # Sort by score (lower is better)
-                target_scores.sort(key=lambda x: x[0])
-                assignee = target_scores[0][1]
-                
                 assignments.append(Assignment(
                     task_type=task_type.name,
                     assignee=assignee,
                     date=schedule_date,
-                    shift_label=f"{task_type.name} - {shift.label}",
+                    shift_label=shift.slot_label,
                     custom_task_name=task_type.name,
                     custom_task_shift=shift.label,
                     recurrence=task_type.recurrence
                 ))
-                assigned_today.add(assignee.id)
-                member_assignment_counts[assignee.id] += 1
+                index.book("assigned", schedule_date, assignee.id)
+                self._record_load(assignee.id, (task_type.name,), (schedule_date,))
+                self._member_state.add_rest_day(
+                    assignee.id, task_type.name, calculate_rest_day(schedule_date), as_of=schedule_date
+                )
+                member_assignment_counts[assignee.id] = member_assignment_counts.get(assignee.id, 0) + 1
                 self._increment_fairness_for_dynamic_task(assignee.id, task_type)
         
         return assignments
     
-    def _get_eligible_members_for_dynamic_task(
+    def _flow_planning(self) -> bool:
+        """True if daily slots are planned with min-cost flow (a budget of 0 means greedy)."""
+        return self.config.engine_mode == "flow" and self.config.flow_time_budget_seconds > 0
+    
+    def _plan_atm_with_flow(
         self,
         members: List[TeamMember],
-        check_date: date,
-        task_type: DynamicTaskType,
-        shift: TaskTypeShift,
-        existing_schedule: Schedule,
-        new_assignments: List[Assignment]
-    ) -> List[TeamMember]:
-        """Get eligible members for a dynamic task type."""
-        eligible = []
-        
-        # Get rules from task type
-        requires_office_days = task_type.rules_json.get("requires_office_days", True) if task_type.rules_json else True
-        
-        for member in members:
-            # Check availability
-            if requires_office_days:
-                if not member.is_available_on(check_date):
+        start_date: date,
+        end_date: date
+    ) -> SlotPlan:
+        """Plan the horizon's ATM slots with min-cost flow.
+
+        Costs come from the fairness ledger: the task-specific count on each
+        slot arc and the total count as the base of each member's load.
+        Slots are keyed by (date, shift label).
+        """
+        index = self._index_for(members)
+        pool = index.pool(members)
+        keys, dates, candidates, tasks = [], [], [], []
+        current_date = start_date
+        while current_date <= end_date:
+            for shift in self.atm_plan.shifts_on(current_date):
+                task_type = shift.task_type
+                mask = pool & index.available(current_date, requires_office_days=False)
+                if shift.requires_rest:
+                    rest_day = calculate_rest_day(current_date)
+                    if rest_day:
+                        mask &= ~index.booked("sysaid", rest_day)
+                keys.append((current_date, shift.label))
+                dates.append(current_date)
+                tasks.append(task_type)
+                candidates.append(self._flow_candidates(index, mask, lambda m, t=task_type: (
+                    self.ledger.get_count(m.id, t), self.ledger.get_total_count(m.id)
+                )))
+            current_date += timedelta(days=1)
+        return self._run_flow_plan(
+            "ATM", index, keys, dates, candidates,
+            lambda i, member_id: self.ledger.get_count(member_id, tasks[i]),
+            self.ledger.get_total_count
+        )
+    
+    def _plan_daily_with_flow(
+        self,
+        members: List[TeamMember],
+        task_type: TaskPlan,
+        start_date: date,
+        end_date: date
+    ) -> SlotPlan:
+        """Plan a daily dynamic task type's slots with min-cost flow.
+
+        The task's dynamic fairness count is the base of each member's load
+        and the total ledger count is the slot arc cost.
+        """
+        index = self._index_for(members)
+        pool = index.pool(members)
+        keys, dates, candidates = [], [], []
+        current_date = start_date
+        while current_date <= end_date:
+            mask = pool & index.available(current_date, task_type.requires_office_days)
+            mask &= ~index.booked("assigned", current_date)
+            for shift in task_type.shifts_on(current_date):
+                keys.append((current_date, shift.slot_label))
+                dates.append(current_date)
+                candidates.append(self._flow_candidates(index, mask, lambda m: (
+                    self._get_fairness_count_for_dynamic_task(m.id, task_type), self.ledger.get_total_count(m.id)
+                )))
+            current_date += timedelta(days=1)
+        return self._run_flow_plan(
+            task_type.name, index, keys, dates, candidates,
+            lambda i, member_id: self.ledger.get_total_count(member_id),
+            lambda member_id: self._get_fairness_count_for_dynamic_task(member_id, task_type)
+        )
+    
+    def _flow_candidates(self, index: EligibilityIndex, mask: int, key: Callable[[TeamMember], Tuple]) -> List[str]:
+        """The `flow_max_candidates` lowest-scoring members of a mask, as ids."""
+        members = index.members_in(mask)
+        limit = self.config.flow_max_candidates
+        if limit and len(members) > limit:
+            members = heapq.nsmallest(limit, members, key=key)
+        return [m.id for m in members]
+    
+    def _run_flow_plan(
+        self,
+        label: str,
+        index: EligibilityIndex,
+        keys: List[Tuple[date, int]],
+        dates: List[date],
+        candidates: List[List[str]],
+        arc_cost: Callable[[int, str], int],
+        load: Callable[[str], int]
+    ) -> SlotPlan:
+        """Solve a flow plan and map it back to slot keys and members."""
+        base_load = {member_id: load(member_id) for ids in candidates for member_id in ids}
+        with self._phase("flow_plan"):
+            assigned, finished = plan_slots(
+                dates, candidates, arc_cost, base_load, self.config.flow_time_budget_seconds
+            )
+        if not finished:
+            self.audit.warning("flow", "Flow time budget exhausted for {label}; unplanned slots are filled greedily", label=label)
+        self.audit.info("flow", "Flow plan for {label}: {planned} of {candidates} slots planned", label=label, planned=sum(1 for m in assigned if m), candidates=len(keys))
+        return SlotPlan({
+            key: index.members[index.index[member_id]]
+            for key, member_id in zip(keys, assigned) if member_id is not None
+        }, advisory=True)
+    
+    def _take_planned(
+        self,
+        plan: SlotPlan,
+        key: Tuple[date, int],
+        members: List[TeamMember],
+        is_eligible: Optional[MaskCheck],
+        score: Callable[[TeamMember], Tuple],
+        last: Optional[date] = None
+    ) -> Optional[TeamMember]:
+        """Assignee for a planned slot covering key[0]..`last` (default: one day).
+
+        Forced slots (history, pinned assignments) keep their member, and
+        unplanned slots outside the plan's window stay empty. Other
+        planned members are kept unless an earlier choice (rest day,
+        cooldown, same-day booking) made them ineligible. Otherwise the slot
+        is repaired with the eligible member of lowest projected load: their
+        primary count plus remaining planned slots, then `score` itself, so
+        repairs don't pile onto members the plan still relies on.
+
+        Advisory (flow) plans only break ties: the planned member is kept if
+        eligible and no one scores lower, otherwise the lowest-scoring
+        eligible member is taken, preferring members the plan does not need
+        later that day. The flow plan ignores rest days and cooldowns, so
+        following it blindly would trade fairness for slots it can't keep.
+        """
+        forced = plan.is_forced(key)
+        planned = plan.pop(key)
+        if planned is not None and forced:
+            return planned
+        if planned is None and plan.outside_window(key[0], last or key[0]):
+            return None
+        if not is_eligible:
+            return None
+        if planned is not None and not plan.advisory and is_eligible(planned):
+            return planned
+        index = self._index_for(members)
+        reserved = plan.reserved(key[0])
+        best = held = None
+        best_score = held_score = None
+        for member in index.members_in(is_eligible.mask & index.pool(members)):
+            if not is_eligible(member):
+                continue
+            if plan.advisory:
+                member_score = score(member)
+                if reserved[member.id] > 0:
+                    if held is None or member_score < held_score:
+                        held, held_score = member, member_score
                     continue
+            elif reserved[member.id] > 0:
+                continue
             else:
-                # Allow any day unless explicitly unavailable
-                if check_date in member.unavailable_dates:
-                    continue
-                if any(start <= check_date <= end for start, end in member.unavailable_ranges):
-                    continue
-            
-            # Check rest days if shift requires rest
-            if shift.requires_rest:
-                # Check if member has rest day on check_date from previous assignments
-                has_rest = any(
-                    is_rest_day(check_date, a.date)
-                    for a in existing_schedule.assignments + new_assignments
-                    if a.assignee.id == member.id and a.shift_label and task_type.name in a.shift_label
-                )
-                if has_rest:
-                    continue
-            
-            eligible.append(member)
-        
-        return eligible
+                primary, *rest = score(member)
+                member_score = (primary + plan.remaining[member.id], primary, *rest)
+            if best is None or member_score < best_score:
+                best, best_score = member, member_score
+        if plan.advisory:
+            if best is None:
+                best, best_score = held, held_score
+            if planned is not None and best is not None and is_eligible(planned) and score(planned) <= best_score:
+                return planned
+        return best
+    
+    def _seed_dynamic_rest_days(self, task_type: TaskPlan, existing_schedule: Schedule):
+        """Load rest days earned by earlier assignments of this task type into the member state."""
+        for a in existing_schedule.get_assignments_for_task(task_type.name):
+            self._member_state.add_rest_day(a.assignee.id, task_type.name, calculate_rest_day(a.date))
     
-    def _select_assignee_for_dynamic_task(
+    def _get_eligibility_check_for_dynamic_task(
         self,
-        eligible_members: List[TeamMember],
-        task_type: DynamicTaskType,
-        assignment_date: date
-    ) -> TeamMember:
-        """Select assignee for dynamic task type based on fairness."""
-        if not eligible_members:
-            raise ValueError("No eligible members available")
-        
-        if len(eligible_members) == 1:
-            return eligible_members[0]
-        
-        # Calculate fairness scores using task type name as identifier
-        scores = []
-        for member in eligible_members:
-            count = self._get_fairness_count_for_dynamic_task(member.id, task_type)
-            total_count = self.ledger.get_total_count(member.id)
-            scores.append((count, total_count, member))
-        
-        scores.sort(key=lambda x: (x[0], x[1]))
-        best_score = scores[0][0]
-        best_members = [s[2] for s in scores if s[0] == best_score]
-        
-        if len(best_members) > 1:
-            tie_breaker = hash((assignment_date.isoformat(), task_type.name)) % len(best_members)
-            selected = best_members[tie_breaker]
-        else:
-            selected = best_members[0]
+        members: List[TeamMember],
+        check_date: date,
+        task_type: TaskPlan,
+        shift: CompiledShift
+    ) -> Optional[MaskCheck]:
+        """Get an eligibility predicate for a dynamic task type slot.
+
+        Members already booked on `check_date` (by this or an earlier task
+        type in the same run) are excluded. Returns None when nobody in
+        `members` can take the slot.
+        """
+        index = self._index_for(members)
         
-        return selected
+        # Availability: office days (if required) plus unavailable dates/ranges
+        pool = index.pool(members)
+        available = index.available(check_date, task_type.requires_office_days)
+        booked = index.booked("assigned", check_date)
+        mask = pool & available & ~booked
+        if self.stats is not None:
+            self._record_slot(task_type.name, pool, (("unavailable", ~available), ("booked", booked)))
+        if not mask:
+            return None
+        
+        in_mask = index.contains(mask)
+        scopes = (task_type.name,)
+        if not shift.requires_rest:
+            return self._within_load_caps(in_mask, scopes, (check_date,))
+        
+        # Check rest days if shift requires rest
+        is_resting = self._member_state.is_resting
+        scope = task_type.name
+        stats = self.stats
+        if stats is not None:
+            def not_resting(m: TeamMember) -> bool:
+                if is_resting(m.id, scope, check_date):
+                    stats.reject("rest_day")
+                    return False
+                return True
+            return self._within_load_caps(in_mask.also(not_resting), scopes, (check_date,))
+        return self._within_load_caps(in_mask.also(lambda m: not is_resting(m.id, scope, check_date)), scopes, (check_date,))
 
     def _select_assignee_for_dynamic_task_improved(
         self,
-        eligible_members: List[TeamMember],
-        task_type: DynamicTaskType,
+        members: List[TeamMember],
+        task_type: TaskPlan,
         assignment_date: date,
-        already_selected: List[TeamMember]
-    ) -> TeamMember:
+        is_eligible: MaskCheck
+    ) -> Optional[TeamMember]:
         """Improved selection for dynamic tasks.
 
         Prioritizes members with lower dynamic fairness count for the task type,
-        then by total ledger count. Avoids members already in `already_selected`.
-        Uses deterministic tie-breaker based on date and task name.
+        then by total ledger count, then by roster order. Only members of the
+        pool `members` accepted by `is_eligible` are considered; returns None
+        if there are none.
+
+        Task types with the rotation rule take the member whose turn it is
+        when they are eligible, and only fall back to this scoring otherwise.
         """
-        if not eligible_members:
-            raise ValueError("No eligible members available")
-
-        # Filter out any already_selected members first if possible
-        remaining = [m for m in eligible_members if m.id not in {s.id for s in already_selected}]
-        candidates = remaining if remaining else eligible_members
-
-        if len(candidates) == 1:
-            return candidates[0]
-
-        scores = []
-        for member in candidates:
-            dyn_count = self._get_fairness_count_for_dynamic_task(member.id, task_type)
-            total = self.ledger.get_total_count(member.id)
-            # lower is better
-            scores.append((dyn_count, total, member))
-
-        scores.sort(key=lambda x: (x[0], x[1]))
-        best_score = scores[0][0]
-        best_members = [s[2] for s in scores if s[0] == best_score]
-
-        if len(best_members) > 1:
-            tie_breaker = hash((assignment_date.isoformat(), task_type.name)) % len(best_members)
-            selected = best_members[tie_breaker]
-            self.audit.log(f"Tie-break for {task_type.name} on {assignment_date}: selected {selected.name} from {len(best_members)} candidates")
-        else:
-            selected = best_members[0]
+        rotation = self._rotation_for(members, task_type) if task_type.rotation else None
+        if rotation is not None:
+            selected = rotation.next(is_eligible)
+            if selected is not None:
+                if self.audit.enabled(DEBUG):
+                    self.audit.debug("selected", "Selected {name} for {task} on {date} (rotation)", date=assignment_date, member_id=selected.id, task=task_type.name, name=selected.name)
+                return selected
+        
+        queue = self._queue_for(f"dynamic:{task_type.name}", members, lambda m: self._fair_key(
+            self._get_fairness_count_for_dynamic_task(m.id, task_type),
+            self.ledger.get_total_count(m.id),
+        ), lambda: self._fair_key_arrays(self._dynamic_matrix.column(task_type.name), self.ledger.totals))
+        selected, tied = queue.select(is_eligible)
+        if selected is None:
+            return None
+        if rotation is not None:
+            rotation.served(selected)
+        if tied and self.stats is not None:
+            self.stats.tie_break(task_type.name)
 
-        self.audit.log(f"Selected {selected.name} for {task_type.name} on {assignment_date} (dyn_count={self._get_fairness_count_for_dynamic_task(selected.id, task_type)})")
+        if self.audit.enabled(DEBUG):
+            candidates = EligibilityIndex.count(is_eligible.mask & self._index_for(members).pool(members))
+            if tied:
+                self.audit.debug("tie_break", "Tie-break for {task} on {date}: selected {name} by total count and {order}", date=assignment_date, member_id=selected.id, task=task_type.name, candidates=candidates, name=selected.name, order=self._tie_order())
+            self.audit.debug("selected", "Selected {name} for {task} on {date} (dyn_count={count})", date=assignment_date, member_id=selected.id, task=task_type.name, candidates=candidates, name=selected.name, count=self._get_fairness_count_for_dynamic_task(selected.id, task_type))
         return selected
     
-    def _get_fairness_count_for_dynamic_task(self, member_id: str, task_type: DynamicTaskType) -> int:
+    def _rotation_for(self, members: List[TeamMember], task_type: TaskPlan) -> Optional[Rotation]:
+        """Rotation cursor for a task type over a pool, starting in fairness order (cached per run)."""
+        cached = self._rotations.get(task_type.name)
+        if cached is not None and cached[0] is members:
+            return cached[1]
+        if not members:
+            return None
+        counts = self.dynamic_task_counts.get(task_type.name, {})
+        ranks = self._tie_ranks(f"dynamic:{task_type.name}", members) or range(len(members))
+        order = [m for _, _, m in sorted(
+            ((self._fair_key(counts.get(m.id, 0), self.ledger.get_total_count(m.id)), rank, m) for rank, m in zip(ranks, members)),
+            key=lambda entry: entry[:2]
+        )]
+        rotation = Rotation(order)
+        self._rotations[task_type.name] = (members, rotation)
+        return rotation
+    
+    def _get_fairness_count_for_dynamic_task(self, member_id: str, task_type: TaskPlan) -> int:
         """Get fairness count for a dynamic task type."""
         if task_type.name not in self.dynamic_task_counts:
             return 0
         return self.dynamic_task_counts[task_type.name].get(member_id, 0)
     
-    def _increment_fairness_for_dynamic_task(self, member_id: str, task_type: DynamicTaskType):
+    def _increment_fairness_for_dynamic_task(self, member_id: str, task_type: TaskPlan):
         """Increment fairness count for a dynamic task type."""
         if task_type.name not in self.dynamic_task_counts:
             self.dynamic_task_counts[task_type.name] = {}
         if member_id not in self.dynamic_task_counts[task_type.name]:
             self.dynamic_task_counts[task_type.name][member_id] = 0
         self.dynamic_task_counts[task_type.name][member_id] += 1
+        if self._dynamic_matrix is not None:
+            self._dynamic_matrix.increment(member_id, task_type.name)
     
-    def _get_eligible_members(
+    def _book_atm(self, index: EligibilityIndex, assignee: TeamMember, task_type: TaskType, assignment_date: date):
+        """Record an ATM assignment: same-day block, rest-day block and B-shift cooldown."""
+        index.book("atm", assignment_date, assignee.id)
+        self._record_load(assignee.id, ("ATM", task_type.value), (assignment_date,))
+        if task_type == TaskType.ATM_MIDNIGHT:
+            rest_day = calculate_rest_day(assignment_date)
+            self._member_state.record_b_shift(assignee.id, assignment_date, rest_day)
+            if rest_day:
+                index.book("atm_rest", rest_day, assignee.id)
+    
+    def _queue_for(
+        self,
+        task_key: str,
+        members: List[TeamMember],
+        key_fn: Callable[[TeamMember], Tuple],
+        key_arrays: Optional[Callable[[], Tuple]] = None
+    ):
+        """Return the fairness queue for a task over a member pool (cached per run).
+
+        With the NumPy backend active, `key_arrays` (score columns in roster
+        order) is used to build a vectorized queue instead of a heap.
+        """
+        cache_key = (task_key, id(members))
+        cached = self._queues.get(cache_key)
+        if cached is not None and cached[0] is members:
+            return cached[1]
+        index = self._index_for(members)
+        if key_arrays is not None and index is self._matrix_index:
+            queue = matrix_backend.MatrixQueue(index, index.pool(members), key_arrays, self._tie_ranks(task_key, index.members))
+        else:
+            queue = FairQueue(members, key_fn, self._tie_ranks(task_key, members))
+        self._queues[cache_key] = (members, queue)
+        return queue
+    
+    def _tie_ranks(self, task_key: str, members: List[TeamMember]) -> Optional[List[int]]:
+        """Seeded tie-break ranks for a task's pool (None = roster order)."""
+        if self.config.seed is None:
+            return None
+        return seeded_ranks(members, self.config.seed, task_key)
+    
+    def _tie_order(self) -> str:
+        return "roster order" if self.config.seed is None else "seeded order"
+    
+    def _fair_key(self, task_count: int, total_count: int) -> Tuple:
+        """Selection score from a task count and total count (lower is better).
+        
+        With `fairness_aggressiveness` above 1 the primary score also weighs
+        the member's total load across tasks.
+        """
+        weight = self.config.fairness_aggressiveness - 1
+        if weight > 0:
+            return (task_count + weight * total_count, task_count, total_count)
+        return (task_count, total_count)
+    
+    def _fair_key_arrays(self, column, totals) -> Tuple:
+        """Vectorized `_fair_key` over score columns."""
+        weight = self.config.fairness_aggressiveness - 1
+        if weight > 0:
+            return (column + weight * totals, column, totals)
+        return (column, totals)
+    
+    def _get_eligibility_check(
         self,
         members: List[TeamMember],
         check_date: date,
         task_type: TaskType,
-        existing_assignments: List[Assignment]
-    ) -> List[TeamMember]:
-        """Get members eligible for a task on a specific date."""
-        eligible = []
-        
-        for member in members:
-            # For ATM tasks, check availability but allow Sunday even if not in office_days
-            # (ATM monitoring is 24/7, so we bypass office_days check for ATM)
-            if task_type in {TaskType.ATM_MORNING, TaskType.ATM_MIDNIGHT}:
-                # Check unavailable dates/ranges, but allow Sunday even if not in office_days
-                if check_date in member.unavailable_dates:
-                    continue
-                # Check if date falls in any unavailable range
-                is_in_unavailable_range = any(
-                    start <= check_date <= end
-                    for start, end in member.unavailable_ranges
-                )
-                if is_in_unavailable_range:
-                    continue
-                # For ATM, we allow any day (including Sunday) unless explicitly unavailable
-            else:
-                # For SysAid, use normal availability check (must be in office_days)
-                if not member.is_available_on(check_date):
-                    continue
+        exclude_mask: int = 0,
+        conflict_mask: int = 0
+    ) -> Optional[MaskCheck]:
+        """Get an eligibility predicate for a task on a specific date.
 
-            # If rest rule applies: a member who did ATM_MIDNIGHT on D must rest on the calculated rest day for ALL ATM tasks
-            if self.config.atm_rest_rule_enabled and task_type in {TaskType.ATM_MORNING, TaskType.ATM_MIDNIGHT}:
-                # Check if member has a rest day on check_date from any previous ATM_MIDNIGHT assignment
-                has_rest_day = any(
-                    a.task_type == TaskType.ATM_MIDNIGHT 
-                    and a.assignee.id == member.id 
-                    and is_rest_day(check_date, a.date)
-                    for a in existing_assignments
-                )
-                if has_rest_day:
-                    continue
-            
-            # For B-shift, check cooldown (avoid consecutive B-shifts)
-            if task_type == TaskType.ATM_MIDNIGHT:
-                recent_b_assignments = [
-                    a for a in existing_assignments
-                    if (
-                        (a.task_type == TaskType.ATM_MIDNIGHT) or 
-                        (isinstance(a.task_type, str) and a.task_type == TaskType.ATM_MIDNIGHT.value)
-                    ) and a.assignee.id == member.id
-                    and (check_date - a.date).days <= self.config.atm_b_cooldown_days
-                ]
-                if recent_b_assignments:
-                    continue
-            
-            eligible.append(member)
+        `exclude_mask` removes additional members (e.g. already assigned
+        today) and `conflict_mask` members whose rest day would clash with
+        another duty; they differ only in how instrumentation reports them.
+        Returns None when nobody in `members` can take the task.
+        """
+        index = self._index_for(members)
+        is_atm = task_type in {TaskType.ATM_MORNING, TaskType.ATM_MIDNIGHT}
+        
+        # For ATM tasks, check availability but allow Sunday even if not in office_days
+        # (ATM monitoring is 24/7, so we bypass office_days check for ATM).
+        # For SysAid, use normal availability check (must be in office_days)
+        pool = index.pool(members)
+        available = index.available(check_date, requires_office_days=not is_atm)
+        mask = pool & available
         
-        return eligible
+        # If rest rule applies: a member who did ATM_MIDNIGHT on D must rest on the calculated rest day for ALL ATM tasks
+        resting = 0
+        if self.config.atm_rest_rule_enabled and is_atm:
+            resting = index.booked("atm_rest", check_date)
+            mask &= ~resting
+        mask &= ~(exclude_mask | conflict_mask)
+        if self.stats is not None:
+            self._record_slot(task_type.value, pool, (
+                ("unavailable", ~available), ("rest_day", resting), ("booked", exclude_mask), ("rest_day_conflict", conflict_mask)
+            ))
+        if not mask:
+            return None
+        
+        in_mask = index.contains(mask)
+        scopes = ("ATM" if is_atm else "SYSAID", task_type.value)
+        if task_type != TaskType.ATM_MIDNIGHT:
+            return self._within_load_caps(in_mask, scopes, (check_date,))
+        
+        # For B-shift, check cooldown (avoid consecutive B-shifts)
+        in_cooldown = self._member_state.in_cooldown
+        stats = self.stats
+        if stats is not None:
+            def not_cooling(m: TeamMember) -> bool:
+                if in_cooldown(m.id, check_date):
+                    stats.reject("cooldown")
+                    return False
+                return True
+            return self._within_load_caps(in_mask.also(not_cooling), scopes, (check_date,))
+        return self._within_load_caps(in_mask.also(lambda m: not in_cooldown(m.id, check_date)), scopes, (check_date,))
+    
+    def _within_load_caps(self, is_eligible: MaskCheck, scopes: Tuple[str, ...], days) -> MaskCheck:
+        """Add the load-cap check for assignments in `scopes` on `days` (sorted) to an eligibility check."""
+        if self._load is None:
+            return is_eligible
+        caps = self._load.caps_for(scopes)
+        if not caps:
+            return is_eligible
+        allows = self._load.allows
+        ordinals = [d.toordinal() for d in days]
+        stats = self.stats
+        if stats is not None:
+            def within_caps(m: TeamMember) -> bool:
+                if allows(m.id, ordinals, caps):
+                    return True
+                stats.reject("load_cap")
+                return False
+            return is_eligible.also(within_caps)
+        return is_eligible.also(lambda m: allows(m.id, ordinals, caps))
+    
+    def _record_load(self, member_id: str, scopes: Tuple[str, ...], days):
+        """Count assignments in `scopes` on `days` (sorted) against the load caps."""
+        if self._load is not None:
+            self._load.add(member_id, [d.toordinal() for d in days], self._load.caps_for(scopes))
     
     def _select_assignee(
         self,
-        eligible_members: List[TeamMember],
+        members: List[TeamMember],
         task_type: TaskType,
-        assignment_date: date
-    ) -> TeamMember:
-        """Select the most fair assignee from eligible members."""
-        if not eligible_members:
-            raise ValueError("No eligible members available")
-        
-        if len(eligible_members) == 1:
-            return eligible_members[0]
-        
-        # Calculate fairness scores (lower is better)
-        scores = []
-        for member in eligible_members:
-            count = self.ledger.get_count(member.id, task_type)
-            total_count = self.ledger.get_total_count(member.id)
-            # Primary: task-specific count, secondary: total count
-            scores.append((count, total_count, member))
-        
-        # Sort by count (ascending), then by total count
-        scores.sort(key=lambda x: (x[0], x[1]))
-        
-        # Get the best score
-        best_score = scores[0][0]
-        best_members = [s[2] for s in scores if s[0] == best_score]
-        
-        # If tie, use deterministic selection based on date and member IDs
-        if len(best_members) > 1:
-            # Use date as seed for consistent tie-breaking
-            tie_breaker = hash((assignment_date.isoformat(), task_type.value)) % len(best_members)
-            selected = best_members[tie_breaker]
-            self.audit.log(f"Tie-break for {task_type.value} on {assignment_date}: selected {selected.name} from {len(best_members)} candidates")
-        else:
-            selected = best_members[0]
+        assignment_date: date,
+        is_eligible: MaskCheck
+    ) -> Optional[TeamMember]:
+        """Select the most fair assignee among the eligible members of `members`.
+
+        Primary: task-specific count, secondary: total count, then roster
+        order. Returns None if no member is eligible.
+        """
+        queue = self._queue_for(f"builtin:{task_type.value}", members, lambda m: self._fair_key(
+            self.ledger.get_count(m.id, task_type),
+            self.ledger.get_total_count(m.id),
+        ), lambda: self._fair_key_arrays(self.ledger.column(task_type), self.ledger.totals))
+        selected, tied = queue.select(is_eligible)
+        if selected is None:
+            return None
+        if tied and self.stats is not None:
+            self.stats.tie_break(task_type.value)
         
-        self.audit.log(f"Selected {selected.name} for {task_type.value} on {assignment_date} (count: {self.ledger.get_count(selected.id, task_type)})")
+        if self.audit.enabled(DEBUG):
+            candidates = EligibilityIndex.count(is_eligible.mask & self._index_for(members).pool(members))
+            if tied:
+                self.audit.debug("tie_break", "Tie-break for {task} on {date}: selected {name} by total count and {order}", date=assignment_date, member_id=selected.id, task=task_type.value, candidates=candidates, name=selected.name, order=self._tie_order())
+            self.audit.debug("selected", "Selected {name} for {task} on {date} (count: {count})", date=assignment_date, member_id=selected.id, task=task_type.value, candidates=candidates, name=selected.name, count=self.ledger.get_count(selected.id, task_type))
         return selected
 
+
+def _schedule_task_group(
+    config: SchedulingConfig,
+    ledger: FairnessLedger,
+    dynamic_counts: Dict[str, Dict[str, int]],
+    members: List[TeamMember],
+    task_types: List[DynamicTaskType],
+    task_members: Optional[Dict[str, List[str]]],
+    start_date: date,
+    end_date: date,
+    instrument: bool = False
+) -> Tuple[List[Tuple[List[Assignment], List[AuditEvent]]], Dict[str, Dict[str, int]], Optional[SchedulerStats]]:
+    """Process pool worker: schedule one independent group of task types."""
+    scheduler = Scheduler(config, ledger=ledger, dynamic_counts=dynamic_counts)
+    # Events go back to the parent, which applies its own cap/spill settings
+    scheduler.audit = AuditLog(config.audit_level)
+    scheduler.stats = SchedulerStats() if instrument else None
+    scheduler._eligibility = EligibilityIndex(members, start_date, end_date)
+    scheduler._setup_backend(scheduler._eligibility)
+    schedule = Schedule(start_date=start_date, end_date=end_date)
+    results = scheduler._schedule_task_types(members, task_types, task_members, start_date, end_date, schedule)
+    return results, scheduler.dynamic_task_counts, scheduler.stats
@@ -0,0 +1,119 @@
+"""Heap-based fair assignee selection and rotation cursors."""
+
+import hashlib
+import heapq
+from collections import OrderedDict
+from itertools import islice
+from typing import Callable, List, Optional, Tuple
+
+from .models import TeamMember
+
+
+class FairQueue:
+    """Priority queue of members keyed by a fairness score.
+
+    Entries are ordered by `key_fn(member)` (lower is better, e.g.
+    ``(task_count, total_count)``) and then by `tie_ranks` (the member's
+    position in the pool by default), which acts as the deterministic tie key.
+
+    Keys are invalidated lazily: an entry whose stored key no longer matches
+    `key_fn(member)` is re-pushed with the fresh key when it reaches the top.
+    This is correct as long as scores only grow during a run (counts are only
+    incremented), so a stale entry never sits below its true position.
+    """
+
+    def __init__(
+        self,
+        members: List[TeamMember],
+        key_fn: Callable[[TeamMember], Tuple],
+        tie_ranks: Optional[List[int]] = None
+    ):
+        self._key_fn = key_fn
+        if tie_ranks is None:
+            tie_ranks = range(len(members))
+        self._heap = [(key_fn(m), order, m) for order, m in zip(tie_ranks, members)]
+        heapq.heapify(self._heap)
+
+    def select(self, is_eligible: Callable[[TeamMember], bool]) -> Tuple[Optional[TeamMember], bool]:
+        """Return the best eligible member and whether it tied on the primary score.
+
+        Ineligible members popped on the way are pushed back afterwards.
+        """
+        heap = self._heap
+        key_fn = self._key_fn
+        popped = []
+        best = None
+        best_primary = None
+        tied = False
+        while heap:
+            key, order, member = heap[0]
+            current = key_fn(member)
+            if current != key:
+                heapq.heapreplace(heap, (current, order, member))
+                continue
+            if best is not None and key[0] != best_primary:
+                break
+            popped.append(heapq.heappop(heap))
+            if is_eligible(member):
+                if best is None:
+                    best = member
+                    best_primary = key[0]
+                else:
+                    tied = True
+                    break
+        for entry in popped:
+            heapq.heappush(heap, entry)
+        return best, tied
+
+
+class Rotation:
+    """Round-robin cursor over a pool, for task types that are plain rotations.
+
+    Members take turns in the order given (normally fairness order at the
+    start of the run). `next()` returns the first eligible member in turn
+    order; members passed over because they are ineligible (on leave,
+    resting, booked) keep their place and are served first once eligible
+    again. Only the first `lookahead` turns are examined, so a slot costs
+    O(1); if none of them is eligible `next()` returns None and the caller
+    picks with the fairness scorer, reporting that pick with `served()` so
+    the member goes to the back of the rotation.
+    """
+
+    lookahead = 16
+
+    def __init__(self, members: List[TeamMember]):
+        # Turn order; serving a member moves it to the end in O(1)
+        self._turns: "OrderedDict[str, TeamMember]" = OrderedDict((m.id, m) for m in members)
+
+    def __contains__(self, member_id: str) -> bool:
+        return member_id in self._turns
+
+    def next(self, is_eligible: Callable[[TeamMember], bool]) -> Optional[TeamMember]:
+        """The first eligible member in turn order (within `lookahead` turns); else None."""
+        for member in islice(self._turns.values(), self.lookahead):
+            if is_eligible(member):
+                self._turns.move_to_end(member.id)
+                return member
+        return None
+
+    def served(self, member: TeamMember):
+        """Move a member picked outside the rotation to the back."""
+        self._turns.move_to_end(member.id)
+
+
+def seeded_ranks(members: List[TeamMember], seed: int, salt: str = "") -> List[int]:
+    """Tie-break rank of each member (by position) for a seed.
+
+    Ranks come from a keyed digest of the member id, so they are the same in
+    every process (unlike `hash()`), and differ per `salt` (e.g. per task) so
+    one member is not always first among equals.
+    """
+    def digest(position: int) -> Tuple[bytes, int]:
+        key = f"{seed}:{salt}:{members[position].id}".encode("utf-8")
+        return hashlib.blake2b(key, digest_size=8).digest(), position
+
+    order = sorted(range(len(members)), key=digest)
+    ranks = [0] * len(members)
+    for rank, position in enumerate(order):
+        ranks[position] = rank
+    return ranks
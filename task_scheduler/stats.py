@@ -0,0 +1,138 @@
+"""Opt-in instrumentation of scheduler runs.
+
+`SchedulerStats` collects time per phase (nested, e.g. generate > sysaid),
+candidates per slot, eligibility rejections by reason and tie-breaks. The
+scheduler only touches it when `Scheduler.stats` is set, so a disabled run
+pays a single `is not None` test per slot.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+class SlotStats:
+    """Eligible candidates seen per slot for one task."""
+
+    __slots__ = ("slots", "candidates", "min", "max", "empty")
+
+    def __init__(self):
+        self.slots = 0
+        self.candidates = 0
+        self.min: Optional[int] = None
+        self.max = 0
+        self.empty = 0
+
+    def add(self, candidates: int):
+        self.slots += 1
+        self.candidates += candidates
+        if self.min is None or candidates < self.min:
+            self.min = candidates
+        if candidates > self.max:
+            self.max = candidates
+        if not candidates:
+            self.empty += 1
+
+    def merge(self, other: "SlotStats"):
+        self.slots += other.slots
+        self.candidates += other.candidates
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        self.empty += other.empty
+
+    def to_dict(self) -> dict:
+        return {
+            "slots": self.slots,
+            "candidates": self.candidates,
+            "mean": round(self.candidates / self.slots, 2) if self.slots else 0,
+            "min": self.min or 0,
+            "max": self.max,
+            "empty": self.empty,
+        }
+
+
+class SchedulerStats:
+    """Counters and phase timings for one or more scheduler runs.
+
+    Phase times are kept per stack ("generate;sysaid") as inclusive seconds;
+    `to_folded()` converts them to self time in the collapsed-stack format
+    read by flamegraph.pl, speedscope and similar tools.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.phase_calls: Dict[str, int] = {}
+        self.slots: Dict[str, SlotStats] = {}
+        self.rejections: Dict[str, int] = {}
+        self.tie_breaks: Dict[str, int] = {}
+        self._stack: List[str] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block as a child of the current phase."""
+        self._stack.append(name)
+        path = ";".join(self._stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[path] = self.phases.get(path, 0.0) + time.perf_counter() - start
+            self.phase_calls[path] = self.phase_calls.get(path, 0) + 1
+            self._stack.pop()
+
+    @property
+    def current_path(self) -> str:
+        return ";".join(self._stack)
+
+    def slot(self, task: str, candidates: int):
+        """Record the number of eligible candidates for one slot of `task`."""
+        stats = self.slots.get(task)
+        if stats is None:
+            stats = self.slots[task] = SlotStats()
+        stats.add(candidates)
+
+    def reject(self, reason: str, count: int = 1):
+        """Record `count` members ruled out of a slot for `reason`."""
+        if count:
+            self.rejections[reason] = self.rejections.get(reason, 0) + count
+
+    def tie_break(self, task: str):
+        """Record a selection decided by the tie-break order."""
+        self.tie_breaks[task] = self.tie_breaks.get(task, 0) + 1
+
+    def merge(self, other: "SchedulerStats", prefix: str = ""):
+        """Add another run's stats (e.g. from a worker), nesting its phases under `prefix`."""
+        for path, seconds in other.phases.items():
+            key = f"{prefix};{path}" if prefix else path
+            self.phases[key] = self.phases.get(key, 0.0) + seconds
+            self.phase_calls[key] = self.phase_calls.get(key, 0) + other.phase_calls.get(path, 0)
+        for task, stats in other.slots.items():
+            self.slots.setdefault(task, SlotStats()).merge(stats)
+        for reason, count in other.rejections.items():
+            self.reject(reason, count)
+        for task, count in other.tie_breaks.items():
+            self.tie_breaks[task] = self.tie_breaks.get(task, 0) + count
+
+    def to_dict(self) -> dict:
+        """JSON-serializable summary."""
+        return {
+            "phases": {
+                path: {"seconds": round(seconds, 6), "calls": self.phase_calls.get(path, 0)}
+                for path, seconds in self.phases.items()
+            },
+            "slots": {task: stats.to_dict() for task, stats in self.slots.items()},
+            "rejections": dict(self.rejections),
+            "tie_breaks": dict(self.tie_breaks),
+        }
+
+    def to_folded(self) -> str:
+        """Phase self times (microseconds) as collapsed stacks, one "a;b;c N" line each."""
+        self_time = dict(self.phases)
+        for path, seconds in self.phases.items():
+            parent = path.rpartition(";")[0]
+            if parent in self_time:
+                self_time[parent] -= seconds
+        return "\n".join(
+            f"{path} {max(0, round(seconds * 1e6))}" for path, seconds in sorted(self_time.items())
+        )
@@ -0,0 +1,166 @@
+"""Compiled, immutable scheduling plans for task types.
+
+`compile_task_type` resolves a `DynamicTaskType`'s `rules_json` once into a
+`TaskPlan`: the shifts to fill on each weekday, the recurrence predicate and
+rule flags. `compile_atm_plan` does the same for the built-in ATM shift plan
+or one defined in config / the database. The scheduler only reads plans, so
+no rule dict is consulted per slot.
+"""
+
+import calendar
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .models import TaskType
+from .task_type_model import DynamicTaskType
+
+WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+ATM_TASK_TYPES = (TaskType.ATM_MORNING, TaskType.ATM_MIDNIGHT)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledShift:
+    """One slot to fill on a day.
+
+    `task_type` is a built-in `TaskType` (ATM) or the task type name
+    (dynamic tasks); `slot_label` is the assignment's shift label.
+    """
+    label: str
+    task_type: "str | TaskType"
+    requires_rest: bool
+    slot_label: str
+
+
+@dataclass(frozen=True, slots=True)
+class TaskPlan:
+    """A task type with its rules resolved.
+
+    `shifts` holds one tuple of shifts per weekday (0 = Monday). Monthly
+    plans fall on `day_of_month`, or on the last day of the month if `eom`
+    is set. Weekly plans cover `week_length` days from `week_start_day` with
+    one slot per entry of `roles`. With `rotation`, assignees are taken in
+    turn (round-robin) and scored only when the member due is ineligible.
+    Only members with every skill in `required_skills` are considered.
+    """
+    name: str
+    recurrence: str
+    shifts: Tuple[Tuple[CompiledShift, ...], ...]
+    required_count: int = 1
+    roles: Tuple[str, ...] = ()
+    requires_office_days: bool = True
+    week_start_day: int = 0
+    week_length: int = 6
+    day_of_month: Optional[int] = 1
+    eom: bool = False
+    rotation: bool = False
+    required_skills: Tuple[str, ...] = ()
+
+    def shifts_on(self, day: date) -> Tuple[CompiledShift, ...]:
+        return self.shifts[day.weekday()]
+
+    def occurs_on(self, day: date) -> bool:
+        """Whether the task is scheduled on `day` by its recurrence."""
+        if self.recurrence == "daily":
+            return bool(self.shifts[day.weekday()])
+        if self.recurrence == "weekly":
+            return day.weekday() == self.week_start_day
+        if self.recurrence == "monthly":
+            if self.eom:
+                return day.day == calendar.monthrange(day.year, day.month)[1]
+            return day.day == self.day_of_month
+        return False
+
+
+def _resolve_day_of_month(rules: Mapping[str, Any]) -> Tuple[Optional[int], bool]:
+    """(day_of_month, eom) from monthly rules.
+
+    `day_of_month` may be a day (1..31), a negative number or "EOM" for the
+    last day of the month; a boolean `eom` flag is also accepted. Defaults to
+    the 1st.
+    """
+    raw_dom = rules.get("day_of_month", None)
+    # Some task definitions may use a boolean flag for end-of-month
+    if raw_dom is None and rules.get("eom"):
+        raw_dom = "EOM"
+    if raw_dom is None:
+        return 1, False
+    if isinstance(raw_dom, str) and raw_dom.strip().upper() == "EOM":
+        return None, True
+    if isinstance(raw_dom, int) and raw_dom < 0:
+        # negative indexing like -1 means last day
+        return None, True
+    try:
+        return int(raw_dom), False
+    except Exception:
+        # fallback to 1st
+        return 1, False
+
+
+def compile_task_type(task_type: DynamicTaskType) -> TaskPlan:
+    """Compile a database task type into a `TaskPlan`."""
+    rules = task_type.rules_json or {}
+    shifts = tuple(
+        CompiledShift(s.label, task_type.name, bool(s.requires_rest), f"{task_type.name} - {s.label}")
+        for s in task_type.shifts
+    )
+    roles = tuple(
+        task_type.role_labels[idx] if idx < len(task_type.role_labels) else f"Role {idx+1}"
+        for idx in range(task_type.required_count)
+    )
+    day_of_month, eom = _resolve_day_of_month(rules)
+    return TaskPlan(
+        name=task_type.name,
+        recurrence=task_type.recurrence,
+        shifts=(shifts,) * 7,
+        required_count=task_type.required_count,
+        roles=roles,
+        requires_office_days=bool(rules.get("requires_office_days", True)),
+        week_start_day=int(rules.get("week_start_day", 0)),
+        week_length=6 if rules.get("exclude_sunday", True) else 7,
+        day_of_month=day_of_month,
+        eom=eom,
+        rotation=bool(rules.get("rotation", False)),
+        required_skills=tuple(sorted(set(task_type.required_skills))),
+    )
+
+
+def _weekday(key: Any) -> int:
+    if isinstance(key, str):
+        name = key.strip().lower()
+        for i, weekday in enumerate(WEEKDAY_NAMES):
+            if name in (weekday, weekday[:3]):
+                return i
+    try:
+        weekday = int(key)
+    except (TypeError, ValueError):
+        weekday = -1
+    if not 0 <= weekday <= 6:
+        raise ValueError(f"Invalid weekday in ATM shift plan: {key!r} (use 0-6 or a day name)")
+    return weekday
+
+
+def compile_atm_plan(spec: Mapping[Any, List[Dict[str, Any]]]) -> TaskPlan:
+    """Compile an ATM shift plan.
+
+    `spec` maps weekdays (0-6, "0"-"6" or day names such as "monday"/"mon")
+    to lists of shifts ``{"task_type": "ATM_MORNING" | "ATM_MIDNIGHT",
+    "label": str, "rest_next_day": bool}``. Weekdays without an entry have
+    no ATM shifts. Raises ValueError for an invalid plan.
+    """
+    days: List[Tuple[CompiledShift, ...]] = [()] * 7
+    for key, shifts in spec.items():
+        weekday = _weekday(key)
+        compiled = []
+        for shift in shifts:
+            try:
+                task_type = TaskType(shift["task_type"])
+                label = str(shift["label"])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"Invalid ATM shift on {WEEKDAY_NAMES[weekday]}: {shift!r}")
+            if task_type not in ATM_TASK_TYPES:
+                raise ValueError(f"ATM shifts must be ATM_MORNING or ATM_MIDNIGHT, got {task_type.value}")
+            compiled.append(CompiledShift(label, task_type, bool(shift.get("rest_next_day", False)), label))
+        days[weekday] = tuple(compiled)
+    return TaskPlan(name="ATM", recurrence="daily", shifts=tuple(days), requires_office_days=False)
+
@@ -1,9 +1,12 @@
 """Models for database-driven task types."""
 
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 from datetime import date
 
+if TYPE_CHECKING:
+    from .task_plan import TaskPlan
+
 
 @dataclass
 class TaskTypeShift:
@@ -25,17 +28,24 @@ class DynamicTaskType:
     role_labels: List[str] = None
     rules_json: Optional[Dict[str, Any]] = None
     shifts: List[TaskTypeShift] = None
+    required_skills: List[str] = None  # members need every one of these skills
     
     def __post_init__(self):
         if self.role_labels is None:
             self.role_labels = []
         if self.shifts is None:
             self.shifts = []
+        if self.required_skills is None:
+            self.required_skills = []
+    
+    def compile(self) -> "TaskPlan":
+        """Resolve `rules_json` into an immutable `TaskPlan` (what the scheduler reads)."""
+        from .task_plan import compile_task_type
+        return compile_task_type(self)
     
     def get_shifts_for_weekday(self, weekday: int) -> List[TaskTypeShift]:
         """
         Get shifts that should be scheduled for a given weekday.
-        For now, returns all shifts, but can be customized based on rules_json.
         
         Args:
             weekday: 0=Monday, 6=Sunday
@@ -43,8 +53,8 @@ class DynamicTaskType:
         Returns:
             List of shifts to schedule for this weekday
         """
-        # For now, return all shifts. Can be customized based on rules_json
-        return self.shifts
+        labels = {s.label for s in self.compile().shifts[weekday]}
+        return [s for s in self.shifts if s.label in labels]
     
     def should_schedule_on_date(self, check_date: date) -> bool:
         """
@@ -57,18 +67,4 @@ class DynamicTaskType:
         Returns:
             True if task should be scheduled on this date
         """
-        if self.recurrence == "daily":
-            return True
-        elif self.recurrence == "weekly":
-            # Weekly tasks typically start on a specific day (e.g., Monday)
-            # For now, schedule on the week start day
-            weekday = check_date.weekday()
-            # Default to Monday (0), but can be customized via rules_json
-            week_start_day = self.rules_json.get("week_start_day", 0) if self.rules_json else 0
-            return weekday == week_start_day
-        elif self.recurrence == "monthly":
-            # Monthly tasks on a specific day of month
-            day_of_month = self.rules_json.get("day_of_month", 1) if self.rules_json else 1
-            return check_date.day == day_of_month
-        return False
-
+        return self.compile().occurs_on(check_date)
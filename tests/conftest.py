@@ -0,0 +1,94 @@
+"""Shared fixtures: an in-memory SQLite database and an API client bound to it."""
+
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from task_scheduler import api
+from task_scheduler.config import SchedulingConfig
+from task_scheduler.database import Base, ScheduleDB, ShiftDef, TaskTypeDef, TeamMemberDB, User
+from task_scheduler.models import TeamMember
+from task_scheduler.persistence import apply_summary_deltas, insert_assignments, summary_deltas
+from task_scheduler.scheduler import Scheduler
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(session_factory):
+    """API client whose requests use the test database and run as an admin."""
+    def get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    admin = User(username="admin", password_hash="", role="admin")
+    api.app.dependency_overrides[api.get_db] = get_db
+    api.app.dependency_overrides[api.get_current_user] = lambda: admin
+    api.schedule_cache.clear()
+    yield TestClient(api.app)
+    api.app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def add_members(session):
+    """Store `count` team members m00, m01, ... and return their ids."""
+    def add(count, office_days=(0, 1, 2, 3, 4, 5, 6)):
+        ids = [f"m{i:02d}" for i in range(count)]
+        session.add_all(TeamMemberDB(id=member_id, name=f"Member {member_id}", office_days=set(office_days)) for member_id in ids)
+        session.commit()
+        return ids
+    return add
+
+
+@pytest.fixture
+def add_desk_task(session):
+    """Store a daily "Desk" task type with one shift and return it."""
+    def add():
+        task_type = TaskTypeDef(name="Desk", recurrence="daily", required_count=1)
+        session.add(task_type)
+        session.flush()
+        session.add(ShiftDef(task_type_id=task_type.id, label="Day", start_time="09:00", end_time="17:00", required_count=1))
+        session.commit()
+        return task_type
+    return add
+
+
+@pytest.fixture
+def store_schedule(session):
+    """Generate a two-week schedule for 8 members and store it with its summary counts."""
+    def store(status="draft"):
+        members = [TeamMember(name=f"Member {i}", id=f"m{i:02d}", office_days={0, 1, 2, 3, 4, 5, 6}) for i in range(8)]
+        generated = Scheduler(SchedulingConfig()).generate_schedule(members, date(2026, 3, 2), date(2026, 3, 15))
+        schedule = ScheduleDB(start_date=date(2026, 3, 2), end_date=date(2026, 3, 15), status=status)
+        session.add(schedule)
+        session.flush()
+        rows = insert_assignments(session, schedule.id, generated.assignments)
+        apply_summary_deltas(session, summary_deltas(rows, status))
+        session.commit()
+        return schedule, rows
+    return store
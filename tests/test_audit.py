@@ -0,0 +1,52 @@
+"""Audit log spill files are per run and included in every read."""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from task_scheduler.audit import INFO, AuditLog
+from task_scheduler.config import SchedulingConfig
+from task_scheduler.models import TeamMember
+from task_scheduler.scheduler import Scheduler
+
+START = date(2026, 1, 5)
+END = date(2026, 3, 29)
+
+
+def _members(prefix):
+    return [TeamMember(name=f"{prefix} {i}", id=f"{prefix}{i}", office_days={0, 1, 2, 3, 4, 5, 6}) for i in range(8)]
+
+
+def _audit_log(members, **config):
+    scheduler = Scheduler(SchedulingConfig(**config))
+    try:
+        scheduler.generate_schedule(members, START, END)
+        return scheduler.audit.get_log()
+    finally:
+        scheduler.audit.close()
+
+
+def test_concurrent_generations_keep_their_own_spill(tmp_path):
+    rosters = [_members("alpha"), _members("beta")]
+    expected = [_audit_log(members) for members in rosters]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        logs = list(pool.map(
+            lambda members: _audit_log(members, audit_max_entries=20, audit_spill_dir=str(tmp_path)),
+            rosters * 3
+        ))
+
+    assert logs == expected * 3
+    # close() removes each run's spill file
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_drain_includes_spilled_entries(tmp_path):
+    log = AuditLog(INFO, max_entries=4, spill_dir=str(tmp_path))
+    drained = []
+    for batch in range(3):
+        for i in range(7):
+            log.info("test", "batch {batch} event {i}", batch=batch, i=i)
+        drained.extend(log.drain())
+    log.close()
+
+    assert drained == [f"batch {batch} event {i}" for batch in range(3) for i in range(7)]
@@ -0,0 +1,28 @@
+"""Every benchmark mix schedules each task type it declares, also into a columnar schedule."""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location("bench_scheduler", Path(__file__).resolve().parent.parent / "tools" / "bench_scheduler.py")
+bench = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench)
+
+
+@pytest.mark.parametrize("mix", sorted(bench.TASK_MIXES))
+def test_mix_schedules_every_task(mix, monkeypatch):
+    monkeypatch.setattr(bench, "MIN_SECONDS", 0)
+    result = bench.run_case(bench.BenchCase(f"{mix}-30-5w", 30, 35, 0.1, mix=mix), repeat=1, measure_memory=False, seed=1)
+    declared = bench.TASK_MIXES[mix]()
+    names = [t.name for t in declared] if declared else bench.BUILTIN_TASKS
+    assert sorted(result["fairness_spread"]) == sorted(names)
+
+
+def test_compact_case_matches(monkeypatch):
+    monkeypatch.setattr(bench, "MIN_SECONDS", 0)
+    case = bench.BenchCase("mixed-30-5w", 30, 35, 0.1, mix="mixed")
+    full = bench.run_case(case, repeat=1, measure_memory=False, seed=1)
+    compact = bench.run_case(case, repeat=1, measure_memory=False, seed=1, compact=True)
+    assert (compact["assignments"], compact["fairness_spread"]) == (full["assignments"], full["fairness_spread"])
+    assert 0 < compact["compact_bytes"] and "compact_bytes" not in full
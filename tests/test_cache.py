@@ -0,0 +1,121 @@
+"""Generated schedules are cached per input and handed out as independent copies."""
+
+from datetime import date
+
+import pytest
+
+from task_scheduler import api
+from task_scheduler.cache import CachedSchedule, ScheduleCache
+from task_scheduler.database import DynamicFairnessCount, ShiftDef, TeamMemberDB, UnavailablePeriod
+from task_scheduler.models import Assignment, Schedule, TaskType, TeamMember
+
+START = date(2026, 2, 2)
+END = date(2026, 2, 15)
+
+
+def _request(**changes):
+    return {"start_date": START.isoformat(), "end_date": END.isoformat(), "tasks": ["Desk"], **changes}
+
+
+def _add_member(session):
+    session.add(TeamMemberDB(id="m99", name="Member m99", office_days={0, 1, 2, 3, 4}))
+
+
+def _add_leave(session):
+    session.add(UnavailablePeriod(member_id="m01", start_date=START, end_date=START))
+
+
+def _add_shift(session):
+    session.add(ShiftDef(task_type_id=1, label="Late", start_time="17:00", end_time="22:00", required_count=1))
+
+
+def _add_count(session):
+    session.add(DynamicFairnessCount(member_id="m02", task_name="Desk", count=4))
+
+
+CHANGES = {
+    "members": (_add_member, {}),
+    "unavailability": (_add_leave, {}),
+    "config": (None, {"config_override": {"atm_b_cooldown_days": 3}}),
+    "seed": (None, {"seed": 5}),
+    "range": (None, {"end_date": date(2026, 2, 16).isoformat()}),
+    "task_types": (_add_shift, {}),
+    "task_members": (None, {"task_members": {"Desk": ["m00", "m01", "m02"]}}),
+    "dynamic_counts": (_add_count, {}),
+}
+
+
+@pytest.fixture
+def preview(client, session, add_members, add_desk_task):
+    add_members(6)
+    add_desk_task()
+
+    def post(payload):
+        response = client.post("/api/schedules/preview", json=payload)
+        assert response.status_code == 200, response.text
+        return response.json()
+    return post
+
+
+def test_repeated_request_hits(preview):
+    first = preview(_request())
+    second = preview(_request())
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert second["assignments"] == first["assignments"]
+
+
+@pytest.mark.parametrize("change", sorted(CHANGES))
+def test_changed_input_misses(preview, session, change):
+    change_db, change_request = CHANGES[change]
+    assert preview(_request())["cached"] is False
+    if change_db is not None:
+        change_db(session)
+        session.commit()
+    assert preview(_request(**change_request))["cached"] is False
+    assert preview(_request(**change_request))["cached"] is True
+
+
+def _entry(size, start=START):
+    member = TeamMember(name="Member", id="m00")
+    schedule = Schedule(start_date=start, end_date=END)
+    schedule.extend(Assignment(task_type=TaskType.ATM_MORNING, assignee=member, date=start, shift_label=f"S{i}") for i in range(size))
+    return CachedSchedule(schedule, "")
+
+
+def test_eviction_by_assignment_count():
+    cache = ScheduleCache(max_entries=10, max_assignments=25)
+    for key in "abc":
+        cache.put(key, _entry(10))
+    assert (cache.get("a"), len(cache)) == (None, 2)
+    cache.put("huge", _entry(26))
+    assert cache.get("huge") is None and len(cache) == 2
+    cache.get("b")  # now the most recently used
+    cache.resize(10, 15)
+    assert cache.get("c") is None and cache.get("b") is not None
+
+
+def test_resize_from_request_config(preview):
+    preview(_request())
+    assert len(api.schedule_cache) == 1
+    preview(_request(seed=1, config_override={"cache_max_assignments": 0}))
+    assert len(api.schedule_cache) == 0
+
+
+def test_hit_does_not_share_objects():
+    cache = ScheduleCache()
+    original = _entry(3)
+    cache.put("key", original)
+    original.schedule.assignments[0].shift_label = "changed by the caller"
+
+    first = cache.get("key")
+    first.schedule.assignments[1].assignee.unavailable_dates.add(START)
+    first.schedule.add(first.schedule.assignments[0])
+    second = cache.get("key")
+
+    assert first.schedule is not second.schedule
+    assert not {id(a) for a in first.schedule.assignments} & {id(a) for a in second.schedule.assignments}
+    assert len(second.schedule.assignments) == 3
+    assert second.schedule.assignments[0].shift_label == "S0"
+    assert not second.schedule.assignments[1].assignee.unavailable_dates
+    # Assignments of one copy still share their assignee, like a generated schedule
+    assert len({id(a.assignee) for a in second.schedule.assignments}) == 1
@@ -0,0 +1,34 @@
+"""The fairness summary check tool reports drift and rebuilds the summary with --fix."""
+
+import importlib.util
+from pathlib import Path
+
+from task_scheduler.database import FairnessSummary
+
+_spec = importlib.util.spec_from_file_location("check_fairness_summary", Path(__file__).resolve().parent.parent / "tools" / "check_fairness_summary.py")
+tool = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(tool)
+
+
+class _Database:
+    def __init__(self, session_factory):
+        self.get_session = session_factory
+
+
+def test_reports_and_fixes_drift(session, session_factory, store_schedule, monkeypatch, capsys):
+    store_schedule()
+    monkeypatch.setattr(tool, "db", _Database(session_factory))
+    assert tool.main([]) == 0
+    assert "consistent" in capsys.readouterr().out
+
+    row = session.query(FairnessSummary).order_by(FairnessSummary.id).first()
+    row.count += 3
+    session.commit()
+    assert tool.main([]) == 1
+    out = capsys.readouterr().out
+    assert f"{row.member_id} {row.task_type} draft {row.month.isoformat()}: stored {row.count}, expected {row.count - 3}" in out
+    assert "1 summary rows differ" in out
+
+    assert tool.main(["--fix"]) == 0
+    assert "Rebuilt fairness summary" in capsys.readouterr().out
+    assert tool.main([]) == 0
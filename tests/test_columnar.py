@@ -0,0 +1,81 @@
+"""ColumnarSchedule stores the same rows as Schedule and answers the same lookups."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from task_scheduler.columnar import ColumnarSchedule
+from task_scheduler.config import SchedulingConfig
+from task_scheduler.export import export_to_csv
+from task_scheduler.models import TaskType, TeamMember
+from task_scheduler.scheduler import Scheduler
+from task_scheduler.task_type_model import DynamicTaskType, TaskTypeShift
+
+START = date(2026, 1, 5)
+END = date(2026, 3, 29)
+
+TASK_TYPES = [
+    DynamicTaskType(id=1, name="Desk", recurrence="daily", shifts=[
+        TaskTypeShift("Early", "07:00", "15:00", 1, False), TaskTypeShift("Late", "14:00", "22:00", 1, True),
+    ]),
+    DynamicTaskType(id=2, name="On call", recurrence="weekly", required_count=2, role_labels=["Primary", "Backup"]),
+]
+
+
+def _members():
+    return [TeamMember(name=f"Member {i:02d}", id=f"m{i:02d}", office_days={0, 1, 2, 3, 4, 5}) for i in range(12)]
+
+
+@pytest.fixture(params=["builtin", "dynamic"])
+def generated(request):
+    """A generated Schedule and its ColumnarSchedule copy."""
+    task_types = TASK_TYPES if request.param == "dynamic" else None
+    schedule = Scheduler(SchedulingConfig()).generate_schedule(_members(), START, END, task_types=task_types)
+    return schedule, ColumnarSchedule.from_schedule(schedule)
+
+
+def test_round_trip(generated):
+    schedule, store = generated
+    assert len(store) == len(schedule.assignments)
+    assert store.assignments == schedule.assignments
+    assert store.to_schedule().assignments == schedule.assignments
+    assert (store.start_date, store.end_date) == (schedule.start_date, schedule.end_date)
+    assert store[0] == schedule.assignments[0] and store[-1] == schedule.assignments[-1]
+    with pytest.raises(IndexError):
+        store[len(store)]
+
+
+def test_lookups_match_schedule(generated):
+    schedule, store = generated
+    days = [START + timedelta(days=d) for d in range((END - START).days + 2)]
+    for day in days:
+        assert store.get_assignments_for_date(day) == schedule.get_assignments_for_date(day)
+        assert store.get_assignments_for_week(day) == schedule.get_assignments_for_week(day)
+    for member in _members() + [TeamMember(name="Nobody", id="nobody")]:
+        assert store.get_assignments_for_member(member.id) == schedule.get_assignments_for_member(member.id)
+    for task in [*TaskType, "Desk", "On call", "Unknown"]:
+        assert store.get_assignments_for_task(task) == schedule.get_assignments_for_task(task)
+    assert store.get_assignments_by_date() == schedule.get_assignments_by_date()
+    assert store.get_rest_days() == schedule.get_rest_days()
+
+
+def test_lookups_follow_appended_rows(generated):
+    schedule, _ = generated
+    half = len(schedule.assignments) // 2
+    store = ColumnarSchedule(START, END)
+    store.extend(schedule.assignments[:half])
+    assert store.get_assignments_by_date()  # builds the indexes
+    store.extend(schedule.assignments[half:])
+    assert store.get_assignments_by_date() == schedule.get_assignments_by_date()
+    assert store.get_assignments_for_member("m03") == schedule.get_assignments_for_member("m03")
+
+
+def test_compact_generation_and_export_match(tmp_path):
+    members = _members()
+    schedule = Scheduler(SchedulingConfig()).generate_schedule(members, START, END, task_types=TASK_TYPES)
+    store = Scheduler(SchedulingConfig()).generate_schedule_compact(members, START, END, task_types=TASK_TYPES, chunk_weeks=4)
+    assert sorted(map(repr, store.assignments)) == sorted(map(repr, schedule.assignments))
+
+    export_to_csv(ColumnarSchedule.from_schedule(schedule), tmp_path / "columnar.csv")
+    export_to_csv(schedule, tmp_path / "schedule.csv")
+    assert (tmp_path / "columnar.csv").read_text() == (tmp_path / "schedule.csv").read_text()
@@ -0,0 +1,102 @@
+"""The flow engine mode plans daily slots globally and keeps the greedy rules."""
+
+from collections import Counter
+from datetime import date, timedelta
+
+import pytest
+
+from task_scheduler.config import SchedulingConfig
+from task_scheduler.models import TaskType, TeamMember, assignment_slot_key
+from task_scheduler.rest_day_helper import calculate_rest_day
+from task_scheduler.scheduler import Scheduler
+from task_scheduler.task_type_model import DynamicTaskType, TaskTypeShift
+
+START = date(2026, 1, 5)
+END = date(2026, 3, 1)
+ATM_CAP = {"task": "ATM", "max": 3, "days": 7}
+
+
+def _roster():
+    members = []
+    for i in range(10):
+        member = TeamMember(name=f"Member {i:02d}", id=f"m{i:02d}", office_days={0, 1, 2, 3, 4, 5})
+        if i % 3 == 0:
+            first = START + timedelta(days=5 * i)
+            member.unavailable_ranges.append((first, first + timedelta(days=6)))
+        members.append(member)
+    return members
+
+
+def _generate(mode, **config):
+    members = _roster()
+    config = SchedulingConfig(engine_mode=mode, load_caps=[ATM_CAP], **config)
+    return members, Scheduler(config).generate_schedule(members, START, END)
+
+
+def _atm(schedule):
+    return [a for a in schedule.assignments if a.task_type in (TaskType.ATM_MORNING, TaskType.ATM_MIDNIGHT)]
+
+
+def _spread(assignments, ids):
+    counts = Counter(a.assignee.id for a in assignments)
+    return max(counts[i] for i in ids) - min(counts[i] for i in ids)
+
+
+def test_flow_balances_where_greedy_cannot():
+    # m00 and m01 can both take Monday, only m00 can take Tuesday
+    desk = DynamicTaskType(id=1, name="Desk", recurrence="daily", shifts=[TaskTypeShift("Day", "09:00", "17:00", 1, False)])
+    members = [
+        TeamMember(name="Member 00", id="m00", office_days={0, 1}),
+        TeamMember(name="Member 01", id="m01", office_days={0}),
+    ]
+    monday, tuesday = START, START + timedelta(days=1)
+
+    def picks(mode):
+        schedule = Scheduler(SchedulingConfig(engine_mode=mode)).generate_schedule(members, monday, tuesday, task_types=[desk])
+        return {a.date: a.assignee.id for a in schedule.assignments}
+
+    assert picks("greedy") == {monday: "m00", tuesday: "m00"}
+    assert picks("flow") == {monday: "m01", tuesday: "m00"}
+
+
+@pytest.mark.parametrize("mode", ["greedy", "flow"])
+def test_rest_cooldown_and_caps_are_respected(mode):
+    members, schedule = _generate(mode)
+    by_id = {m.id: m for m in members}
+    atm = _atm(schedule)
+    cooldown = SchedulingConfig().atm_b_cooldown_days
+    assert len({(a.date, a.shift_label) for a in atm}) == len(atm)
+
+    days = Counter((a.assignee.id, a.date) for a in atm)
+    assert max(days.values()) == 1
+    rest_days = {(a.assignee.id, calculate_rest_day(a.date)) for a in atm if a.task_type == TaskType.ATM_MIDNIGHT}
+    night_days = {}
+    for a in sorted(atm, key=lambda a: a.date):
+        # ATM ignores office days but not leave
+        assert not any(first <= a.date <= last for first, last in by_id[a.assignee.id].unavailable_ranges)
+        assert (a.assignee.id, a.date) not in rest_days
+        if a.task_type == TaskType.ATM_MIDNIGHT:
+            last = night_days.get(a.assignee.id)
+            assert last is None or a.date > last + timedelta(days=cooldown)
+            night_days[a.assignee.id] = a.date
+    for member_id in by_id:
+        taken = sorted(day for (m, day) in days if m == member_id)
+        for i, day in enumerate(taken):
+            assert sum(1 for other in taken[i:] if other < day + timedelta(days=ATM_CAP["days"])) <= ATM_CAP["max"]
+
+
+def test_flow_spread_no_worse_than_greedy():
+    members, greedy = _generate("greedy")
+    _, flow = _generate("flow")
+    ids = [m.id for m in members]
+
+    assert len(_atm(flow)) >= len(_atm(greedy))
+    assert _spread(_atm(flow), ids) <= _spread(_atm(greedy), ids)
+
+
+def test_zero_budget_falls_back_to_greedy():
+    _, greedy = _generate("greedy")
+    _, flow = _generate("flow", flow_time_budget_seconds=0)
+    assert [(a.date, assignment_slot_key(a), a.assignee.id) for a in flow.assignments] == [
+        (a.date, assignment_slot_key(a), a.assignee.id) for a in greedy.assignments
+    ]
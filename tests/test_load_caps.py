@@ -0,0 +1,70 @@
+"""LoadCap window edges and LoadWindows bookkeeping."""
+
+import random
+
+import pytest
+
+from task_scheduler.member_state import LoadCap, LoadWindows
+
+
+def _brute_fits(cap, taken, new):
+    days = taken + new
+    return all(
+        sum(start <= d < start + cap.days for d in days) <= cap.max_shifts
+        for start in range(min(days) - cap.days, max(days) + 1)
+    )
+
+
+def test_exactly_max_within_days_fits():
+    cap = LoadCap(max_shifts=3, days=7)
+    assert cap.fits([0, 3], [6])          # 3 shifts in days 0..6
+    assert not cap.fits([0, 3, 6], [5])   # a 4th inside the same window
+    assert cap.fits([0, 3, 6], [7])       # day 0 has left the window
+    assert not cap.fits([1, 3, 6], [7])   # days 1..7 hold 4
+
+
+def test_new_day_between_taken_days():
+    cap = LoadCap(max_shifts=1, days=5)
+    assert not cap.fits([10, 14], [12])
+    assert cap.fits([7, 17], [12])        # both neighbours exactly 5 days away
+    assert not cap.fits([8, 17], [12])    # left neighbour 4 days away
+    assert not cap.fits([7, 16], [12])    # right neighbour 4 days away
+
+
+def test_zero_max_rejects_everything():
+    assert not LoadCap(max_shifts=0, days=1).fits([], [3])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_fits_matches_brute_force(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        cap = LoadCap(max_shifts=rng.randint(0, 4), days=rng.randint(1, 9))
+        # Taken days always satisfy the cap, as LoadWindows only adds days that fit
+        taken = []
+        for day in sorted(rng.sample(range(40), rng.randint(0, 12))):
+            if _brute_fits(cap, taken, [day]):
+                taken.append(day)
+        new = sorted(rng.sample(range(40), rng.randint(1, 3)))
+        assert cap.fits(taken, new) == _brute_fits(cap, taken, new), (cap, taken, new)
+
+
+def test_windows_count_out_of_order_adds_per_scope():
+    windows = LoadWindows([LoadCap(2, 7, "ATM"), LoadCap(3, 7)])
+    atm = windows.caps_for(("ATM", "ATM_MORNING"))
+    desk = windows.caps_for(("Desk",))
+    assert (atm, desk) == ((0, 1), (1,))
+    windows.add("m00", [10], atm)
+    windows.add("m00", [4], atm)          # earlier day from a later task pass
+    assert not windows.allows("m00", [8], atm)
+    assert windows.allows("m00", [8], desk)
+    windows.add("m00", [8], desk)
+    assert not windows.allows("m00", [9], desk)
+    assert windows.allows("m00", [11], desk) and windows.allows("m01", [8], atm)
+
+
+def test_from_dict_validates():
+    assert LoadCap.from_dict({"task": "ATM", "max": 3, "days": 7}) == LoadCap(3, 7, "ATM")
+    for spec in ({"max": 3}, {"max": -1, "days": 7}, {"max": 1, "days": 0}):
+        with pytest.raises(ValueError):
+            LoadCap.from_dict(spec)
@@ -0,0 +1,42 @@
+"""The NumPy backend produces the same schedules as the Python backend."""
+
+import importlib.util
+import random
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from task_scheduler import matrix_backend
+from task_scheduler.config import SchedulingConfig
+from task_scheduler.models import assignment_slot_key
+from task_scheduler.scheduler import Scheduler
+
+_spec = importlib.util.spec_from_file_location("bench_scheduler", Path(__file__).resolve().parent.parent / "tools" / "bench_scheduler.py")
+bench = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench)
+
+
+def _generate(backend, mix, seed):
+    rng = random.Random(f"{seed}:{mix}")
+    members = bench.synthetic_roster(40, bench.START, 63, 0.1, rng)
+    task_types = bench.TASK_MIXES[mix]()
+    task_members = bench.synthetic_task_members(task_types, members, rng)
+    config = SchedulingConfig(backend=backend, seed=seed)
+    schedule = Scheduler(config).generate_schedule(
+        members, bench.START, bench.START + timedelta(days=62), task_types=task_types, task_members=task_members
+    )
+    return [(a.date, assignment_slot_key(a), a.assignee.id) for a in schedule.assignments]
+
+
+@pytest.mark.parametrize("mix", ["default", "mixed", "heavy"])
+@pytest.mark.parametrize("seed", [None, 7])
+def test_backends_assign_identically(mix, seed):
+    pytest.importorskip("numpy")
+    assert _generate("numpy", mix, seed) == _generate("python", mix, seed)
+
+
+def test_missing_numpy_is_an_error(monkeypatch):
+    monkeypatch.setattr(matrix_backend, "np", None)
+    with pytest.raises(RuntimeError, match=r"pip install task-scheduler\[numpy\]"):
+        Scheduler(SchedulingConfig(backend="numpy"))
@@ -0,0 +1,76 @@
+"""Fairness counter upserts and the fairness summary."""
+
+from sqlalchemy import event
+
+import pytest
+
+from task_scheduler.database import DynamicFairnessCount, FairnessCount, FairnessSummary
+from task_scheduler.fairness import check_fairness_summary
+from task_scheduler.persistence import apply_fairness_deltas
+
+
+def test_upsert_rows_are_sent_in_key_order(session, engine):
+    batches = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO fairness_counts"):
+            batches.append(parameters)
+
+    deltas = {
+        (False, "m2", "ATM_MORNING"): 1,
+        (False, "m1", "SYSAID_MAKER"): 2,
+        (False, "m1", "ATM_MORNING"): 1,
+        (True, "m0", "Desk"): 1,
+    }
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        apply_fairness_deltas(session, deltas)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    session.commit()
+
+    keys = [(row[0], row[1]) for batch in batches for row in (batch if isinstance(batch, list) else [batch])]
+    assert keys == sorted(keys)
+    counts = {(c.member_id, c.task_type): c.count for c in session.query(FairnessCount)}
+    assert counts == {("m1", "ATM_MORNING"): 1, ("m1", "SYSAID_MAKER"): 2, ("m2", "ATM_MORNING"): 1}
+    assert [(c.member_id, c.task_name, c.count) for c in session.query(DynamicFairnessCount)] == [("m0", "Desk", 1)]
+
+
+def test_decrement_cleanup_only_touches_decremented_keys(session):
+    # A stale zero counter of an untouched member is left alone
+    apply_fairness_deltas(session, {(False, "m1", "ATM_MORNING"): 2, (False, "m2", "ATM_MORNING"): 1})
+    session.query(FairnessCount).filter(FairnessCount.member_id == "m2").update({"count": 0})
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM fairness_counts"):
+            statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        apply_fairness_deltas(session, {(False, "m1", "ATM_MORNING"): -2, (False, "m3", "ATM_MORNING"): 1})
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    session.commit()
+
+    assert len(statements) == 1 and " IN " in statements[0]
+    counts = {c.member_id: c.count for c in session.query(FairnessCount)}
+    assert counts == {"m2": 0, "m3": 1}
+
+
+@pytest.mark.parametrize("loaded", [True, False], ids=["loaded", "expired"])
+def test_status_change_moves_summary_counts(session, store_schedule, loaded):
+    schedule, rows = store_schedule()
+    drafted = {(r.member_id, r.task_type, r.month): r.count for r in session.query(FairnessSummary)}
+    if loaded:
+        session.refresh(schedule)
+
+    schedule.status = "published"
+    session.commit()
+
+    summary = session.query(FairnessSummary).all()
+    assert {r.status for r in summary} == {"published"}
+    assert {(r.member_id, r.task_type, r.month): r.count for r in summary} == drafted
+    assert sum(drafted.values()) == len(rows)
+    assert check_fairness_summary(session) == []
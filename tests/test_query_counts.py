@@ -0,0 +1,80 @@
+"""Read endpoints run a fixed number of queries whatever the number of rows."""
+
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import delete, event
+
+from task_scheduler.database import AssignmentDB, Base, ScheduleDB, SwapRequest, TeamMemberDB, UnavailablePeriod
+
+START = date(2026, 1, 5)
+
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _populate(session, rows):
+    """A schedule with `rows` assignments, a member per 10 of them (each with leave) and a swap per assignment."""
+    member_ids = [f"m{i:03d}" for i in range(max(2, rows // 10))]
+    for i, member_id in enumerate(member_ids):
+        session.add(TeamMemberDB(id=member_id, name=f"Member {member_id}", office_days={0, 1, 2, 3, 4}))
+        session.add(UnavailablePeriod(member_id=member_id, start_date=START + timedelta(days=i), end_date=START + timedelta(days=i + 2)))
+    schedule = ScheduleDB(start_date=START, end_date=START + timedelta(days=rows))
+    session.add(schedule)
+    session.flush()
+    assignments = [
+        AssignmentDB(
+            task_type="ATM_MORNING", schedule_id=schedule.id, member_id=member_ids[i % len(member_ids)],
+            assignment_date=START + timedelta(days=i), shift_label="Morning (07:30)",
+        )
+        for i in range(rows)
+    ]
+    session.add_all(assignments)
+    session.flush()
+    session.add_all(
+        SwapRequest(assignment_id=a.id, requested_by=a.member_id, proposed_member_id=member_ids[(i + 1) % len(member_ids)])
+        for i, a in enumerate(assignments)
+    )
+    session.commit()
+    return schedule.id
+
+
+def _queries(client, engine, session_factory, rows, path):
+    """Statements run by GET `path` against a freshly populated database."""
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(delete(table))
+    session = session_factory()
+    try:
+        schedule_id = _populate(session, rows)
+    finally:
+        session.close()
+    with count_statements(engine) as statements:
+        response = client.get(path.format(schedule_id=schedule_id))
+    assert response.status_code == 200, response.text
+    return len(statements)
+
+
+@pytest.mark.parametrize("path", [
+    "/api/schedules/{schedule_id}",
+    "/api/schedules/{schedule_id}/export/csv",
+    "/api/team-members",
+    "/api/swaps",
+])
+def test_constant_query_count(path, client, engine, session_factory, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # exports are written under ./out
+    small = _queries(client, engine, session_factory, 5, path)
+    large = _queries(client, engine, session_factory, 500, path)
+    assert small == large
@@ -0,0 +1,154 @@
+"""Incremental regeneration keeps slots outside the window as they are."""
+
+from collections import Counter
+from datetime import date
+
+from task_scheduler import api
+from task_scheduler.config import SchedulingConfig
+from task_scheduler.database import AssignmentDB, TeamMemberDB
+from task_scheduler.models import Schedule, TeamMember, assignment_slot_key
+from task_scheduler.scheduler import Scheduler
+
+START = date(2026, 1, 5)
+END = date(2026, 2, 22)
+WINDOW = (date(2026, 1, 26), date(2026, 2, 1))
+
+
+def _members():
+    return [TeamMember(name=f"Member {i}", id=f"m{i}", office_days={0, 1, 2, 3, 4, 5, 6}) for i in range(8)]
+
+
+def _slots(schedule, before=None):
+    return {
+        (a.date, assignment_slot_key(a)): a.assignee.id
+        for a in schedule.assignments
+        if before is None or a.date < before
+    }
+
+
+def test_gap_before_window_survives():
+    members = _members()
+    full = Scheduler(SchedulingConfig()).generate_schedule(members, START, END)
+    # Drop one day of (daily) ATM slots and one SysAid checker week before the window
+    gap_day = date(2026, 1, 7)
+    gap_week = date(2026, 1, 12)
+    kept = [
+        a for a in full.assignments
+        if not (a.date == gap_day and a.week_start is None)
+        and not (a.week_start == gap_week and a.shift_label.startswith("Checker"))
+    ]
+    existing = Schedule(start_date=START, end_date=END)
+    existing.extend(kept)
+
+    regenerated = Scheduler(SchedulingConfig()).regenerate_schedule(existing, members, *WINDOW)
+
+    assert _slots(regenerated, WINDOW[0]) == _slots(existing, WINDOW[0])
+    assert not any(a.date == gap_day and a.week_start is None for a in regenerated.assignments)
+    makers = [a for a in regenerated.assignments if a.week_start == gap_week and a.shift_label.startswith("Maker")]
+    assert makers and all(a.date < WINDOW[0] for a in makers)
+
+
+def test_departed_member_slots_before_window_stay_empty():
+    members = _members()
+    full = Scheduler(SchedulingConfig()).generate_schedule(members, START, END)
+    existing = Schedule(start_date=START, end_date=END)
+    existing.extend(full.assignments)
+    remaining = [m for m in members if m.id != "m0"]
+
+    regenerated = Scheduler(SchedulingConfig()).regenerate_schedule(existing, remaining, *WINDOW)
+
+    expected = {slot: member for slot, member in _slots(existing, WINDOW[0]).items() if member != "m0"}
+    assert _slots(regenerated, WINDOW[0]) == expected
+
+
+def test_api_replaces_rows_of_deleted_members(client, session, add_members):
+    add_members(8)
+    generated = client.post("/api/schedules/generate", json={"start_date": START.isoformat(), "end_date": END.isoformat()})
+    assert generated.status_code == 200, generated.text
+    schedule_id = generated.json()["schedule_id"]
+    # The member disappears without its assignments being cleaned up
+    session.query(TeamMemberDB).filter(TeamMemberDB.id == "m00").delete()
+    session.commit()
+
+    response = client.post(f"/api/schedules/{schedule_id}/regenerate", json={
+        "start_date": WINDOW[0].isoformat(), "end_date": WINDOW[1].isoformat()
+    })
+    assert response.status_code == 200, response.text
+
+    session.expire_all()
+    rows = session.query(AssignmentDB).filter(AssignmentDB.schedule_id == schedule_id).all()
+    slots = Counter((r.assignment_date, r.week_start or r.assignment_date, r.shift_label) for r in rows)
+    assert max(slots.values()) == 1
+    assert not any(r.member_id == "m00" for r in rows)
+
+
+def test_regenerate_reuses_generation_seed_and_overrides(client, add_members, monkeypatch):
+    add_members(8)
+    generated = client.post("/api/schedules/generate", json={
+        "start_date": START.isoformat(), "end_date": END.isoformat(),
+        "seed": 7, "fairness_aggressiveness": 3, "config_override": {"atm_rest_rule_enabled": False}
+    })
+    assert generated.status_code == 200, generated.text
+
+    configs = []
+
+    class RecordingScheduler(Scheduler):
+        def __init__(self, config, **kwargs):
+            configs.append(config)
+            super().__init__(config, **kwargs)
+
+    monkeypatch.setattr(api, "Scheduler", RecordingScheduler)
+    response = client.post(f"/api/schedules/{generated.json()['schedule_id']}/regenerate", json={
+        "start_date": WINDOW[0].isoformat(), "end_date": WINDOW[1].isoformat()
+    })
+    assert response.status_code == 200, response.text
+    (config,) = configs
+    assert (config.seed, config.fairness_aggressiveness, config.atm_rest_rule_enabled) == (7, 3, False)
+
+
+def test_unavailability_refills_from_generation_task_members(client, session, add_members, add_desk_task):
+    add_members(4)
+    add_desk_task()
+    day = START.isoformat()
+    generated = client.post("/api/schedules/generate", json={
+        "start_date": day, "end_date": day, "tasks": ["Desk"], "task_members": {"Desk": ["m01", "m02"]}
+    })
+    assert generated.status_code == 200, generated.text
+    schedule_id = generated.json()["schedule_id"]
+    (first,) = [a["member_id"] for a in generated.json()["assignments"]]
+
+    response = client.post("/api/unavailable-periods", json={"member_id": first, "start_date": day, "end_date": day})
+    assert response.status_code == 200, response.text
+    assert response.json()["failed"] == []
+    assert [r["schedule_id"] for r in response.json()["regenerated"]] == [schedule_id]
+
+    session.expire_all()
+    rows = session.query(AssignmentDB).filter(AssignmentDB.schedule_id == schedule_id).all()
+    assert [r.member_id for r in rows] == [({"m01", "m02"} - {first}).pop()]
+
+
+def test_unavailability_pins_window_rows_and_reports_failures(client, add_members, monkeypatch):
+    add_members(8)
+    generated = client.post("/api/schedules/generate", json={"start_date": START.isoformat(), "end_date": END.isoformat()})
+    assert generated.status_code == 200, generated.text
+    schedule_id = generated.json()["schedule_id"]
+    dates = {a["id"]: date.fromisoformat(a["assignment_date"]) for a in generated.json()["assignments"]}
+    member = next(a["member_id"] for a in generated.json()["assignments"] if WINDOW[0] <= dates[a["id"]] <= WINDOW[1])
+
+    calls = []
+
+    def failing_regenerate(session, schedule, window_start, window_end, pinned_ids=(), task_members=None):
+        calls.append((window_start, window_end, list(pinned_ids)))
+        raise RuntimeError("solver exploded")
+
+    monkeypatch.setattr(api, "_regenerate_schedule", failing_regenerate)
+    response = client.post("/api/unavailable-periods", json={
+        "member_id": member, "start_date": WINDOW[0].isoformat(), "end_date": WINDOW[1].isoformat()
+    })
+
+    assert response.status_code == 200, response.text
+    assert response.json()["regenerated"] == []
+    assert response.json()["failed"] == [{"schedule_id": schedule_id, "error": "solver exploded"}]
+    ((window_start, window_end, pinned_ids),) = calls
+    assert (window_start, window_end) == WINDOW
+    assert pinned_ids and all(window_start <= dates[i] <= window_end for i in pinned_ids)
@@ -0,0 +1,123 @@
+"""Rotation mode stays as fair as the fairness scorer and keeps the same rules."""
+
+from collections import Counter
+from datetime import date, timedelta
+
+import pytest
+
+from task_scheduler.config import SchedulingConfig
+from task_scheduler.models import TeamMember, assignment_slot_key
+from task_scheduler.rest_day_helper import calculate_rest_day
+from task_scheduler.scheduler import Scheduler
+from task_scheduler.task_type_model import DynamicTaskType, TaskTypeShift
+
+START = date(2026, 1, 5)
+END = date(2026, 6, 28)
+
+
+def _roster():
+    members = []
+    for i in range(12):
+        office_days = {0, 1, 2, 3, 4, 5} if i % 2 == 0 else {0, 1, 2, 3, 4}
+        if i % 5 == 4:
+            office_days.discard(2)  # part-timers
+        member = TeamMember(name=f"Member {i:02d}", id=f"m{i:02d}", office_days=office_days)
+        if i % 3 == 0:
+            first = START + timedelta(days=7 * i)
+            member.unavailable_ranges.append((first, first + timedelta(days=9)))
+        if i % 4 == 1:
+            member.unavailable_dates.update(START + timedelta(days=d) for d in range(3, 170, 17))
+        members.append(member)
+    return members
+
+
+def _daily(rotation):
+    return DynamicTaskType(
+        id=1, name="Desk", recurrence="daily", rules_json={"rotation": rotation},
+        shifts=[TaskTypeShift("Early", "07:00", "15:00", 1, False), TaskTypeShift("Late", "14:00", "22:00", 1, True)],
+    )
+
+
+def _weekly(rotation):
+    return DynamicTaskType(
+        id=2, name="On call", recurrence="weekly", required_count=2, role_labels=["Primary", "Backup"],
+        rules_json={"rotation": rotation},
+    )
+
+
+TASKS = {"daily": _daily, "weekly": _weekly}
+START_COUNTS = {"m00": 3, "m03": 1, "m07": 2}
+
+
+def _generate(kind, rotation):
+    task_type = TASKS[kind](rotation)
+    members = _roster()
+    scheduler = Scheduler(SchedulingConfig(), dynamic_counts={task_type.name: dict(START_COUNTS)})
+    return members, task_type, scheduler.generate_schedule(members, START, END, task_types=[task_type])
+
+
+def _eligible_ids(members, task_type):
+    """Members who can take the task at all (weekly duties need Mon-Sat office days)."""
+    if task_type.recurrence == "weekly":
+        return [m.id for m in members if set(range(6)) <= m.office_days]
+    return [m.id for m in members]
+
+
+def _spread(schedule, ids):
+    slots = {(a.assignee.id, assignment_slot_key(a)) for a in schedule.assignments}
+    counts = Counter(member_id for member_id, _ in slots)
+    values = [counts[member_id] for member_id in ids]
+    return max(values) - min(values)
+
+
+@pytest.mark.parametrize("kind", sorted(TASKS))
+def test_rotation_spread_no_worse_than_scorer(kind):
+    members, task_type, scored = _generate(kind, rotation=False)
+    _, _, rotated = _generate(kind, rotation=True)
+    ids = _eligible_ids(members, task_type)
+
+    assert len({assignment_slot_key(a) for a in rotated.assignments}) == len({assignment_slot_key(a) for a in scored.assignments})
+    assert _spread(rotated, ids) <= _spread(scored, ids)
+
+
+@pytest.mark.parametrize("kind", sorted(TASKS))
+@pytest.mark.parametrize("rotation", [False, True])
+def test_rules_are_honored(kind, rotation):
+    members, task_type, schedule = _generate(kind, rotation)
+    by_id = {m.id: m for m in members}
+    assert schedule.assignments
+
+    per_day = Counter((a.assignee.id, a.date) for a in schedule.assignments)
+    assert max(per_day.values()) == 1
+    for a in schedule.assignments:
+        member = by_id[a.assignee.id]
+        # Unavailability and office days
+        assert member.is_available_on(a.date)
+        if kind == "weekly":
+            # Sunday is skipped and every role holds the whole week
+            assert a.date.weekday() != 6
+            week = [a.week_start + timedelta(days=d) for d in range(6)]
+            assert all(member.is_available_on(d) for d in week)
+
+    if kind == "daily":
+        # No one works a rest shift on a rest day earned earlier in the run
+        rest_days = {(a.assignee.id, calculate_rest_day(a.date)) for a in schedule.assignments}
+        for a in schedule.assignments:
+            if a.custom_task_shift == "Late":
+                assert (a.assignee.id, a.date) not in rest_days
+
+
+@pytest.mark.parametrize("kind", sorted(TASKS))
+def test_rotation_advances_past_member_on_leave(kind):
+    task_type = TASKS[kind](True)
+    members = [TeamMember(name=f"Member {i:02d}", id=f"m{i:02d}", office_days={0, 1, 2, 3, 4, 5, 6}) for i in range(6)]
+    # First in turn (no earlier assignments) and away for the whole horizon
+    members[0].unavailable_ranges.append((START, END))
+    scheduler = Scheduler(SchedulingConfig(audit_level="DEBUG"))
+    schedule = scheduler.generate_schedule(members, START, END, task_types=[task_type])
+
+    picks = [event for event in scheduler.audit.events if event.kind == "selected"]
+    slots = {assignment_slot_key(a) for a in schedule.assignments}
+    assert len(picks) == len(slots)
+    assert all(event.template.endswith("(rotation)") for event in picks)
+    assert _spread(schedule, [m.id for m in members[1:]]) <= 1
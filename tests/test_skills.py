@@ -0,0 +1,82 @@
+"""Task types with required skills only go to members who have all of them."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from task_scheduler.config import SchedulingConfig
+from task_scheduler.eligibility import EligibilityIndex
+from task_scheduler.models import TeamMember
+from task_scheduler.scheduler import Scheduler
+from task_scheduler.task_type_model import DynamicTaskType, TaskTypeShift
+
+START = date(2026, 3, 2)
+END = START + timedelta(days=41)
+SKILLS = {"m00": {"linux"}, "m01": {"linux", "db"}, "m02": {"db"}, "m03": {"linux", "db", "net"}}
+
+
+def _roster():
+    return [
+        TeamMember(name=f"Member {i:02d}", id=f"m{i:02d}", office_days={0, 1, 2, 3, 4, 5}, skills=set(SKILLS.get(f"m{i:02d}", ())))
+        for i in range(8)
+    ]
+
+
+def _task_types(skills):
+    return [
+        DynamicTaskType(id=1, name="Desk", recurrence="daily", required_skills=list(skills),
+                        shifts=[TaskTypeShift("Early", "07:00", "15:00", 1, False), TaskTypeShift("Late", "14:00", "22:00", 1, True)]),
+        DynamicTaskType(id=2, name="Review", recurrence="weekly", required_count=2, required_skills=list(skills)),
+    ]
+
+
+def _skilled(skills):
+    return {member_id for member_id, have in SKILLS.items() if set(skills) <= have}
+
+
+@pytest.mark.parametrize("skills", [("linux",), ("db", "linux")])
+@pytest.mark.parametrize("engine_mode", ["greedy", "rotation", "flow"])
+def test_only_skilled_members_are_picked(skills, engine_mode):
+    task_types = _task_types(skills)
+    if engine_mode == "rotation":
+        for task_type in task_types:
+            task_type.rules_json = {"rotation": True}
+    config = SchedulingConfig(seed=1, engine_mode="greedy" if engine_mode == "rotation" else engine_mode)
+    schedule = Scheduler(config).generate_schedule(_roster(), START, END, task_types=task_types)
+    picked = {a.assignee.id for a in schedule.assignments if a.task_type in ("Desk", "Review")}
+    assert picked and picked <= _skilled(skills)
+
+
+def test_skills_combine_with_task_members():
+    task_members = {"Desk": ["m00", "m02", "m03", "m04"], "Review": ["m00", "m02", "m03", "m04"]}
+    schedule = Scheduler(SchedulingConfig(seed=1)).generate_schedule(
+        _roster(), START, END, task_types=_task_types(("linux",)), task_members=task_members,
+    )
+    assert {a.assignee.id for a in schedule.assignments if a.task_type in ("Desk", "Review")} == {"m00", "m03"}
+
+
+def test_task_without_skilled_members_is_skipped():
+    scheduler = Scheduler(SchedulingConfig(seed=1))
+    schedule = scheduler.generate_schedule(_roster(), START, END, task_types=_task_types(("net", "linux", "db", "ops")))
+    assert not [a for a in schedule.assignments if a.task_type in ("Desk", "Review")]
+    assert "No members with the skills required for task type 'Desk'" in scheduler.audit.get_log()
+
+
+def test_regenerate_keeps_skill_filter():
+    members = _roster()
+    task_types = _task_types(("linux",))
+    scheduler = Scheduler(SchedulingConfig(seed=1))
+    schedule = scheduler.generate_schedule(members, START, END, task_types=task_types)
+    members[0].unavailable_ranges.append((START + timedelta(days=7), START + timedelta(days=20)))
+    regenerated = Scheduler(SchedulingConfig(seed=1)).regenerate_schedule(
+        schedule, members, START + timedelta(days=7), START + timedelta(days=20), task_types=task_types,
+    )
+    window = [a for a in regenerated.assignments if a.task_type == "Desk" and START + timedelta(days=7) <= a.date <= START + timedelta(days=20)]
+    assert window and {a.assignee.id for a in window} <= {"m01", "m03"}
+
+
+def test_skilled_mask():
+    index = EligibilityIndex(_roster())
+    assert index.members_in(index.skilled(["db", "linux"])) == [m for m in index.members if m.id in ("m01", "m03")]
+    assert index.skilled([]) == index.all_mask
+    assert index.skilled(["unknown"]) == 0
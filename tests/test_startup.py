@@ -0,0 +1,19 @@
+"""Startup refuses to run without the fairness counter unique keys."""
+
+import asyncio
+
+import pytest
+
+from task_scheduler import api
+from task_scheduler.database import MigrationError
+
+
+class _FailingDatabase:
+    def create_tables(self):
+        raise MigrationError("duplicate key value violates unique constraint")
+
+
+def test_startup_fails_when_counter_migration_fails(monkeypatch):
+    monkeypatch.setattr(api, "db", _FailingDatabase())
+    with pytest.raises(MigrationError):
+        asyncio.run(api.startup_event())
@@ -0,0 +1,49 @@
+"""Streamed generation covers the same slots as a full run."""
+
+from datetime import date
+
+import pytest
+
+from task_scheduler.config import SchedulingConfig
+from task_scheduler.models import TeamMember, assignment_slot_key
+from task_scheduler.scheduler import Scheduler
+from task_scheduler.task_type_model import DynamicTaskType, TaskTypeShift
+
+START = date(2026, 1, 5)
+END = date(2026, 2, 22)
+
+
+def _members():
+    return [TeamMember(name=f"Member {i}", id=f"m{i}", office_days={0, 1, 2, 3, 4, 5, 6}) for i in range(12)]
+
+
+def _coverage(assignments):
+    return sorted((a.date, assignment_slot_key(a)) for a in assignments)
+
+
+@pytest.mark.parametrize("week_start_day", [0, 3, 6])
+@pytest.mark.parametrize("chunk_weeks", [1, 2])
+def test_stream_covers_weeks_not_aligned_to_chunks(week_start_day, chunk_weeks):
+    task_types = [
+        DynamicTaskType(id=1, name="On call", recurrence="weekly", role_labels=["Primary", "Backup"],
+                        rules_json={"week_start_day": week_start_day}),
+        DynamicTaskType(id=2, name="Desk", recurrence="daily",
+                        shifts=[TaskTypeShift(label="Day", start_time="08:00", end_time="17:00")]),
+    ]
+    members = _members()
+    full = Scheduler(SchedulingConfig()).generate_schedule(members, START, END, task_types=task_types)
+    streamed = [
+        a for batch in Scheduler(SchedulingConfig()).generate_schedule_iter(
+            members, START, END, task_types=task_types, chunk_weeks=chunk_weeks
+        ) for a in batch
+    ]
+
+    assert _coverage(streamed) == _coverage(full.assignments)
+
+
+def test_stream_covers_default_schedule():
+    members = _members()
+    full = Scheduler(SchedulingConfig()).generate_schedule(members, START, END)
+    streamed = [a for batch in Scheduler(SchedulingConfig()).generate_schedule_iter(members, START, END, chunk_weeks=1) for a in batch]
+
+    assert _coverage(streamed) == _coverage(full.assignments)
@@ -0,0 +1,71 @@
+"""Compiled task plans match the shift definitions they come from."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from task_scheduler.config import SchedulingConfig
+from task_scheduler.models import TeamMember
+from task_scheduler.scheduler import ATM_SHIFT_PLAN, DEFAULT_ATM_PLAN, Scheduler
+from task_scheduler.task_plan import WEEKDAY_NAMES, compile_atm_plan
+from task_scheduler.task_type_model import DynamicTaskType, TaskTypeShift
+
+START = date(2026, 3, 2)
+
+
+def _as_config(plan):
+    """The plan as it comes from YAML/JSON: day names and task type strings."""
+    return {
+        WEEKDAY_NAMES[weekday]: [{**shift, "task_type": shift["task_type"].value} for shift in shifts]
+        for weekday, shifts in plan.items()
+    }
+
+
+@pytest.mark.parametrize("weekday", range(7))
+def test_default_plan_matches_atm_shift_plan(weekday):
+    day = START + timedelta(days=weekday)
+    compiled = [(s.task_type, s.label, s.requires_rest, s.slot_label) for s in DEFAULT_ATM_PLAN.shifts_on(day)]
+    expected = [(s["task_type"], s["label"], s["rest_next_day"], s["label"]) for s in ATM_SHIFT_PLAN[weekday]]
+    assert compiled == expected
+    assert DEFAULT_ATM_PLAN.occurs_on(day)
+
+
+def test_config_spelling_compiles_to_the_same_plan():
+    assert compile_atm_plan(_as_config(ATM_SHIFT_PLAN)) == DEFAULT_ATM_PLAN
+    assert compile_atm_plan({str(k): v for k, v in ATM_SHIFT_PLAN.items()}) == DEFAULT_ATM_PLAN
+
+
+def test_config_plan_generates_the_default_schedule():
+    members = [TeamMember(name=f"Member {i:02d}", id=f"m{i:02d}", office_days={0, 1, 2, 3, 4}) for i in range(8)]
+
+    def rows(config):
+        schedule = Scheduler(config).generate_schedule(members, START, START + timedelta(days=27))
+        return [(a.date, a.task_type, a.shift_label, a.assignee.id) for a in schedule.assignments]
+
+    default = rows(SchedulingConfig(seed=3))
+    assert default == rows(SchedulingConfig(seed=3, atm_shift_plan=_as_config(ATM_SHIFT_PLAN)))
+
+
+@pytest.mark.parametrize("spec", [
+    {7: []},
+    {"someday": []},
+    {"mon": [{"task_type": "SYSAID_MAKER", "label": "x"}]},
+    {"mon": [{"task_type": "ATM_MORNING"}]},
+])
+def test_invalid_atm_plan_is_rejected(spec):
+    with pytest.raises(ValueError):
+        compile_atm_plan(spec)
+
+
+def test_dynamic_task_type_plan():
+    task_type = DynamicTaskType(
+        id=1, name="Desk", recurrence="monthly", required_count=2, role_labels=["Lead"],
+        rules_json={"day_of_month": "EOM", "requires_office_days": False},
+        shifts=[TaskTypeShift("Day", "09:00", "17:00", 1, True)], required_skills=["b", "a", "b"],
+    )
+    plan = task_type.compile()
+    assert plan.roles == ("Lead", "Role 2") and plan.required_skills == ("a", "b")
+    assert not plan.requires_office_days
+    assert [(s.task_type, s.slot_label, s.requires_rest) for s in plan.shifts_on(START)] == [("Desk", "Desk - Day", True)]
+    assert plan.occurs_on(date(2026, 2, 28)) and not plan.occurs_on(date(2026, 3, 1))
+    assert task_type.get_shifts_for_weekday(START.weekday()) == task_type.shifts
@@ -10,6 +10,7 @@ Run: python tools/backfill_schedule_ids.py
 """
 from datetime import date
 from task_scheduler.database import db, AssignmentDB, ScheduleDB
+from task_scheduler.fairness import rebuild_fairness_summary
 
 SESSION = None
 
@@ -39,6 +40,10 @@ def main(dry_run=True):
                 print(f"Orphan assignment id={a.id} date={a.assignment_date} no matching schedule")
 
         print(f"Summary: updated={updated}, ambiguous={ambiguous}, orphan={orphan}")
+        if updated and not dry_run:
+            # Assignments now attached to schedules count towards fairness
+            rebuild_fairness_summary(SESSION)
+            SESSION.commit()
     finally:
         SESSION.close()
 
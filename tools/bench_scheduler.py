@@ -0,0 +1,315 @@
+"""Benchmark Scheduler.generate_schedule on synthetic workloads.
+
+Builds rosters of 10-10,000 members with random unavailability, runs the
+scheduler over horizons from one week to two years with different mixes of
+dynamic task types, and reports assignments/sec, peak memory and fairness
+spread as JSON. With --baseline, results are compared against a checked-in
+baseline and the exit code is 1 if any case regressed. With --compact, cases
+generate into a `ColumnarSchedule` (`Scheduler.generate_schedule_compact`)
+and also report the bytes its columns take.
+
+    python tools/bench_scheduler.py --suite quick --baseline tools/bench_baseline.json
+    python tools/bench_scheduler.py --suite full --output out/bench.json
+    python tools/bench_scheduler.py --suite quick --update-baseline tools/bench_baseline.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from task_scheduler.config import SchedulingConfig
+from task_scheduler.models import TaskType, TeamMember, assignment_slot_key, assignment_task_key
+from task_scheduler.scheduler import Scheduler
+from task_scheduler.task_type_model import DynamicTaskType, TaskTypeShift
+
+START = date(2026, 1, 5)
+MIN_SECONDS = 0.5  # keep timing small cases until this much time was measured
+MEMORY_SLACK_MB = 0.5  # memory growth below this is never a regression (tiny cases)
+
+
+@dataclass
+class BenchCase:
+    """One synthetic workload."""
+    name: str
+    members: int
+    days: int
+    unavailability: float = 0.05  # fraction of member-days spent unavailable
+    mix: str = "default"  # see TASK_MIXES
+    backend: str = "python"
+
+
+def _daily(task_id: int, name: str, shifts: int, rules: Optional[dict] = None) -> DynamicTaskType:
+    return DynamicTaskType(
+        id=task_id, name=name, recurrence="daily", rules_json=rules,
+        shifts=[TaskTypeShift(f"S{i + 1}", "08:00", "16:00", 1, i == shifts - 1) for i in range(shifts)]
+    )
+
+
+def _weekly(task_id: int, name: str, roles: int, rules: Optional[dict] = None) -> DynamicTaskType:
+    return DynamicTaskType(
+        id=task_id, name=name, recurrence="weekly", required_count=roles, rules_json=rules,
+        role_labels=[f"Role {i + 1}" for i in range(roles)]
+    )
+
+
+def _monthly(task_id: int, name: str, day_of_month) -> DynamicTaskType:
+    return DynamicTaskType(
+        id=task_id, name=name, recurrence="monthly", rules_json={"day_of_month": day_of_month},
+        shifts=[TaskTypeShift("Shift", "00:00", "23:59", 1, False)]
+    )
+
+
+BUILTIN_TASKS = [t.value for t in (TaskType.ATM_MORNING, TaskType.ATM_MIDNIGHT, TaskType.SYSAID_MAKER, TaskType.SYSAID_CHECKER)]
+
+# Mix name -> task types (None = built-in ATM/SysAid scheduling)
+TASK_MIXES = {
+    "default": lambda: None,
+    "daily": lambda: [_daily(1, "OPS", 2)],
+    "mixed": lambda: [_daily(1, "OPS", 2), _weekly(2, "ONCALL", 2), _monthly(3, "EOM", "EOM")],
+    "heavy": lambda: [
+        _daily(1, "OPS", 3), _daily(2, "DESK", 2), _weekly(3, "ONCALL", 3),
+        _weekly(4, "REVIEW", 1), _monthly(5, "EOM", "EOM"), _monthly(6, "MID", 15),
+    ],
+    # Same tasks as "mixed" as round-robin rotations (compare its spread with "mixed")
+    "rotation": lambda: [
+        _daily(1, "OPS", 2, {"rotation": True}), _weekly(2, "ONCALL", 2, {"rotation": True}), _monthly(3, "EOM", "EOM"),
+    ],
+}
+
+SUITES = {
+    "quick": [
+        BenchCase("default-10-1w", 10, 7, 0.0),
+        BenchCase("default-25-3m", 25, 91),
+        BenchCase("daily-100-3m", 100, 91, mix="daily"),
+        BenchCase("mixed-100-6m", 100, 182, 0.1, mix="mixed"),
+        BenchCase("rotation-100-6m", 100, 182, 0.1, mix="rotation"),
+        BenchCase("heavy-500-3m", 500, 91, 0.1, mix="heavy"),
+        BenchCase("default-1000-1y", 1000, 365, 0.1),
+    ],
+    "full": [
+        BenchCase("default-10-1w", 10, 7, 0.0),
+        BenchCase("default-10-2y", 10, 730, 0.2),
+        BenchCase("default-100-1y", 100, 365),
+        BenchCase("daily-100-2y", 100, 730, mix="daily"),
+        BenchCase("mixed-1000-1y", 1000, 365, 0.1, mix="mixed"),
+        BenchCase("rotation-1000-1y", 1000, 365, 0.1, mix="rotation"),
+        BenchCase("heavy-1000-2y", 1000, 730, 0.1, mix="heavy"),
+        BenchCase("default-10000-3m", 10000, 91, 0.05),
+        BenchCase("mixed-10000-1y", 10000, 365, 0.2, mix="mixed"),
+        BenchCase("heavy-10000-2y", 10000, 730, 0.1, mix="heavy"),
+    ],
+}
+
+
+def synthetic_roster(size: int, start: date, days: int, unavailability: float, rng: random.Random) -> List[TeamMember]:
+    """Members with mostly Mon-Fri office days and random leave totalling ~`unavailability` of the horizon.
+
+    Every third member also works Saturdays, so weekly duties (SysAid and
+    weekly task types cover Mon-Sat) have candidates.
+    """
+    members = []
+    for i in range(size):
+        office_days = {0, 1, 2, 3, 4}
+        if i % 3 == 0:
+            office_days.add(5)
+        elif rng.random() < 0.2:
+            office_days.discard(rng.randrange(5))  # part-timers
+        member = TeamMember(name=f"Member {i:05d}", id=f"m{i:05d}", office_days=office_days)
+        leave_days = int(days * unavailability)
+        while leave_days > 0:
+            length = min(leave_days, rng.randint(1, 10))
+            first = start + timedelta(days=rng.randrange(max(days - length + 1, 1)))
+            if length == 1:
+                member.unavailable_dates.add(first)
+            else:
+                member.unavailable_ranges.append((first, first + timedelta(days=length - 1)))
+            leave_days -= length
+        members.append(member)
+    return members
+
+
+def synthetic_task_members(task_types: Optional[List[DynamicTaskType]], members: List[TeamMember], rng: random.Random) -> Optional[Dict[str, List[str]]]:
+    """Give every other dynamic task a random pool of half the roster (the rest use everyone)."""
+    if not task_types:
+        return None
+    pools = {}
+    for i, task_type in enumerate(task_types):
+        if i % 2:
+            pools[task_type.name] = [m.id for m in rng.sample(members, max(2, len(members) // 2))]
+    return pools or None
+
+
+def fairness_spread(assignments, members: List[TeamMember], task_members: Optional[Dict[str, List[str]]]) -> Dict[str, int]:
+    """Max - min assignment count per task over its member pool (a weekly slot counts once)."""
+    everyone = [m.id for m in members]
+    counts: Dict[str, Counter] = {}
+    seen = set()
+    for a in assignments:
+        slot = (a.assignee.id, assignment_slot_key(a))
+        if slot in seen:
+            continue
+        seen.add(slot)
+        counts.setdefault(assignment_task_key(a), Counter())[a.assignee.id] += 1
+    spread = {}
+    for task, by_member in sorted(counts.items()):
+        pool = (task_members or {}).get(task, everyone)
+        values = [by_member.get(member_id, 0) for member_id in pool]
+        spread[task] = max(values) - min(values)
+    return spread
+
+
+def unscheduled_tasks(assignments, task_types: Optional[List[DynamicTaskType]]) -> List[str]:
+    """Tasks of a mix that got no assignments at all (the case then measures nothing for them)."""
+    declared = [t.name for t in task_types] if task_types else BUILTIN_TASKS
+    scheduled = {assignment_task_key(a) for a in assignments}
+    return [task for task in declared if task not in scheduled]
+
+
+def run_case(case: BenchCase, repeat: int, measure_memory: bool, seed: int, compact: bool = False) -> dict:
+    rng = random.Random(f"{seed}:{case.name}")
+    end = START + timedelta(days=case.days - 1)
+    members = synthetic_roster(case.members, START, case.days, case.unavailability, rng)
+    task_types = TASK_MIXES[case.mix]()
+    task_members = synthetic_task_members(task_types, members, rng)
+    config = SchedulingConfig(backend=case.backend, seed=seed, audit_level="WARNING")
+
+    def generate():
+        scheduler = Scheduler(config)
+        run = scheduler.generate_schedule_compact if compact else scheduler.generate_schedule
+        return run(members, START, end, task_types=task_types, task_members=task_members)
+
+    gc.collect()
+    # Untimed warm-up run, then at least `repeat` timed runs and MIN_SECONDS in total
+    schedule = generate()
+    assignments = schedule.assignments
+    missing = unscheduled_tasks(assignments, task_types)
+    if missing:
+        raise AssertionError(f"{case.name}: no assignments for {', '.join(missing)}")
+    timings = []
+    while len(timings) < repeat or (sum(timings) < MIN_SECONDS and len(timings) < 1000):
+        t0 = time.perf_counter()
+        generate()
+        timings.append(time.perf_counter() - t0)
+    seconds = min(timings)
+
+    peak_mb = None
+    if measure_memory:
+        # Separate run: tracemalloc slows allocation-heavy code down considerably
+        tracemalloc.start()
+        generate()
+        peak_mb = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        tracemalloc.stop()
+
+    spread = fairness_spread(assignments, members, task_members)
+    count = len(assignments)
+    result = {
+        "case": case.name,
+        "members": case.members,
+        "days": case.days,
+        "unavailability": case.unavailability,
+        "mix": case.mix,
+        "backend": case.backend,
+        "assignments": count,
+        "seconds": round(seconds, 4),
+        "assignments_per_sec": round(count / seconds, 1) if seconds > 0 else None,
+        "peak_memory_mb": peak_mb,
+        "fairness_spread": spread,
+        "max_fairness_spread": max(spread.values(), default=0),
+    }
+    if compact:
+        result["compact_bytes"] = schedule.nbytes
+    return result
+
+
+def compare(results: List[dict], baseline: dict, tolerance: float) -> List[str]:
+    """Regressions of `results` against a baseline report.
+
+    Throughput may drop and memory may grow by `tolerance` (a fraction);
+    fairness spread may not grow at all.
+    """
+    previous = {r["case"]: r for r in baseline.get("results", [])}
+    problems = []
+    for result in results:
+        base = previous.get(result["case"])
+        if base is None:
+            continue
+        name = result["case"]
+        if base.get("assignments_per_sec") and result["assignments_per_sec"] is not None:
+            floor = base["assignments_per_sec"] * (1 - tolerance)
+            if result["assignments_per_sec"] < floor:
+                problems.append(f"{name}: {result['assignments_per_sec']} assignments/sec < {base['assignments_per_sec']} (-{tolerance:.0%} allowed)")
+        if base.get("peak_memory_mb") and result["peak_memory_mb"] is not None:
+            ceiling = max(base["peak_memory_mb"] * (1 + tolerance), base["peak_memory_mb"] + MEMORY_SLACK_MB)
+            if result["peak_memory_mb"] > ceiling:
+                problems.append(f"{name}: peak memory {result['peak_memory_mb']} MB > {base['peak_memory_mb']} MB (+{tolerance:.0%} allowed)")
+        if result["max_fairness_spread"] > base.get("max_fairness_spread", 0):
+            problems.append(f"{name}: fairness spread {result['max_fairness_spread']} > {base['max_fairness_spread']}")
+        if result["assignments"] < base.get("assignments", 0):
+            problems.append(f"{name}: {result['assignments']} assignments < {base['assignments']}")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick")
+    parser.add_argument("--case", action="append", help="only run cases with these names")
+    parser.add_argument("--backend", choices=["python", "numpy"], help="override the backend of every case")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (the fastest is reported)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--compact", action="store_true", help="generate into a ColumnarSchedule")
+    parser.add_argument("--seed", type=int, default=1, help="seed for rosters and tie-breaking")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="baseline JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed throughput/memory regression (fraction)")
+    parser.add_argument("--update-baseline", metavar="PATH", help="write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in SUITES[args.suite] if not args.case or c.name in args.case]
+    results = []
+    for case in cases:
+        if args.backend:
+            case.backend = args.backend
+        print(f"running {case.name} ...", file=sys.stderr)
+        results.append(run_case(case, max(1, args.repeat), not args.no_memory, args.seed, args.compact))
+
+    report = {
+        "suite": args.suite,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            problems = compare(results, json.load(f), args.tolerance)
+        report["regressions"] = problems
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        status = 1 if problems else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.update_baseline:
+        Path(args.update_baseline).write_text(json.dumps({k: report[k] for k in ("suite", "python", "results")}, indent=2) + "\n", encoding="utf-8")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
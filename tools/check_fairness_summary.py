@@ -0,0 +1,40 @@
+"""Check the fairness summary table against a full recompute from assignments.
+
+Prints every (member, task, status, month) whose stored count differs and
+exits with status 1 if any do. With --fix the summary is rebuilt instead.
+
+Usage: python tools/check_fairness_summary.py [--fix]
+"""
+import argparse
+import sys
+
+from task_scheduler.database import db
+from task_scheduler.fairness import check_fairness_summary, rebuild_fairness_summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fix", action="store_true", help="rebuild the summary if it is inconsistent")
+    args = parser.parse_args(argv)
+
+    session = db.get_session()
+    try:
+        mismatches = check_fairness_summary(session)
+        for m in mismatches:
+            print(f"{m['member_id']} {m['task_type']} {m['status'] or '-'} {m['month']}: stored {m['stored']}, expected {m['expected']}")
+        if not mismatches:
+            print("Fairness summary is consistent with assignments.")
+            return 0
+        print(f"{len(mismatches)} summary rows differ from assignments.")
+        if args.fix:
+            rows = rebuild_fairness_summary(session)
+            session.commit()
+            print(f"Rebuilt fairness summary ({rows} rows).")
+            return 0
+        return 1
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
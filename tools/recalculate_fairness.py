@@ -2,10 +2,12 @@
 
 Usage: python tools/recalculate_fairness.py
 """
+from collections import Counter
 from datetime import date, timedelta
+from sqlalchemy import func
 from task_scheduler.database import db, AssignmentDB, FairnessCount, DynamicFairnessCount
 from task_scheduler.api import SchedulingConfig
-from task_scheduler.api import TaskType
+from task_scheduler.persistence import apply_fairness_deltas, fairness_key
 
 
 def main():
@@ -24,36 +26,18 @@ def main():
             session.query(FairnessCount).delete(synchronize_session=False)
             session.query(DynamicFairnessCount).delete(synchronize_session=False)
 
-            rows = session.query(AssignmentDB.member_id, AssignmentDB.task_type, AssignmentDB.custom_task_name).filter(
+            rows = session.query(
+                AssignmentDB.member_id, AssignmentDB.task_type, AssignmentDB.custom_task_name, func.count()
+            ).filter(
                 AssignmentDB.assignment_date >= cutoff
-            ).all()
+            ).group_by(AssignmentDB.member_id, AssignmentDB.task_type, AssignmentDB.custom_task_name).all()
 
-            enum_task_values = {t.value for t in TaskType}
+            deltas = Counter()
             counts = 0
-            for member_id, task_type, custom_name in rows:
-                counts += 1
-                if custom_name or (isinstance(task_type, str) and task_type not in enum_task_values):
-                    tname = custom_name or task_type or 'CUSTOM'
-                    dfc = session.query(DynamicFairnessCount).filter(
-                        DynamicFairnessCount.member_id == member_id,
-                        DynamicFairnessCount.task_name == tname
-                    ).first()
-                    if not dfc:
-                        dfc = DynamicFairnessCount(member_id=member_id, task_name=tname, count=0, updated_at=date.today())
-                        session.add(dfc)
-                    dfc.count = (dfc.count or 0) + 1
-                    dfc.updated_at = date.today()
-                else:
-                    task_str = task_type
-                    fc = session.query(FairnessCount).filter(
-                        FairnessCount.member_id == member_id,
-                        FairnessCount.task_type == task_str
-                    ).first()
-                    if not fc:
-                        fc = FairnessCount(member_id=member_id, task_type=task_str, count=0, period_start=date.today()-timedelta(days=window_days), period_end=date.today())
-                        session.add(fc)
-                    fc.count = (fc.count or 0) + 1
-                    fc.updated_at = date.today()
+            for member_id, task_type, custom_name, count in rows:
+                counts += count
+                deltas[fairness_key(member_id, task_type, custom_name)] += count
+            apply_fairness_deltas(session, deltas, period_days=window_days)
         print(f"Processed {counts} assignment rows; fairness counters rebuilt.")
     finally:
         session.close()